@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+""" This script benchmarks checksum throughput for many small (EML-like) files and one large
+(PST-like) file. It is not a unit test. """
+
+# import modules.
+import sys; sys.path.append("..")
+import hashlib
+import logging
+import os
+import plac
+import tempfile
+import time
+from tomes_packager.lib.file_object import FileObject
+
+
+# set default block size prior to adaptive, reusable buffers.
+LEGACY_BLOCK_SIZE = 4096
+
+
+def legacy_hash_file(path, checksum_algorithms=("SHA-256",), block_size=LEGACY_BLOCK_SIZE):
+    """ Returns checksum values for @path the way FileObject did prior to reusable buffers,
+    i.e. with a new bytes object for every 4 kilobyte read. """
+
+    hashers = dict((alg, hashlib.new(alg.replace("-", "").lower()))
+            for alg in checksum_algorithms)
+    with open(path, "rb") as data:
+        while True:
+            chunk = data.read(block_size)
+            if not chunk:
+                break
+            for hasher in hashers.values():
+                hasher.update(chunk)
+
+    return dict((alg, h.hexdigest()) for alg, h in hashers.items())
+
+
+def make_files(folder, small_count, small_size, large_size):
+    """ Writes @small_count files of @small_size bytes and one file of @large_size bytes to
+    @folder. Returns a tuple: a list of small file paths and the large file path. """
+
+    small_files = []
+    for i in range(small_count):
+        path = os.path.join(folder, "{}.eml".format(i))
+        with open(path, "wb") as f:
+            f.write(os.urandom(small_size))
+        small_files.append(path)
+
+    large_file = os.path.join(folder, "large.pst")
+    chunk = os.urandom(8388608)
+    with open(large_file, "wb") as f:
+        written = 0
+        while written < large_size:
+            f.write(chunk[:large_size - written])
+            written += len(chunk)
+
+    return small_files, large_file
+
+
+def evict_files(paths):
+    """ Asks the OS to drop @paths from the page cache so the next read comes from disk. """
+
+    for path in paths:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def benchmark(hash_func, paths, repeat=3, cold=False):
+    """ Returns the best throughput in megabytes per second for hashing all @paths with
+    @hash_func. If @cold is True, @paths are evicted from the page cache before each run. """
+
+    total_bytes = sum(os.path.getsize(p) for p in paths)
+    best = None
+    for i in range(repeat):
+        if cold:
+            evict_files(paths)
+        start = time.perf_counter()
+        for path in paths:
+            hash_func(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return total_bytes / 1048576 / best
+
+
+# CLI.
+def main(small_count:("number of small files", "option", None, int)=2000,
+        small_size:("size of each small file in bytes", "option", None, int)=16384,
+        large_size:("size of the large file in megabytes", "option", None, int)=512,
+        algorithm:("checksum algorithm", "option")="SHA-256",
+        cold:("evict files from the page cache before each run", "flag", "c")=False):
+
+    "Prints SHA-256 throughput (MB/s) before and after reusable, adaptive read buffers and\
+    with and without reading ahead while hashing large files.\
+    \nexample: `python3 benchmark__checksums.py -large-size 256 -c`\
+    \n\nNote: unless -c is used, files are hashed once before timing, so results reflect a\
+    warm page cache. Reading ahead helps most with a cold cache on slower storage."
+
+    # suppress per-chunk logging.
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory(dir=".") as folder:
+
+        # create sample files; warm the page cache.
+        small_files, large_file = make_files(folder, small_count, small_size,
+                large_size * 1048576)
+        for path in small_files + [large_file]:
+            legacy_hash_file(path)
+
+        # set functions to compare.
+        funcs = [("before", lambda p: legacy_hash_file(p, [algorithm])),
+                ("after", lambda p: FileObject._hash_file(p, [algorithm],
+                    read_ahead_threshold=None)),
+                ("read-ahead", lambda p: FileObject._hash_file(p, [algorithm]))]
+
+        # print results.
+        print("{:<12}{:>20}{:>20}".format("", "small files (MB/s)", "large file (MB/s)"))
+        for name, func in funcs:
+            small = benchmark(func, small_files, cold=cold)
+            large = benchmark(func, [large_file], cold=cold)
+            print("{:<12}{:>20.1f}{:>20.1f}".format(name, small, large))
+
+
+if __name__ == "__main__":
+    plac.call(main)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+""" This script benchmarks the memory used per FileObject while a folder tree is held in
+memory and extrapolates it to a tree of 1 million files. It is not a unit test. """
+
+# import modules.
+import sys; sys.path.append("..")
+import gc
+import logging
+import os
+import plac
+import tempfile
+import tracemalloc
+from datetime import datetime
+from tomes_packager.lib.directory_object import DirectoryObject
+
+
+class LegacyFileObject():
+    """ Holds the same per-instance attributes that FileObject had prior to slots and lazily
+    calculated attributes, i.e. an instance dictionary with eagerly calculated paths and
+    dates, two path functions, and three bound methods. """
+
+    def __init__(self, file_obj):
+
+        # convenience functions to clean up path notation.
+        self.logger = file_obj.logger
+        self._normalize_sep = lambda p: p.replace(os.sep, os.altsep) if (
+                os.altsep == "/") else p
+        self._normalize_path = lambda p: self._normalize_sep(os.path.normpath(p))
+
+        # set attributes.
+        self.path = file_obj.path
+        self.parent_object = file_obj.parent_object
+        self.root_object = file_obj.root_object
+        self.index = file_obj.index
+        self.stat = file_obj.stat
+        self.isfile = True
+        self.isdir = False
+        self.name, self.abspath = self.root_object._locate(self.path)
+        self.basename = os.path.basename(self.path)
+        _iso_date = lambda t: datetime.utcfromtimestamp(t).isoformat() + "Z"
+        self.created = _iso_date(self.stat.st_ctime)
+        self.modified = _iso_date(self.stat.st_mtime)
+        self.size = self.stat.st_size
+        self.mimetype = self._get_mimetype
+        self.checksum = self._get_checksum
+        self.checksums = self._get_checksums
+        self._checksums = {}
+
+    def _get_mimetype(self):
+        pass
+
+    def _get_checksum(self):
+        pass
+
+    def _get_checksums(self):
+        pass
+
+
+def make_tree(folder, folder_count, file_count):
+    """ Writes @file_count empty files to each of @folder_count subfolders of @folder. """
+
+    for i in range(folder_count):
+        subfolder = os.path.join(folder, "folder_{}".format(i))
+        os.mkdir(subfolder)
+        for j in range(file_count):
+            open(os.path.join(subfolder, "message_{}.eml".format(j)), "w").close()
+
+    return
+
+
+def measure(make_objects):
+    """ Returns the number of bytes allocated and still held by the list of objects returned
+    by @make_objects along with the number of objects. """
+
+    gc.collect()
+    tracemalloc.start()
+    objects = make_objects()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return size, len(objects)
+
+
+# CLI.
+def main(folder_count:("number of folders", "option", None, int)=20,
+        file_count:("number of files per folder", "option", None, int)=1000):
+
+    "Prints the bytes per FileObject held in memory before and after slots and lazily\
+    calculated attributes, with an estimate for 1 million files.\
+    \nexample: `python3 benchmark__memory.py -folder-count 50`\
+    \n\nNote: the tree snapshot, which is shared by all objects, is built before measuring\
+    and isn't included."
+
+    # suppress per-object logging.
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory(dir=".") as folder:
+
+        # create sample files; build the snapshot in advance.
+        make_tree(folder, folder_count, file_count)
+        dir_obj = DirectoryObject(folder)
+        dir_obj._get_snapshot().build()
+        list(dir_obj.rfiles())
+
+        # set functions to compare.
+        def accessed():
+            objects = list(dir_obj.rfiles())
+            for file_obj in objects:
+                file_obj.name, file_obj.abspath, file_obj.created, file_obj.modified
+            return objects
+        funcs = [("before", lambda: [LegacyFileObject(f) for f in dir_obj.rfiles()]),
+                ("after", lambda: list(dir_obj.rfiles())),
+                ("after (accessed)", accessed)]
+
+        # print results.
+        print("{:<20}{:>16}{:>20}".format("", "bytes/object", "MB per 1M files"))
+        for name, func in funcs:
+            size, count = measure(func)
+            print("{:<20}{:>16.0f}{:>20.0f}".format(name, size/count,
+                size/count * 1000000/1048576))
+
+
+if __name__ == "__main__":
+    plac.call(main)
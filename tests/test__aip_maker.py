@@ -2,14 +2,17 @@
 
 # import modules.
 import sys; sys.path.append("..")
+import hashlib
 import logging
 import os
 import plac
 import random
 import shutil
+import tempfile
 import unittest
 from zipfile import ZipFile
 from tomes_packager.lib.aip_maker import *
+from tomes_packager.lib.file_object import FileObject
 from sample_files.reset_hot_folder import reset
 
 # enable logging.
@@ -23,6 +26,13 @@ HOT_FILE = os.path.join(SAMPLE_FOLDER, "hot_folder.zip")
 HOT_FOLDER = os.path.join(SAMPLE_FOLDER, "hot_folder")
 
 
+class CrossDeviceAIPMaker(AIPMaker):
+    """ An AIPMaker that treats all paths as being on different devices. """
+
+    def _is_same_device(self, path, folder):
+        return False
+
+
 class Test_AIPMaker(unittest.TestCase):
 
 
@@ -53,6 +63,83 @@ class Test_AIPMaker(unittest.TestCase):
         reset()
 
 
+    def test__hashed_copy(self):
+        """ Are checksums calculated while copying a file correct? """
+
+        # copy a file while calculating its checksum.
+        temp_dir = tempfile.TemporaryDirectory(dir=".")
+        am = AIPMaker(self.accounts[0], self.hot_folder, temp_dir.name, ["SHA-256"], True)
+        source = os.path.join(self.sample_folder, "sample_rdf.xlsx")
+        destination = os.path.join(temp_dir.name, "sample_rdf.xlsx")
+        checksums = am._copy_file(source, destination)
+
+        # get SHA-256 values of @source and @destination via hashlib.
+        hashes = []
+        for path in [source, destination]:
+            with open(path, "rb") as f:
+                hashes.append(hashlib.sha256(f.read()).hexdigest())
+        temp_dir.cleanup()
+
+        # make sure hashes are equal.
+        self.assertEqual([checksums["SHA-256"]] * 2, hashes)
+
+
+    def test__hashed_move(self):
+        """ Does moving a folder across devices store correct checksums for each copied 
+        file by absolute path and remove the source folder? """
+
+        # move a folder "across devices".
+        temp_dir = tempfile.TemporaryDirectory(dir=".")
+        source = os.path.join(self.hot_folder, "metadata", self.accounts[0])
+        am = CrossDeviceAIPMaker(self.accounts[0], self.hot_folder, temp_dir.name, 
+                ["SHA-256"])
+        am._move_item(source, temp_dir.name)
+
+        # get SHA-256 values of the moved files via hashlib.
+        hashes = {}
+        for dirpath, dirs, files in os.walk(temp_dir.name):
+            for filename in files:
+                path = os.path.join(dirpath, filename)
+                with open(path, "rb") as f:
+                    hashes[os.path.abspath(path)] = {"SHA-256": 
+                            hashlib.sha256(f.read()).hexdigest()}
+        is_source = os.path.exists(source)
+        temp_dir.cleanup()
+        reset()
+
+        # make sure checksums are equal and the source was removed.
+        self.assertEqual(2, len(hashes))
+        self.assertEqual(hashes, am.digests)
+        self.assertFalse(is_source)
+
+
+    def test__failed_move(self):
+        """ Does a move across devices that fails verification keep the source, remove the
+        partial copy and its checksums, and allow the move to be retried? """
+
+        # move a folder "across devices" with verification that always fails.
+        class UnverifiableFileObject(FileObject):
+            _hash_file = staticmethod(lambda *args, **kwargs: {})
+        temp_dir = tempfile.TemporaryDirectory(dir=".")
+        source = os.path.join(self.hot_folder, "metadata", self.accounts[0])
+        am = CrossDeviceAIPMaker(self.accounts[0], self.hot_folder, temp_dir.name, 
+                ["SHA-256"], True)
+        am._file_object = UnverifiableFileObject
+        with self.assertRaises(OSError):
+            am._move_item(source, temp_dir.name)
+        results = [os.path.isdir(source), os.listdir(temp_dir.name), dict(am.digests)]
+
+        # retry the move with working verification.
+        am._file_object = FileObject
+        am._move_item(source, temp_dir.name)
+        results.append(len(am.digests))
+        temp_dir.cleanup()
+        reset()
+
+        # make sure nothing was left behind until the retry succeeded.
+        self.assertEqual([True, [], {}, 2], results)
+
+
 # CLI.
 def main(account_id:("email account identifier", "positional", None, str, ACCOUNTS), 
         delete_aip:("delete the created AIP", "flag", "d")=False):
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+# import modules.
+import sys; sys.path.append("..")
+import json
+import logging
+import os
+import plac
+import tempfile
+import unittest
+from tomes_packager.lib.checksum_cache import *
+from tomes_packager.lib.directory_object import *
+
+# enable logging.
+logging.basicConfig(level=logging.DEBUG)
+
+
+class Test_ChecksumCache(unittest.TestCase):
+
+
+    def setUp(self):
+
+        # set attributes.
+        self.temp_dir = tempfile.TemporaryDirectory(dir=".")
+        self.cache_file = os.path.join(self.temp_dir.name, "cache.sqlite")
+        self.sample_file = os.path.join(self.temp_dir.name, "sample.txt")
+        with open(self.sample_file, "w") as f:
+            f.write("foo")
+
+
+    def tearDown(self):
+
+        self.temp_dir.cleanup()
+
+
+    def test__cached_checksum(self):
+        """ Does a FileObject use a cached value instead of reading the file? """
+
+        # store a fake value in the cache.
+        cache = ChecksumCache(self.cache_file)
+        cache.set(self.sample_file, {"SHA-256": "cached"})
+
+        # get the FileObject's checksum.
+        dir_obj = DirectoryObject(self.temp_dir.name, checksum_cache=cache)
+        file_obj = [f for f in dir_obj.files() if f.basename == "sample.txt"][0]
+        checksum = file_obj.checksum("SHA-256")
+        cache.close()
+
+        # make sure the cached value was used.
+        self.assertEqual("cached", checksum)
+
+
+    def test__stale_checksum(self):
+        """ Are cached values ignored in strict mode and evicted after a file changes? """
+
+        # store a fake value in the cache.
+        cache = ChecksumCache(self.cache_file)
+        cache.set(self.sample_file, {"SHA-256": "cached"})
+        strict_cache = ChecksumCache(self.cache_file, strict=True)
+        strict_value = strict_cache.get(self.sample_file, ["SHA-256"])
+        strict_cache.close()
+
+        # alter the file; evict stale values.
+        with open(self.sample_file, "a") as f:
+            f.write("bar")
+        evicted = cache.evict(self.temp_dir.name)
+        stale_value = cache.get(self.sample_file, ["SHA-256"])
+        cache.close()
+
+        # make sure there are no cached values.
+        self.assertEqual(({}, 1, {}), (strict_value, evicted, stale_value))
+
+
+# CLI.
+def main(cache_file:("SQLite checksum cache file"),
+        folder:("folder path")):
+
+    "Calculates SHA-256 checksums for all files in a folder using a checksum cache and prints\
+    them to screen as JSON.\
+    \nexample: `python3 test__checksum_cache.py cache.sqlite sample_files`"
+
+    # create a cache and a DirectoryObject that uses it.
+    cache = ChecksumCache(cache_file)
+    dir_obj = DirectoryObject(folder, checksum_cache=cache)
+
+    # calculate and print checksums.
+    checksums = dict((f.name, f.checksum()) for f in dir_obj.rfiles())
+    cache.close()
+    print(json.dumps(checksums, indent=2))
+
+
+if __name__ == "__main__":
+    plac.call(main)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+# import modules.
+import sys; sys.path.append("..")
+import json
+import logging
+import os
+import plac
+import unittest
+from tomes_packager.lib.checksum_maker import *
+from tomes_packager.lib.directory_object import *
+
+# enable logging.
+logging.basicConfig(level=logging.DEBUG)
+
+
+class Test_ChecksumMaker(unittest.TestCase):
+
+
+    def setUp(self):
+
+        # set attributes.
+        self.sample_dir = "sample_files"
+        self.dir_obj = DirectoryObject(self.sample_dir)
+
+
+    def test__threads(self):
+        """ Are the checksums from a thread pool the same as the serial ones? """
+
+        # get checksums serially and in parallel.
+        serial = {f.abspath: f.checksum("SHA-256") for f in self.dir_obj.rfiles()}
+        cm = ChecksumMaker(workers=4)
+        parallel = {k: v["SHA-256"] for k, v in cm.make(self.dir_obj.rfiles()).items()}
+
+        # make sure they are equal.
+        self.assertEqual(serial, parallel)
+
+
+    def test__processes(self):
+        """ Are the checksums from a process pool the same as the serial ones? """
+
+        # get checksums serially and in parallel.
+        serial = {f.abspath: f.checksum("SHA-1") for f in self.dir_obj.rfiles()}
+        cm = ChecksumMaker(workers=2, use_processes=True, algorithms=["SHA-1"])
+        parallel = {k: v["SHA-1"] for k, v in cm.make(self.dir_obj.rfiles()).items()}
+
+        # make sure they are equal.
+        self.assertEqual(serial, parallel)
+
+
+# CLI.
+def main(folder:("folder path"),
+        workers:("number of workers", "option", None, int)=None,
+        processes:("use processes instead of threads", "flag", "p")=False):
+
+    "Calculates SHA-256 checksums in parallel for all files in a folder and prints them to\
+    screen as JSON.\
+    \nexample: `python3 test__checksum_maker.py sample_files`"
+
+    # convert @folder to a DirectoryObject.
+    dir_obj = DirectoryObject(folder)
+
+    # calculate and print checksums.
+    cm = ChecksumMaker(workers, processes)
+    js = json.dumps(cm.make(dir_obj.rfiles()), indent=2)
+    print(js)
+
+
+if __name__ == "__main__":
+    plac.call(main)
@@ -3,10 +3,14 @@
 # import modules.
 import sys; sys.path.append("..")
 import glob
+import hashlib
+import json
 import logging
 import os
 import plac
+import tempfile
 import unittest
+from tomes_packager.lib.checksum_cache import ChecksumCache
 from tomes_packager.lib.directory_object import *
 
 # enable logging.
@@ -71,18 +75,156 @@ class Test_DirectoryObject(unittest.TestCase):
         self.assertEqual(glob_files.sort(), obj_files.sort())
 
 
+    def test__shallow_listing(self):
+        """ Do @self.dir_obj.files and @self.dir_obj.dirs list only @self.sample_dir? """
+
+        # list files and folders non-recursively.
+        list(self.dir_obj.files())
+        list(self.dir_obj.dirs())
+
+        # make sure no subfolder was listed.
+        self.assertEqual([self.dir_obj.path], list(self.dir_obj._snapshot._listings))
+
+
+    def test__shared_parents(self):
+        """ Do files in the same folder share one parent object whose own parent is the
+        parent folder? """
+
+        # get parent objects for files in each folder.
+        parents = {}
+        for file_obj in self.dir_obj.rfiles():
+            parents.setdefault(os.path.dirname(file_obj.path), set()).add(
+                    id(file_obj.parent_object))
+        folder_obj = self.dir_obj._get_folder(self.dir_obj._normalize_path(os.path.join(
+            self.dir_obj.path, "sample_files")))
+
+        # make sure there's one parent per folder and that it's linked to its parent.
+        self.assertEqual({1}, set(len(p) for p in parents.values()))
+        self.assertEqual(self.dir_obj.path, folder_obj.parent_object.path)
+
+
+    def test__pruned_rfiles(self):
+        """ Does @self.dir_obj.rfiles skip an excluded folder without listing it while
+        counting its files and keeping file indexes unchanged? """
+
+        # get indexes for files with and without excluding "sample_files".
+        sample_files = [f for f in glob.glob(os.path.join(self.sample_dir, "sample_files",
+            "**"), recursive=True) if os.path.isfile(f)]
+        obj_indexes = dict((f.name, f.index) for f in self.dir_obj.rfiles(
+            exclude="sample_files"))
+        skipped, listings = self.dir_obj.skipped, list(self.dir_obj._snapshot._listings)
+        all_indexes = dict((f.name, f.index) for f in self.dir_obj.rfiles())
+
+        # make sure "sample_files" wasn't listed and its files were counted.
+        self.assertEqual((len(sample_files), [self.dir_obj.path]), (skipped, listings))
+        self.assertEqual(obj_indexes, dict((k, all_indexes[k]) for k in obj_indexes))
+
+
+    def test__totals(self):
+        """ Do the aggregate statistics of each folder match those of its FileObjects and 
+        are they calculated in one traversal? """
+
+        # get statistics per folder via @DirectoryObject.rfiles and aggregate attributes.
+        folders = [self.dir_obj] + list(self.dir_obj.rdirs())
+        file_stats = []
+        for folder in folders:
+            file_objs = list(folder.rfiles())
+            mtimes = sorted(f.stat.st_mtime for f in file_objs)
+            file_stats.append((len(file_objs), sum(f.size for f in file_objs), 
+                folder._iso_date(mtimes[0]) if mtimes else None, 
+                folder._iso_date(mtimes[-1]) if mtimes else None))
+        dir_obj = DirectoryObject(self.sample_dir)
+        obj_stats = [(f.file_count, f.total_size, f.oldest_modified, f.newest_modified) 
+                for f in [dir_obj] + list(dir_obj.rdirs())]
+
+        # make sure they are equal and were all calculated by the root object.
+        self.assertEqual(file_stats, obj_stats)
+        self.assertEqual(len(folders), len(dir_obj._totals))
+
+
+    def test__indexed_checksums(self):
+        """ Does a file altered in place after its folder was indexed get a current checksum
+        value and size when a checksum cache is used, instead of those of its cached 
+        version? """
+
+        # cache the checksum of a file and index its folder; then alter the file in place.
+        temp_dir = tempfile.TemporaryDirectory(dir=".")
+        data_dir = os.path.join(temp_dir.name, "data")
+        os.mkdir(data_dir)
+        file_path = os.path.join(data_dir, "foo.txt")
+        cache_file = os.path.join(temp_dir.name, "foo.checksums.sqlite")
+        index_file = os.path.join(temp_dir.name, "foo.index.sqlite")
+        results = []
+        for text in ["foo", "foobar"]:
+            with open(file_path, "w") as f:
+                f.write(text)
+            cache = ChecksumCache(cache_file)
+            dir_obj = DirectoryObject(data_dir, checksum_cache=cache)
+            loaded = dir_obj.load_index(index_file)
+            file_obj = list(dir_obj.files())[0]
+            results.append((loaded, file_obj.size, file_obj.checksum()))
+            dir_obj.save_index(index_file)
+            cache.close()
+        temp_dir.cleanup()
+
+        # make sure the second run used the index but not the out of date file status.
+        expected = [(0, 3, hashlib.sha256(b"foo").hexdigest()), 
+                (1, 6, hashlib.sha256(b"foobar").hexdigest())]
+        self.assertEqual(expected, results)
+
+
+    def test__graph(self):
+        """ Does @self.dir_obj.graph list each folder once and yield the same lines as 
+        graphing each folder's files and subfolders recursively? """
+
+        # graph @self.sample_dir recursively per folder.
+        def grapher(dir_obj):
+            yield ("|  " * dir_obj.depth) + dir_obj.basename + "/"
+            for file_obj in dir_obj.files():
+                yield ("|  " * dir_obj.depth) + "|  " + file_obj.basename
+            for folder_obj in dir_obj.dirs():
+                for line in grapher(folder_obj):
+                    yield line
+        recursive_lines = list(grapher(DirectoryObject(self.sample_dir)))
+        
+        # make sure the graphs are equal and folders were listed once.
+        folders = [f for f in glob.glob(os.path.join(self.sample_dir, "**"), 
+            recursive=True) if os.path.isdir(f)]
+        self.assertEqual(recursive_lines, list(self.dir_obj.graph()))
+        self.assertEqual(len(folders), len(self.dir_obj._snapshot._listings))
+
+
+    def test__json_graph(self):
+        """ Does the JSON graph of @self.dir_obj have the same files and folders as 
+        os.walk? """
+
+        # get the file and folder counts via os.walk and the JSON graph.
+        walk_counts = [(len(dirnames), len(filenames)) for dirpath, dirnames, filenames in
+                os.walk(self.sample_dir)]
+        def counter(tree):
+            yield (len(tree["dirs"]) + len(tree["links"]), len(tree["files"]))
+            for folder in tree["dirs"]:
+                for count in counter(folder):
+                    yield count
+        tree = json.loads("".join(self.dir_obj.graph(as_json=True)))
+
+        # make sure they are equal.
+        self.assertEqual(sorted(walk_counts), sorted(counter(tree)))
+
+
 # CLI.
-def main(folder:("folder path")):
+def main(folder:("folder path"),
+        graph_file:("file to write the graph to (default: screen)", "option")=None,
+        as_json:("write a JSON tree", "flag", "j")=False):
     
-    "Converts a folder to a DirectoryObject and prints a visualization to screen.\
-    \nexample: `python3 test__directory_object.py sample_files`"
+    "Converts a folder to a DirectoryObject and writes a visualization to screen or file.\
+    \nexample: `python3 test__directory_object.py sample_files -j`"
 
     # convert @folder to a DirectoryObject.
     dir_obj = DirectoryObject(folder)
     
-    # print graph of @folder.
-    for line in dir_obj.graph():
-        print(line)
+    # write graph of @folder.
+    dir_obj.write_graph(graph_file, as_json)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+# import modules.
+import sys; sys.path.append("..")
+import hashlib
+import json
+import logging
+import os
+import plac
+import tempfile
+import unittest
+from tomes_packager.lib.eaxs_harvester import *
+
+# enable logging.
+logging.basicConfig(level=logging.DEBUG)
+
+
+# set EAXS template.
+EAXS = """<Account xmlns="http://www.archives.ncdcr.gov/mail-account">
+  <Folder>
+    <Name>Inbox</Name>
+    {}
+  </Folder>
+</Account>"""
+MESSAGE = """<Message>
+      <SingleBody>
+        <ExtBodyContent>
+          <RelPath>{}</RelPath>
+          <XMLWrapped>true</XMLWrapped>
+          <Hash>
+            <Value>{}</Value>
+            <Function>{}</Function>
+          </Hash>
+        </ExtBodyContent>
+      </SingleBody>
+    </Message>"""
+
+
+class Test_EAXSHarvester(unittest.TestCase):
+
+
+    def setUp(self):
+
+        # create a sample EAXS folder with attachments.
+        self.temp_dir = tempfile.TemporaryDirectory(dir=".")
+        self.eaxs_dir = self.temp_dir.name
+        os.mkdir(os.path.join(self.eaxs_dir, "xml"))
+        os.mkdir(os.path.join(self.eaxs_dir, "attachments"))
+        messages = []
+        for name in ["passed", "missing", "changed", "unsupported"]:
+            path = os.path.join("attachments", name + ".xml")
+            with open(os.path.join(self.eaxs_dir, path), "wb") as f:
+                f.write(name.encode())
+            function = "WHIRLPOOL" if name == "unsupported" else "SHA256"
+            messages.append(MESSAGE.format(path, hashlib.sha256(name.encode()).hexdigest(),
+                function))
+        with open(os.path.join(self.eaxs_dir, "xml", "foo.xml"), "w") as f:
+            f.write(EAXS.format("\n".join(messages)))
+
+        # alter the attachments.
+        os.remove(os.path.join(self.eaxs_dir, "attachments", "missing.xml"))
+        with open(os.path.join(self.eaxs_dir, "attachments", "changed.xml"), "wb") as f:
+            f.write(b"CHANGED")
+
+
+    def tearDown(self):
+
+        self.temp_dir.cleanup()
+
+
+    def test__verify(self):
+        """ Are recorded checksum values harvested and are the passed, missing, and changed
+        attachments found? """
+
+        # harvest and verify checksum values.
+        harvester = EAXSHarvester(self.eaxs_dir, workers=2)
+        digests = harvester.harvest()
+        is_verified = harvester.verify()
+
+        # make sure the expected values were harvested and verified.
+        passed = os.path.abspath(os.path.join(self.eaxs_dir, "attachments", "passed.xml"))
+        expected = {"passed": 1, "missing": 1, "changed": 1, "unreadable": 0}
+        self.assertEqual((3, hashlib.sha256(b"passed").hexdigest(), False, expected),
+                (len(digests), digests[passed]["SHA-256"], is_verified, harvester.results))
+
+
+# CLI.
+def main(eaxs_dir:("EAXS folder containing an \"xml\" subfolder"),
+        workers:("number of workers", "option", None, int)=1):
+
+    "Harvests attachment checksum values from EAXS files, verifies the attachments, and\
+    prints the results to screen as JSON.\
+    \nexample: `python3 test__eaxs_harvester.py sample_files/foo/eaxs`"
+
+    # harvest and verify checksum values.
+    harvester = EAXSHarvester(eaxs_dir, workers)
+    digests = harvester.harvest()
+    harvester.verify()
+
+    # print results.
+    results = {"digests": digests, "results": harvester.results,
+            "failures": harvester.failures}
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    plac.call(main)
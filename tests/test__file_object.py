@@ -5,12 +5,14 @@ import sys; sys.path.append("..")
 import hashlib
 import json
 import logging
+import mimetypes
 import os
 import plac
 import unittest
 import warnings
 from tomes_packager.lib.directory_object import *
 from tomes_packager.lib.file_object import *
+from tomes_packager.lib.progress_tracker import *
 
 # enable logging.
 logging.basicConfig(level=logging.DEBUG)
@@ -56,6 +58,41 @@ class Test_FileObject(unittest.TestCase):
         self.assertEqual(sha1, sha1_obj)
 
 
+    def test__checksums(self):
+        """ Are multiple hashes from a single read of @self.file_obj correct? """
+
+        # get MD5, SHA-512, and BLAKE2b values of @self.sample_file via hashlib.
+        with open(self.sample_file, "rb") as f:
+            data = f.read()
+        hashes = {"MD5": hashlib.md5(data).hexdigest(),
+                "SHA-512": hashlib.sha512(data).hexdigest(),
+                "BLAKE2b": hashlib.blake2b(data).hexdigest()}
+
+        # get FileObject hashes; then get one of them again without re-reading the file.
+        self.dir_obj.progress = ProgressTracker()
+        obj_hashes = self.file_obj.checksums(list(hashes))
+        obj_md5 = self.file_obj.checksum("MD5")
+
+        # make sure hashes are equal and the file was read once.
+        self.assertEqual(hashes, obj_hashes)
+        self.assertEqual((hashes["MD5"], 1), (obj_md5, self.dir_obj.progress.files_hashed))
+
+
+    def test__read_ahead(self):
+        """ Is the SHA-256 hash correct when reading ahead in small chunks? """
+
+        # get SHA-256 value of @self.sample_file via hashlib.
+        with open(self.sample_file, "rb") as f:
+            sha256 = hashlib.sha256(f.read()).hexdigest()
+
+        # get the hash while always reading ahead.
+        obj_sha256 = FileObject._hash_file(self.sample_file, block_size=100,
+                read_ahead_threshold=0)["SHA-256"]
+
+        # make sure hashes are equal.
+        self.assertEqual(sha256, obj_sha256)
+
+
 # CLI.
 def main(filepath:("file path")):
     
@@ -66,10 +103,10 @@ def main(filepath:("file path")):
     dir_obj = DirectoryObject(os.path.dirname(filepath))
     file_obj = FileObject(filepath, dir_obj, dir_obj, 0)
     
-    # collect @file_obj attributes.
+    # collect @file_obj attributes; instances are slotted, so use dir().
     fdict = {}
-    for att in file_obj.__dict__:
-        if att[0] == "_":
+    for att in dir(file_obj):
+        if att[0] == "_" or att == "logger":
             continue
         try:
             val = getattr(file_obj, att)()
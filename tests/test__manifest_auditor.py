@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+# import modules.
+import sys; sys.path.append("..")
+import hashlib
+import logging
+import os
+import plac
+import tempfile
+import unittest
+from tomes_packager.lib.directory_object import DirectoryObject
+from tomes_packager.lib.manifest_auditor import *
+
+# enable logging.
+logging.basicConfig(level=logging.DEBUG)
+
+
+# set manifest template.
+MANIFEST = """<mets xmlns="http://www.loc.gov/METS/" xmlns:xlink="http://www.w3.org/1999/xlink">
+  <fileSec>
+    <fileGrp ID="data__files">
+    {}
+    </fileGrp>
+  </fileSec>
+</mets>"""
+FILE = """<file SIZE="{}" CHECKSUM="{}" CHECKSUMTYPE="SHA-256">
+        <FLocat xlink:href="{}" LOCTYPE="OTHER" OTHERLOCTYPE="SYSTEM" />
+      </file>"""
+
+
+class RecordingDirectoryObject(DirectoryObject):
+    """ A DirectoryObject that keeps a reference to each root instance. """
+
+    __slots__ = ()
+    instances = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.root_object is self:
+            self.instances.append(self)
+
+
+class Test_ManifestAuditor(unittest.TestCase):
+
+
+    def setUp(self):
+
+        # create a sample AIP with a manifest.
+        self.temp_dir = tempfile.TemporaryDirectory(dir=".")
+        self.aip_dir = self.temp_dir.name
+        os.mkdir(os.path.join(self.aip_dir, "data"))
+        files = []
+        for name in ["passed", "missing", "changed"]:
+            path = os.path.join("data", name + ".txt")
+            with open(os.path.join(self.aip_dir, path), "wb") as f:
+                f.write(name.encode())
+            files.append(FILE.format(len(name), hashlib.sha256(name.encode()).hexdigest(),
+                path))
+        self.manifest = os.path.join(self.aip_dir, "foo.mets.manifest")
+        with open(self.manifest, "w") as f:
+            f.write(MANIFEST.format("\n".join(files)))
+
+        # alter the AIP.
+        os.remove(os.path.join(self.aip_dir, "data", "missing.txt"))
+        with open(os.path.join(self.aip_dir, "data", "changed.txt"), "wb") as f:
+            f.write(b"CHANGED")
+        with open(os.path.join(self.aip_dir, "data", "extra.txt"), "wb") as f:
+            f.write(b"extra")
+
+
+    def tearDown(self):
+
+        self.temp_dir.cleanup()
+
+
+    def test__audit(self):
+        """ Does a stopped and resumed audit find the passed, missing, changed, and extra
+        files? """
+
+        # start an audit that stops immediately; then resume it.
+        state_file = os.path.join(self.aip_dir, "..", "audit.sqlite")
+        stopped = ManifestAuditor(self.manifest, state_file, workers=2, time_limit=-1)
+        is_stopped = not stopped.audit()
+        resumed = ManifestAuditor(self.manifest, state_file, workers=2)
+        is_complete = resumed.audit()
+        os.remove(state_file)
+
+        # make sure the audit was stopped and then completed with the expected results.
+        expected = {"passed": 1, "missing": 1, "changed": 1, "unreadable": 0, "unsupported": 0,
+                "extra": 1}
+        self.assertEqual((True, True, expected), (is_stopped, is_complete, resumed.results))
+
+
+    def test__repeated_and_unsupported_entries(self):
+        """ Are repeated manifest entries audited once per path without errors, and are
+        entries with missing or unsupported checksum algorithms reported as such? """
+
+        # write a manifest with a repeated entry, an alias of it, and bad algorithms.
+        checksum = hashlib.sha256(b"passed").hexdigest()
+        files = [FILE.format(6, checksum, "data/passed.txt")] * 2
+        files.append(FILE.format(6, checksum, "data/./passed.txt"))
+        files.append(FILE.format(7, checksum, "data/changed.txt").replace("SHA-256", "FOO"))
+        files.append(FILE.format(5, checksum, "data/extra.txt").replace(
+            ' CHECKSUMTYPE="SHA-256"', ""))
+        with open(self.manifest, "w") as f:
+            f.write(MANIFEST.format("\n".join(files)))
+
+        # audit the AIP.
+        auditor = ManifestAuditor(self.manifest, workers=2)
+        auditor.audit()
+
+        # make sure each path was recorded once with the expected status.
+        expected = [("data/changed.txt", "unsupported"), ("data/extra.txt", "unsupported")]
+        self.assertEqual(expected, [row[:2] for row in auditor.report()])
+        self.assertEqual((2, 2, 0), (auditor.results["passed"], 
+            auditor.results["unsupported"], auditor.results["unreadable"]))
+
+
+    def test__extras_listings(self):
+        """ Are folder listings discarded while looking for extra files unless they're saved
+        to a tree index? """
+
+        # audit with and without a tree index.
+        RecordingDirectoryObject.instances.clear()
+        tree_index = os.path.join(self.aip_dir, "..", "tree.sqlite")
+        for index in ["", tree_index]:
+            auditor = ManifestAuditor(self.manifest, tree_index=index)
+            auditor._directory_object_cls = RecordingDirectoryObject
+            auditor.audit()
+        listings = [len(dir_obj._get_snapshot()._listings) for dir_obj in 
+                RecordingDirectoryObject.instances]
+        os.remove(tree_index)
+
+        # make sure only the indexed audit kept its listings.
+        self.assertEqual(0, listings[0])
+        self.assertNotEqual(0, listings[1])
+
+
+    def test__temporary_state(self):
+        """ Is a temporary state file deleted after each audit while files that didn't pass
+        remain available to report? """
+
+        # record the path of each temporary state file as it's opened.
+        auditor = ManifestAuditor(self.manifest)
+        open_state, state_files = auditor._open_state, []
+        def record_state():
+            conn = open_state()
+            state_files.append(auditor.state_file)
+            return conn
+        auditor._open_state = record_state
+
+        # audit twice with a temporary state file; keep the reported files each time.
+        reports = []
+        for i in range(2):
+            auditor.audit()
+            reports.append([row[:2] for row in auditor.report()])
+
+        # make sure both audits reported the same files and no state file remains.
+        expected = [("data/changed.txt", "changed"), ("data/extra.txt", "extra"),
+                ("data/missing.txt", "missing")]
+        self.assertEqual([expected, expected], reports)
+        self.assertEqual([False, False], [os.path.exists(f) for f in state_files])
+
+
+# CLI.
+def main(manifest_file:("METS manifest file"),
+        state_file:("audit state file for resuming audits", "option")="",
+        workers:("number of workers", "option", None, int)=1,
+        time_limit:("seconds after which to stop the audit", "option", None, float)=None):
+
+    "Audits the AIP containing a METS manifest and prints files that didn't pass.\
+    \nexample: `python3 test__manifest_auditor.py sample_files/foo/foo.mets.manifest`"
+
+    # audit the AIP.
+    auditor = ManifestAuditor(manifest_file, state_file, workers, time_limit=time_limit)
+    auditor.audit()
+
+    # print results.
+    print("Complete: {}; results: {}".format(auditor.is_complete, auditor.results))
+    for row in auditor.report():
+        print(row)
+
+
+if __name__ == "__main__":
+    plac.call(main)
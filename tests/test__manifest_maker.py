@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+# import modules.
+import sys; sys.path.append("..")
+import logging
+import os
+import plac
+import tempfile
+import unittest
+from types import SimpleNamespace
+from lxml import etree
+from tomes_packager.lib.directory_object import *
+from tomes_packager.lib.manifest_maker import *
+from tomes_packager.lib.mets_maker import *
+
+# enable logging.
+logging.basicConfig(level=logging.DEBUG)
+
+
+class Test_ManifestMaker(unittest.TestCase):
+
+
+    def setUp(self):
+
+        # set attributes.
+        self.sample_dir = "sample_files"
+        self.template = "../tomes_packager/mets_templates/MANIFEST.XML"
+        self.agent = SimpleNamespace(__FULLNAME__="TOMES Packager", __VERSION__="0.0.1",
+                __DESCRIPTION__="foo", __URL__="bar")
+
+
+    def test__template_equivalence(self):
+        """ Is the manifest written with lxml the same as the one rendered from the manifest
+        template, ignoring whitespace and creation dates? """
+
+        # write a manifest of @self.sample_dir with each engine.
+        temp_dir = tempfile.TemporaryDirectory(dir=".")
+        jinja_path = os.path.join(temp_dir.name, "jinja.xml")
+        lxml_path = os.path.join(temp_dir.name, "lxml.xml")
+        packager = SimpleNamespace(directory_obj=DirectoryObject(self.sample_dir),
+                manifest_path=jinja_path, time_utc=lambda: "", packager_mod=self.agent,
+                account_id="foo")
+        METSMaker(self.template, jinja_path, SELF=packager).make()
+        ManifestMaker(DirectoryObject(self.sample_dir), lxml_path, "foo",
+                "TOMES Packager (version: 0.0.1)", ("foo", "bar"),
+                exclude=["eaxs/attachments", "*/eaxs/attachments"]).make()
+
+        # parse each manifest without whitespace or creation dates.
+        def parse(path):
+            mets_el = etree.parse(path, etree.XMLParser(remove_blank_text=True)).getroot()
+            mets_el.find("{http://www.loc.gov/METS/}metsHdr").attrib.pop("CREATEDATE")
+            for el in mets_el.iter():
+                el.text = el.text if el.text is None or el.text.strip() else None
+                el.tail = el.tail if el.tail is None or el.tail.strip() else None
+            return etree.tostring(mets_el, method="c14n")
+        manifests = [parse(jinja_path), parse(lxml_path)]
+        temp_dir.cleanup()
+
+        # make sure they are equal.
+        self.assertEqual(manifests[0], manifests[1])
+
+
+# CLI.
+def main(folder:("folder path"), output_file:("output METS manifest file"),
+        account_id:("email account identifier", "option")="foo"):
+
+    "Writes a METS manifest of a folder with lxml.\
+    \nexample: `python3 test__manifest_maker.py sample_files out.xml`"
+
+    # convert @folder to a DirectoryObject and write its manifest.
+    dir_obj = DirectoryObject(folder)
+    manifest_obj = ManifestMaker(dir_obj, output_file, account_id,
+            exclude=["eaxs/attachments", "*/eaxs/attachments"])
+    manifest_obj.make()
+
+
+if __name__ == "__main__":
+    plac.call(main)
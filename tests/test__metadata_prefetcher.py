@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+# import modules.
+import sys; sys.path.append("..")
+import logging
+import plac
+import unittest
+from tomes_packager.lib.directory_object import *
+from tomes_packager.lib.metadata_prefetcher import *
+
+# enable logging.
+logging.basicConfig(level=logging.DEBUG)
+
+
+class Test_MetadataPrefetcher(unittest.TestCase):
+
+
+    def setUp(self):
+
+        # set attributes.
+        self.sample_dir = "sample_files"
+        self.dir_obj = DirectoryObject(self.sample_dir)
+
+
+    def test__order(self):
+        """ Are prefetched FileObjects yielded in the same order with the same indexes and
+        checksum values as without prefetching, with their metadata already resolved? """
+
+        # get FileObjects with and without a prefetcher with a small buffer.
+        serial = [(f.name, f.index, f.checksum()) for f in self.dir_obj.rfiles()]
+        dir_obj = DirectoryObject(self.sample_dir)
+        dir_obj.prefetcher = MetadataPrefetcher(workers=3, buffer_size=2)
+        file_objs = list(dir_obj.rfiles())
+        is_resolved = [f._mimetype is not None and len(f._checksums) != 0 for f in
+                file_objs]
+        prefetched = [(f.name, f.index, f.checksum()) for f in file_objs]
+
+        # make sure they are equal and were resolved.
+        self.assertEqual(serial, prefetched)
+        self.assertEqual([True] * len(file_objs), is_resolved)
+
+
+    def test__exclude(self):
+        """ Are excluded FileObjects yielded without being resolved? """
+
+        # prefetch all but the first file.
+        first = next(self.dir_obj.rfiles()).path
+        self.dir_obj.prefetcher = MetadataPrefetcher(workers=2,
+                exclude=lambda f: f.path == first)
+        file_objs = list(self.dir_obj.rfiles())
+
+        # make sure only the first file wasn't resolved.
+        self.assertEqual([False] + [True] * (len(file_objs) - 1),
+                [len(f._checksums) != 0 for f in file_objs])
+
+
+# CLI.
+def main(folder:("folder path"),
+        workers:("number of worker threads", "option", None, int)=4):
+
+    "Prefetches metadata for all files in a folder and prints their SHA-256 checksums and\
+    MIME types to screen.\
+    \nexample: `python3 test__metadata_prefetcher.py sample_files`"
+
+    # convert @folder to a DirectoryObject with a prefetcher.
+    dir_obj = DirectoryObject(folder)
+    dir_obj.prefetcher = MetadataPrefetcher(workers)
+
+    # print prefetched values.
+    for file_obj in dir_obj.rfiles():
+        print(file_obj.name, file_obj.checksum(), file_obj.mimetype())
+
+
+if __name__ == "__main__":
+    plac.call(main)
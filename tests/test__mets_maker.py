@@ -3,10 +3,12 @@
 # import modules.
 import sys; sys.path.append("..")
 import logging
+import os
 import plac
 import tempfile
 import unittest
 from datetime import datetime
+from lxml import etree
 from tomes_packager.lib.mets_maker import *
 
 # enable logging.
@@ -40,6 +42,95 @@ class Test_MetsMaker(unittest.TestCase):
         os.remove(mets_path)
 
 
+    def test__template_cache(self):
+        """ Is a compiled template reused until it changes and is its bytecode stored in
+        the cache folder? """
+
+        # render a temporary template twice; then change it and render it again.
+        cache_dir = tempfile.TemporaryDirectory(dir=".")
+        template_handle, template_path = tempfile.mkstemp(dir=".", suffix=".xml")
+        os.close(template_handle)
+        templates, outputs = [], []
+        for i, text in enumerate(["<foo/>", "<foo/>", "<bar/>"]):
+            if i == 0 or text != outputs[-1]:
+                with open(template_path, "w") as f:
+                    f.write(text)
+                os.utime(template_path, ns=(i, i))
+            mets_handle, mets_path = tempfile.mkstemp(dir=".", suffix=".xml")
+            os.close(mets_handle)
+            os.remove(mets_path)
+            mm = METSMaker(template_path, mets_path, bytecode_cache=cache_dir.name)
+            mm.make()
+            environment = mm._get_environment(mm.charset, mm.bytecode_cache)
+            templates.append(environment.get_template(os.path.abspath(template_path)))
+            with open(mets_path) as f:
+                outputs.append(f.read())
+            os.remove(mets_path)
+        cached_files = os.listdir(cache_dir.name)
+        os.remove(template_path)
+        cache_dir.cleanup()
+
+        # make sure the template was only recompiled after it changed.
+        self.assertEqual(["<foo/>", "<foo/>", "<bar/>"], outputs)
+        self.assertEqual([True, False], [templates[0] is templates[1], 
+            templates[1] is templates[2]])
+        self.assertEqual(1, len(cached_files))
+
+
+    def test__stream_validation(self):
+        """ Are METS files too large to load validated as they're parsed, with a validation
+        comment appended after the root element? """
+
+        # write a temporary schema and template.
+        temp_dir = tempfile.TemporaryDirectory(dir=".")
+        xsd_path = os.path.join(temp_dir.name, "foo.xsd")
+        with open(xsd_path, "w") as f:
+            f.write("""<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+                <xs:element name="foo"><xs:complexType><xs:sequence><xs:element name="bar"
+                type="xs:int" maxOccurs="unbounded"/></xs:sequence></xs:complexType>
+                </xs:element></xs:schema>""")
+        template_path = os.path.join(temp_dir.name, "foo.xml")
+        with open(template_path, "w") as f:
+            f.write("<foo>{% for i in range(1000) %}<bar>{{ i }}</bar>{% endfor %}"
+                    "<bar>{{ LAST }}</bar></foo>")
+
+        # validate a valid and an invalid METS file incrementally.
+        results, comments = [], []
+        for last in ["1000", "bar"]:
+            mets_path = os.path.join(temp_dir.name, "{}.xml".format(last))
+            mm = METSMaker(template_path, mets_path, LAST=last)
+            mm.xsd, mm._max_load_size = xsd_path, 0
+            mm.make()
+            results.append(mm.validate())
+            comments.append(etree.parse(mets_path).getroot().getnext().text.split()[0])
+        temp_dir.cleanup()
+
+        # make sure the results and comments are correct.
+        self.assertEqual([True, False], results)
+        self.assertEqual(["NOTE:", "ERROR:"], comments)
+
+
+    def test__shared_compilation(self):
+        """ Are the XSD and the beautifier XSLT compiled once per process, with the XSLT
+        compiled once per charset? """
+
+        # write a temporary schema; get the validator and transforms twice.
+        xsd_handle, xsd_path = tempfile.mkstemp(dir=".", suffix=".xsd")
+        with os.fdopen(xsd_handle, "w") as f:
+            f.write("""<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+                <xs:element name="foo"/></xs:schema>""")
+        validators = [METSMaker._get_validator(xsd_path) for i in range(2)]
+        METSMaker.warm(("utf-8", "utf-16"))
+        transforms = [METSMaker._get_transform(METSMaker._default_beautifier, charset)
+                for charset in ["utf-8", "utf-8", "utf-16"]]
+        os.remove(xsd_path)
+
+        # make sure each is only compiled once.
+        self.assertIs(validators[0], validators[1])
+        self.assertEqual([True, False], [transforms[0] is transforms[1],
+            transforms[1] is transforms[2]])
+
+
 # CLI.
 def main(template: "METS template file", output_file: "output METS XML file"):
     
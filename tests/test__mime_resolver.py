@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+# import modules.
+import sys; sys.path.append("..")
+import logging
+import mimetypes
+import os
+import plac
+import tempfile
+import unittest
+from tomes_packager.lib.mime_resolver import *
+
+# enable logging.
+logging.basicConfig(level=logging.DEBUG)
+
+
+class Test_MimeResolver(unittest.TestCase):
+
+
+    def setUp(self):
+
+        # set attributes.
+        self.temp_dir = tempfile.TemporaryDirectory(dir=".")
+        self.resolver = MimeResolver(sniff=True)
+
+
+    def tearDown(self):
+
+        self.temp_dir.cleanup()
+
+
+    def test__extensions(self):
+        """ Does the resolver match mimetypes.guess_type for known extensions, including
+        compound ones, while guessing each extension only once? """
+
+        # get types for sample file names.
+        names = ["a.txt", "b.TXT", "c.eml", "d.tar.gz", "e.tgz", "f.svgz", "g.txt"]
+        guessed = [mimetypes.guess_type(name)[0] for name in names]
+        resolved = [self.resolver.get(name) for name in names]
+
+        # make sure they are equal and that "g.txt" reused the cached ".txt" type.
+        self.assertEqual(guessed, resolved)
+        self.assertEqual(len(names) - 1, len(self.resolver._types))
+
+
+    def test__sniff(self):
+        """ Does the resolver sniff an extensionless email and fall back to the default type
+        for unknown binary content and for unknown extensions when sniffing is off? """
+
+        # write an extensionless email and an unknown binary file.
+        email_file = os.path.join(self.temp_dir.name, "message")
+        with open(email_file, "w") as f:
+            f.write("Received: from localhost\nSubject: Hello\n\nHello world.\n")
+        binary_file = os.path.join(self.temp_dir.name, "data")
+        with open(binary_file, "wb") as f:
+            f.write(b"\x00\x01\x02")
+
+        # get types with and without sniffing.
+        sniffed = [self.resolver.get(email_file), self.resolver.get(binary_file)]
+        unsniffed = MimeResolver().get(email_file)
+
+        # make sure the email was detected and the rest fell back to the default.
+        self.assertEqual(["message/rfc822", self.resolver.default], sniffed)
+        self.assertEqual(self.resolver.default, unsniffed)
+
+
+# CLI.
+def main(filepath:("file path"),
+        sniff:("sniff content of files without known extensions", "flag", "s")=False):
+
+    "Prints the MIME type of a file.\
+    \nexample: `python3 test__mime_resolver.py sample_files/sample_rdf.xlsx -s`"
+
+    # print MIME type of @filepath.
+    resolver = MimeResolver(sniff)
+    print(resolver.get(filepath))
+
+
+if __name__ == "__main__":
+    plac.call(main)
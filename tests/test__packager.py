@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+
+# import modules.
+import sys; sys.path.append("..")
+import logging
+import os
+import plac
+import shutil
+import sqlite3
+import tempfile
+import tracemalloc
+import unittest
+from zipfile import ZipFile
+from tomes_packager.lib.aip_maker import AIPMaker
+from tomes_packager.lib.directory_object import DirectoryObject
+from tomes_packager.lib.file_object import FileObject
+from tomes_packager.lib.mets_maker import METSMaker
+from tomes_packager.lib.tree_snapshot import TreeSnapshot
+from tomes_packager.packager import *
+
+# enable logging.
+logging.basicConfig(level=logging.DEBUG)
+
+
+class LenientAIPMaker(AIPMaker):
+    """ An AIPMaker that considers any AIP structure to be valid. """
+
+    def validate(self):
+        return True
+
+
+class CrossDeviceAIPMaker(AIPMaker):
+    """ An AIPMaker that treats all paths as being on different devices. """
+
+    def _is_same_device(self, path, folder):
+        return False
+
+
+class SyntheticSnapshot(TreeSnapshot):
+    """ A TreeSnapshot of an actual AIP folder with @folder_count additional synthetic 
+    subfolders with @file_count files each, all of which share the status of an actual file
+    or folder. Nothing within the synthetic subfolders is listed from disk. """
+
+    folder_count, file_count = 10, 1000
+
+    def _scan(self, path):
+        
+        # list actual subfolders as they are.
+        if path != self.path and os.path.isdir(path):
+            return super()._scan(path)
+
+        # add synthetic subfolders to the root folder; list synthetic files otherwise.
+        if path == self.path:
+            dirs, files = super()._scan(path)
+            listing = (dirs + [("folder_{}".format(i), os.stat("."), False) for i in 
+                range(self.folder_count)], files)
+        else:
+            listing = ([], [("message_{}.eml".format(i), os.stat(__file__)) for i in 
+                range(self.file_count)])
+        if self.retain:
+            self._listings[path] = listing
+        return listing
+
+
+class SyntheticFileObject(FileObject):
+    """ A FileObject with a fixed checksum value for each algorithm. """
+
+    __slots__ = ()
+    _hash_file = staticmethod(lambda path, checksum_algorithms, block_size=None: dict(
+        (alg, "0" * 64) for alg in checksum_algorithms))
+
+
+class SyntheticDirectoryObject(DirectoryObject):
+    """ A DirectoryObject that traverses a SyntheticSnapshot. """
+
+    __slots__ = ()
+    _file_object = SyntheticFileObject
+    _tree_snapshot = SyntheticSnapshot
+
+
+class Test_Packager(unittest.TestCase):
+
+
+    def setUp(self):
+
+        # set attributes.
+        self.temp_dir = tempfile.TemporaryDirectory(dir=".")
+        self.manifest_template = "../tomes_packager/mets_templates/MANIFEST.XML"
+
+
+    def tearDown(self):
+
+        self.temp_dir.cleanup()
+
+
+    def _get_hot_folder(self, name, remove=()):
+        """ Unzips the sample hot folder into a new folder in @self.temp_dir, removes the
+        subfolders in @remove, and returns the paths of the hot folder and the new folder.
+        """
+
+        # unzip the sample hot folder.
+        parent = os.path.join(self.temp_dir.name, name)
+        with ZipFile("sample_files/hot_folder.zip") as zf:
+            zf.extractall(parent)
+        hot_folder = os.path.join(parent, "hot_folder")
+
+        # remove @remove subfolders.
+        for subfolder in remove:
+            shutil.rmtree(os.path.join(hot_folder, subfolder))
+
+        return hot_folder, parent
+
+
+    def test__transfer_digests(self):
+        """ Are checksum values calculated while moving files across devices passed to the
+        DirectoryObject used for the manifest? """
+
+        # package an account "across devices" while calculating checksums.
+        hot_folder, destination_dir = self._get_hot_folder("foo")
+        packager = Packager("foo", hot_folder, destination_dir, mets_template="",
+                manifest_template=self.manifest_template, hash_transfers=True)
+        packager._aip_maker_cls = CrossDeviceAIPMaker
+        packager.package()
+        digests = packager.aip_obj.digests
+
+        # make sure the transferred files' checksums were passed along.
+        self.assertEqual(9, len(digests))
+        self.assertEqual(digests, dict((path, packager.directory_obj.digests[path]) for
+                path in digests))
+
+
+    def test__cache_commit(self):
+        """ Are checksum values stored in the checksum cache committed when packaging fails
+        before the cache would otherwise be closed? """
+
+        # package an account "across devices" with a missing PREMIS log.
+        hot_folder, destination_dir = self._get_hot_folder("foo")
+        cache_file = os.path.join(self.temp_dir.name, "foo.checksums.sqlite")
+        packager = Packager("foo", hot_folder, destination_dir, mets_template="",
+                manifest_template=self.manifest_template, premis_log="foo.log", 
+                checksum_cache=cache_file, hash_transfers=True)
+        packager._aip_maker_cls = CrossDeviceAIPMaker
+        with self.assertRaises(FileNotFoundError):
+            packager.package()
+
+        # count the cached files from a separate connection.
+        conn = sqlite3.connect(cache_file)
+        cached = conn.execute("SELECT COUNT(DISTINCT path) FROM checksums").fetchone()[0]
+        conn.close()
+
+        # make sure the transferred files' checksum values were committed.
+        self.assertEqual(9, cached)
+
+
+    def test__streaming_memory(self):
+        """ Does streaming the included manifest template, pruning an attachment folder and
+        calculating checksums while rendering, use about the same peak traced memory for AIPs
+        with 5,000 and 10,000 synthetic files? """
+
+        # package AIPs of each size in place; trace memory use while rendering.
+        peaks, manifests = [], []
+        for folder_count in [5, 10]:
+
+            # create an AIP folder with an attachments folder to prune and count.
+            aip_dir = os.path.join(self.temp_dir.name, str(folder_count), "foo")
+            attachments_dir = os.path.join(aip_dir, "eaxs", "attachments")
+            os.makedirs(attachments_dir)
+            for i in range(3):
+                with open(os.path.join(attachments_dir, "{}.xml".format(i)), "w") as f:
+                    f.write("foo")
+
+            # package the AIP.
+            parent = os.path.dirname(aip_dir)
+            packager = Packager("foo", parent, parent, mets_template="",
+                    manifest_template=self.manifest_template, stream_manifest=True)
+            packager._aip_maker_cls = LenientAIPMaker
+            packager._directory_object_cls = type("SyntheticDirectoryObject", 
+                    (SyntheticDirectoryObject,), {"__slots__": (), "_tree_snapshot": type(
+                    "SyntheticSnapshot", (SyntheticSnapshot,), {"folder_count": 
+                    folder_count})})
+            tracemalloc.start()
+            self.assertTrue(packager.package())
+            peaks.append(tracemalloc.get_traced_memory()[1] / 1048576)
+            tracemalloc.stop()
+            with open(packager.manifest_path) as f:
+                manifests.append(f.read())
+
+        # make sure all files were handled and peak memory didn't grow with file count.
+        self.assertEqual([5000, 10000], [manifest.count('CHECKSUM="{}"'.format("0" * 64))
+            for manifest in manifests])
+        self.assertEqual(2, sum("Skipped 3 EAXS attachment files." in manifest for 
+            manifest in manifests))
+        self.assertLess(peaks[1] - peaks[0], 0.5)
+
+
+    def test__lxml_validation(self):
+        """ Is a manifest written with lxml validated when the manifest template path, which
+        only turns on manifest creation, doesn't exist? """
+
+        # write a temporary schema that accepts any METS root element.
+        xsd_path = os.path.join(self.temp_dir.name, "mets.xsd")
+        with open(xsd_path, "w") as f:
+            f.write("""<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" 
+                targetNamespace="http://www.loc.gov/METS/"><xs:element name="mets">
+                <xs:complexType><xs:sequence><xs:any processContents="skip" minOccurs="0"
+                maxOccurs="unbounded"/></xs:sequence><xs:anyAttribute processContents="skip"
+                /></xs:complexType></xs:element></xs:schema>""")
+
+        # package an account with lxml and a missing manifest template; validate the 
+        # manifest against the temporary schema.
+        hot_folder, destination_dir = self._get_hot_folder("foo")
+        packager = Packager("foo", hot_folder, destination_dir, mets_template="",
+                manifest_template="foo.xml", manifest_engine="lxml", validate_manifest=True)
+        packager._aip_maker_cls = LenientAIPMaker
+        packager._mets_maker_cls = type("LocalMETSMaker", (METSMaker,), {"_default_xsd": 
+            xsd_path})
+        is_valid = packager.package()
+        with open(packager.manifest_path) as f:
+            manifest = f.read()
+
+        # make sure the manifest was written and validated.
+        self.assertTrue(is_valid)
+        self.assertIn("NOTE: this METS file is valid", manifest)
+
+
+    def test__missing_eaxs(self):
+        """ Does packaging an account without an EAXS folder finish without errors, skipping
+        the EAXS harvest and failing EAXS verification? """
+
+        # package an account without an EAXS folder, first with the actual AIPMaker.
+        results = []
+        for i, (aip_maker_cls, options) in enumerate([(AIPMaker, {"harvest_eaxs": True}),
+                (LenientAIPMaker, {"harvest_eaxs": True}),
+                (LenientAIPMaker, {"verify_eaxs": True})]):
+            hot_folder, destination_dir = self._get_hot_folder(str(i), ["eaxs"])
+            packager = Packager("foo", hot_folder, destination_dir, mets_template="",
+                    manifest_template=self.manifest_template, **options)
+            packager._aip_maker_cls = aip_maker_cls
+            results.append((packager.package(), packager.eaxs_obj))
+
+        # make sure only the harvest with a valid AIP structure passed.
+        self.assertEqual([(False, None), (True, None), (False, None)], results)
+
+
+    def test__nested_attachment_audit(self):
+        """ Does an AIP with a file nested below its attachments folder pass an audit
+        against its own manifest, while a nested file outside that folder doesn't? """
+
+        # package an account with a nested attachment.
+        hot_folder, destination_dir = self._get_hot_folder("foo")
+        nested_dir = os.path.join(hot_folder, "eaxs", "foo", "attachments", "sub")
+        os.mkdir(nested_dir)
+        with open(os.path.join(nested_dir, "nested.bin"), "wb") as f:
+            f.write(b"foo")
+        packager = Packager("foo", hot_folder, destination_dir, mets_template="",
+                manifest_template=self.manifest_template)
+        packager.package()
+
+        # audit the AIP; then add a nested file outside the attachments folder.
+        results = [packager.audit()]
+        nested_dir = os.path.join(packager.aip_dir, "eaxs", "sub")
+        os.mkdir(nested_dir)
+        with open(os.path.join(nested_dir, "nested.bin"), "wb") as f:
+            f.write(b"foo")
+        results.append(packager.audit())
+
+        # make sure only the nested attachment was skipped.
+        self.assertEqual([True, False], results)
+        self.assertEqual([("eaxs/sub/nested.bin", "extra")], [row[:2] for row in 
+            packager.auditor_obj.report()])
+
+
+# CLI.
+def main(account_id:("email account identifier"),
+        source_dir:("path to email \"hot folder\""),
+        destination_dir:("AIP destination path"),
+        verify_eaxs:("verify attachments against checksums in EAXS files", "flag", "v")=\
+            False):
+
+    "Packages an email account with only a METS manifest and prints whether the AIP is\
+    valid.\
+    \nexample: `python3 test__packager.py foo sample_files/hot_folder sample_files`"
+
+    # package @account_id.
+    packager = Packager(account_id, source_dir, destination_dir, mets_template="",
+            manifest_template="../tomes_packager/mets_templates/MANIFEST.XML",
+            verify_eaxs=verify_eaxs)
+    print(packager.package())
+
+
+if __name__ == "__main__":
+    plac.call(main)
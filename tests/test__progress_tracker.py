@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+# import modules.
+import sys; sys.path.append("..")
+import json
+import logging
+import os
+import plac
+import tempfile
+import unittest
+from tomes_packager.lib.checksum_cache import *
+from tomes_packager.lib.directory_object import *
+from tomes_packager.lib.progress_tracker import *
+
+# enable logging.
+logging.basicConfig(level=logging.DEBUG)
+
+
+class Test_ProgressTracker(unittest.TestCase):
+
+
+    def setUp(self):
+
+        # create sample files.
+        self.temp_dir = tempfile.TemporaryDirectory(dir=".")
+        for i in range(3):
+            with open(os.path.join(self.temp_dir.name, "{}.txt".format(i)), "wb") as f:
+                f.write(b"x" * (i + 1) * 1000)
+
+        # set attributes.
+        self.reports = []
+        self.tracker = ProgressTracker(callback=self.reports.append, interval=0)
+        self.cache = ChecksumCache(os.path.join(self.temp_dir.name, "cache.sqlite"))
+
+
+    def tearDown(self):
+
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+
+    def test__progress(self):
+        """ Are found, hashed, and cached files counted and reported? """
+
+        # scan the files; cache a value for one of them.
+        dir_obj = DirectoryObject(self.temp_dir.name, checksum_cache=self.cache,
+                progress=self.tracker)
+        file_objects = [f for f in dir_obj.files() if f.basename.endswith(".txt")]
+        self.tracker.scan(file_objects)
+        self.cache.set(file_objects[0].abspath, {"SHA-256": "cached"})
+
+        # calculate checksums.
+        for file_obj in file_objects:
+            file_obj.checksum()
+        stats = self.tracker.report()
+
+        # make sure counts are correct and the work is done.
+        counts = (stats["files_found"], stats["bytes_found"], stats["files_hashed"],
+                stats["bytes_hashed"] + stats["bytes_skipped"], stats["eta"])
+        self.assertEqual((3, 6000, 2, 6000, 0), counts)
+        self.assertEqual(3 + 3 + 1, len(self.reports))
+
+
+# CLI.
+def main(folder:("folder path"),
+        interval:("seconds between progress reports", "option", None, float)=1):
+
+    "Calculates SHA-256 checksums for all files in a folder and prints progress reports to\
+    screen as JSON.\
+    \nexample: `python3 test__progress_tracker.py sample_files -interval 0`"
+
+    # create a tracker and a DirectoryObject that uses it.
+    tracker = ProgressTracker(lambda s: print(json.dumps(s)), interval)
+    dir_obj = DirectoryObject(folder, progress=tracker)
+
+    # count files; then calculate checksums.
+    tracker.scan(dir_obj.rfiles())
+    for file_obj in dir_obj.rfiles():
+        file_obj.checksum()
+    tracker.report()
+
+
+if __name__ == "__main__":
+    plac.call(main)
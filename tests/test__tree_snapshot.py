@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+# import modules.
+import sys; sys.path.append("..")
+import logging
+import os
+import plac
+import tempfile
+import unittest
+from tomes_packager.lib.tree_snapshot import *
+
+# enable logging.
+logging.basicConfig(level=logging.DEBUG)
+
+
+class Test_TreeSnapshot(unittest.TestCase):
+
+
+    def setUp(self):
+
+        # create a sample folder tree with a symbolic link to a folder.
+        self.temp_dir = tempfile.TemporaryDirectory(dir=".")
+        self.sample_dir = os.path.normpath(self.temp_dir.name)
+        for folder in ["a/b", "a/c", "d"]:
+            os.makedirs(os.path.join(self.sample_dir, folder))
+            for i in range(3):
+                with open(os.path.join(self.sample_dir, folder, "{}.txt".format(i)),
+                        "w") as f:
+                    f.write(folder)
+        os.symlink(os.path.abspath(os.path.join(self.sample_dir, "a")),
+                os.path.join(self.sample_dir, "d", "link"))
+
+
+    def tearDown(self):
+
+        self.temp_dir.cleanup()
+
+
+    def test__walk(self):
+        """ Does a snapshot walk yield the same folders and files in the same order as
+        os.walk? """
+
+        # walk @self.sample_dir with os.walk and with a snapshot.
+        os_walk = [(dirpath, dirnames, filenames) for dirpath, dirnames, filenames in
+                os.walk(self.sample_dir)]
+        snapshot = TreeSnapshot(self.sample_dir)
+        snapshot.build()
+        snapshot_walk = [(dirpath, [d[0] for d in dirs], [f[0] for f in files]) for
+                dirpath, dir_stat, dirs, files in snapshot.walk(self.sample_dir)]
+
+        # make sure they are equal.
+        self.assertEqual(os_walk, snapshot_walk)
+
+
+    def test__parallel_walk(self):
+        """ Does a snapshot walk with worker threads yield the same folders and files in the
+        same order as os.walk? """
+
+        # walk @self.sample_dir with os.walk and with a snapshot that uses 3 threads.
+        os_walk = [(dirpath, dirnames, filenames) for dirpath, dirnames, filenames in
+                os.walk(self.sample_dir)]
+        snapshot = TreeSnapshot(self.sample_dir, workers=3)
+        snapshot_walk = [(dirpath, [d[0] for d in dirs], [f[0] for f in files]) for
+                dirpath, dir_stat, dirs, files in snapshot.walk(self.sample_dir)]
+
+        # make sure they are equal.
+        self.assertEqual(os_walk, snapshot_walk)
+
+
+    def test__index(self):
+        """ Does a saved index reload unchanged folders with the same listings and skip a
+        folder whose modification time changed? """
+
+        # save an index; then add a file to "d" and change its modification time.
+        index_dir = tempfile.TemporaryDirectory(dir=".")
+        index_file = os.path.join(index_dir.name, "index.sqlite")
+        snapshot = TreeSnapshot(self.sample_dir)
+        snapshot.build()
+        snapshot.save(index_file)
+        changed_dir = os.path.join(self.sample_dir, "d")
+        open(os.path.join(changed_dir, "new.txt"), "w").close()
+        mtime_ns = os.stat(changed_dir).st_mtime_ns
+        os.utime(changed_dir, ns=(mtime_ns, mtime_ns + 1000000000))
+
+        # load the index into a new snapshot.
+        reloaded = TreeSnapshot(self.sample_dir)
+        loaded = reloaded.load(index_file)
+        reloaded_walk = list(reloaded.walk(self.sample_dir))
+        os_walk = list(os.walk(self.sample_dir))
+        index_dir.cleanup()
+
+        # make sure all but "d" were loaded and walks still match os.walk.
+        self.assertEqual((len(snapshot._listings) - 1, os_walk), (loaded, [(dirpath,
+            [d[0] for d in dirs], [f[0] for f in files]) for dirpath, dir_stat, dirs, files
+            in reloaded_walk]))
+        self.assertEqual(snapshot._listings[self.sample_dir],
+                reloaded._listings[self.sample_dir])
+
+
+# CLI.
+def main(folder:("folder path"),
+        workers:("number of threads listing folders", "option", None, int)=1):
+
+    "Captures a snapshot of a folder and prints each folder with its file count.\
+    \nexample: `python3 test__tree_snapshot.py sample_files -workers 4`"
+
+    # create and walk a snapshot of @folder.
+    snapshot = TreeSnapshot(folder, workers)
+    snapshot.build()
+    for dirpath, dir_stat, dirs, files in snapshot.walk(snapshot.path):
+        print("{}: {} file(s)".format(dirpath, len(files)))
+
+
+if __name__ == "__main__":
+    plac.call(main)
@@ -9,6 +9,7 @@ import logging
 import logging.config
 import os
 import shutil
+from .file_object import FileObject
 
 
 class AIPMaker():
@@ -28,6 +29,9 @@ class AIPMaker():
         "passed", and "failed". Each key's value is a list.
         - transfer_stats (function): Returns a dict for each key in @transfers. The value
         of each key is the number of items for that key in @transfers.
+        - digests (dict): The checksum values calculated while copying files across devices
+        keyed by the absolute path of each copied file. Each value is a dict of checksum 
+        values keyed by algorithm. This is suitable for use as DirectoryObject.digests.
         
 
     Example:
@@ -38,13 +42,23 @@ class AIPMaker():
     """
 
     
-    def __init__(self, account_id, source_dir, destination_dir):
+    def __init__(self, account_id, source_dir, destination_dir, checksum_algorithms=None,
+            verify_transfers=False):
         """ Sets instance attributes.
 
         Args:
             - account_id (str): The email account's base identifier, i.e. the file prefix.
             - source_dir (str): The folder path from which to transfer data.
             - destination_dir (str): The folder path in which to create the AIP structure.
+            - checksum_algorithms (tuple): The algorithms with which to calculate checksum 
+            values while copying files to a different device. Each file is then read only 
+            once and a copy is only considered successful if the number of bytes written 
+            equals the number of bytes read and the source file didn't change during the 
+            copy. If None, data is moved with shutil.move() and no checksum values are 
+            calculated. See FileObject._get_hashers() for supported algorithms.
+            - verify_transfers (bool): Use True to re-read each copied file and verify that
+            its checksum values equal those of the source file. This only applies if 
+            @checksum_algorithms is not None.
 
         Raises:
             - NotADirectoryError: If @source_dir or @destination_dir are not actual folder 
@@ -69,6 +83,8 @@ class AIPMaker():
         self.account_id = str(account_id) 
         self.source_dir = source_dir
         self.destination_dir = destination_dir
+        self.checksum_algorithms = checksum_algorithms
+        self.verify_transfers = verify_transfers
         
         # convenience functions to clean up path notation.
         self._normalize_sep = lambda p: p.replace(os.sep, os.altsep) if (
@@ -94,6 +110,15 @@ class AIPMaker():
         self.transfer_stats = lambda: dict((k, len(self.transfers[k])) 
                 for k in self.transfers)
 
+        # set storage container for checksum values calculated during transfers.
+        self.digests = {}
+
+        # add dependency attributes.
+        self._file_object = FileObject
+
+        # set the chunk size with which to copy files.
+        self._block_size = 1048576
+
 
     def _remove_folder(self, folder):
         """ Removes the given @folder if it is empty. 
@@ -148,6 +173,145 @@ class AIPMaker():
         return
 
 
+    def _copy_file(self, source, destination):
+        """ Copies @source to @destination while calculating checksum values from the bytes
+        that are read. Metadata such as the modification time is copied as well.
+
+        Args:
+            - source (str): The file to copy.
+            - destination (str): The path of the new file.
+
+        Returns:
+            dict: The return value.
+            Each key is an algorithm and each value is the corresponding checksum value.
+
+        Raises:
+            - OSError: If the copy can't be verified. The unverified copy is removed.
+        """
+
+        self.logger.debug("Copying '{}' to: {}".format(source, destination))
+
+        # establish hashlib functions and a reusable buffer.
+        hashers = self._file_object._get_hashers(self.checksum_algorithms)
+        buffer = bytearray(self._block_size)
+        view = memoryview(buffer)
+
+        # copy @source to @destination; update checksums with each chunk.
+        source_stat = os.stat(source)
+        bytes_read, bytes_written = 0, 0
+        with open(source, "rb", buffering=0) as src, open(destination, "wb") as dst:
+            while True:
+                length = src.readinto(buffer)
+                if not length:
+                    break
+                chunk = view[:length]
+                for hasher in hashers.values():
+                    hasher.update(chunk)
+                bytes_read += length
+                bytes_written += dst.write(chunk)
+                chunk.release()
+        shutil.copystat(source, destination)
+        checksums = dict((alg, h.hexdigest()) for alg, h in hashers.items())
+
+        # verify the copy.
+        current_stat = os.stat(source)
+        tests = {"bytes read equals bytes written": bytes_read == bytes_written,
+                "destination size equals bytes read": 
+                    os.path.getsize(destination) == bytes_read,
+                "source didn't change during copy": 
+                    (source_stat.st_size, source_stat.st_mtime_ns) == (
+                    current_stat.st_size, current_stat.st_mtime_ns)}
+        if self.verify_transfers:
+            tests["destination checksums equal source checksums"] = (checksums == 
+                    self._file_object._hash_file(destination, self.checksum_algorithms))
+        failed = [test for test in tests if not tests[test]]
+        if len(failed) != 0:
+            msg = "Can't verify copy of '{}'; failed tests: {}".format(source, failed)
+            self.logger.error(msg)
+            os.remove(destination)
+            raise OSError(msg)
+
+        return checksums
+
+
+    def _is_same_device(self, path, folder):
+        """ Determines if @path and @folder are on the same device.
+
+        Args:
+            - path (str): The file or folder path.
+            - folder (str): The folder path.
+
+        Returns:
+            bool: The return value.
+        """
+
+        return os.stat(path).st_dev == os.stat(folder).st_dev
+
+
+    def _move_item(self, item, destination_dir):
+        """ Moves the file or folder @item into @destination_dir. If 
+        @self.checksum_algorithms is None or if @item and @destination_dir are on the same
+        device, shutil.move() is used. Otherwise, files are copied while calculating checksum
+        values which are stored in @self.digests. Sources are deleted only after all copies 
+        are verified; otherwise, the partial copy and its checksum values are removed.
+
+        Args:
+            - item (str): The file or folder to move.
+            - destination_dir (str): The folder into which to move @item.
+
+        Returns:
+            None
+
+        Raises:
+            - OSError: If @item can't be moved.
+        """
+
+        # if possible, use shutil.move().
+        if self.checksum_algorithms is None or self._is_same_device(item, destination_dir):
+            shutil.move(item, destination_dir)
+            return
+
+        # verify @item doesn't already exist in @destination_dir.
+        target = os.path.join(destination_dir, os.path.basename(item))
+        if os.path.lexists(target):
+            msg = "Destination path '{}' already exists.".format(target)
+            self.logger.error(msg)
+            raise OSError(msg)
+
+        # convenience function to get normalized absolute paths.
+        _abspath = lambda p: self._normalize_sep(os.path.normpath(os.path.abspath(p)))
+
+        # copy files, checksumming as they are read; copy folders and links as they are.
+        try:
+            if os.path.isfile(item) and not os.path.islink(item):
+                self.digests[_abspath(target)] = self._copy_file(item, target)
+            else:
+                def copy_function(src, dst):
+                    self.digests[_abspath(dst)] = self._copy_file(src, dst)
+                shutil.copytree(item, target, symlinks=True, copy_function=copy_function)
+
+        # if any copy failed, remove the partial copy so that the move can be retried.
+        except OSError:
+            self.logger.warning("Removing partial copy: {}".format(target))
+            if os.path.isdir(target) and not os.path.islink(target):
+                shutil.rmtree(target)
+            elif os.path.lexists(target):
+                os.remove(target)
+            prefix = self._normalize_sep(os.path.join(_abspath(target), ""))
+            for path in [p for p in self.digests if p == _abspath(target) or 
+                    p.startswith(prefix)]:
+                self.digests.pop(path)
+            raise
+
+        # remove @item.
+        if os.path.isdir(item) and not os.path.islink(item):
+            shutil.rmtree(item)
+        else:
+            os.remove(item)
+
+        return
+
+
     def _transfer_data(self, source_dir, destination_dir, find_files=True):
         """ Moves data in @source_dir to @destination_dir. If @find_files is True, only
         files in @source_dir with basenames that equal @self.account_id will be moved.
@@ -201,7 +365,7 @@ class AIPMaker():
         for item in data:
             try:
                 self.logger.info("Moving '{}' to: {}".format(item, destination_dir))
-                shutil.move(item, destination_dir)
+                self._move_item(item, destination_dir)
                 self.transfers["passed"].append(item)
             except OSError as err:
                 self.logger.warning("Can't move '{}' to: {}".format(item, destination_dir))
@@ -251,7 +415,7 @@ class AIPMaker():
         # test if MIME and EAXS folders exist in the AIP and aren't empty.
         for required_folder in [self.mime_dir, self.eaxs_dir]:
             
-            test = os.path.isdir(required_folder)
+            test = required_folder is not None and os.path.isdir(required_folder)
             validation_tests.append(test)
             if not test:
                 self.logger.warning("Missing required folder: {}".format(required_folder))
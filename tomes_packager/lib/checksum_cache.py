@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+
+""" This module contains a class for storing file checksum values in an SQLite database so
+that unchanged files don't need to be re-read. """
+
+# import modules.
+import logging
+import logging.config
+import os
+import sqlite3
+import threading
+
+
+class ChecksumCache():
+    """ A class for storing file checksum values in an SQLite database so that unchanged files
+    don't need to be re-read.
+
+    Each value is keyed on the device, inode, size, and modification time (in nanoseconds) of
+    the file along with the checksum algorithm. If any of these change, the cached value no
+    longer applies.
+
+    Attributes:
+        - cache_file (str): The path to the SQLite database.
+        - strict (bool): If True, cached values are never returned, but newly calculated
+        values are still stored.
+        - hits (int): The number of values returned from the cache.
+        - misses (int): The number of values requested but not found in the cache.
+
+    Example:
+        >>> cache = ChecksumCache("foo.checksums.sqlite")
+        >>> cache.get("foo.txt", ["SHA-256"]) # {}
+        >>> cache.set("foo.txt", {"SHA-256": "e3b0c4..."})
+        >>> cache.get("foo.txt", ["SHA-256"]) # {"SHA-256": "e3b0c4..."}
+        >>> cache.evict() # removes values for missing or altered files.
+        >>> cache.close()
+    """
+
+
+    def __init__(self, cache_file, strict=False):
+        """ Sets instance attributes.
+
+        Args:
+            - cache_file (str): The path to the SQLite database. It will be created if it
+            doesn't exist.
+            - strict (bool): Use True to ignore cached values. Use False to use them.
+
+        Raises:
+            - NotADirectoryError: If the parent folder of @cache_file doesn't exist.
+        """
+
+        # set logger; suppress logging by default.
+        self.logger = logging.getLogger(__name__)
+        self.logger.addHandler(logging.NullHandler())
+
+        # verify the parent folder of @cache_file exists.
+        cache_dir = os.path.dirname(os.path.abspath(cache_file))
+        if not os.path.isdir(cache_dir):
+            msg = "Can't find: {}".format(cache_dir)
+            self.logger.error(msg)
+            raise NotADirectoryError(msg)
+
+        # set attributes.
+        self.cache_file = cache_file
+        self.strict = strict
+        self.hits = 0
+        self.misses = 0
+
+        # set the number of writes to allow before committing.
+        self._commit_interval = 1000
+        self._pending_writes = 0
+
+        # connect to @cache_file; allow use from multiple threads.
+        self.logger.info("Opening checksum cache: {}".format(self.cache_file))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.cache_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""CREATE TABLE IF NOT EXISTS checksums (
+                device INTEGER, inode INTEGER, size INTEGER, mtime_ns INTEGER,
+                algorithm TEXT, checksum TEXT, path TEXT,
+                PRIMARY KEY (device, inode, size, mtime_ns, algorithm))""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS path_index ON checksums (path)")
+        self._conn.commit()
+
+        if self.strict:
+            self.logger.info("Strict mode is on; cached checksum values will be ignored.")
+
+
+    def _get_key(self, path, stat=None):
+        """ Returns the file-specific part of the cache key for @path.
+
+        Args:
+            - path (str): The file path.
+            - stat (os.stat_result): The status of @path. If None, @path will be stat'ed.
+
+        Returns:
+            tuple: The return value.
+            The items are the device, inode, size, and modification time in nanoseconds.
+        """
+
+        if stat is None:
+            stat = os.stat(path)
+
+        key = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        return key
+
+
+    def get(self, path, algorithms, stat=None):
+        """ Returns cached checksum values for @path.
+
+        Args:
+            - path (str): The file path.
+            - algorithms (list): The algorithms for which to return checksum values.
+            - stat (os.stat_result): The status of @path. If None, @path will be stat'ed.
+
+        Returns:
+            dict: The return value.
+            Each key is an algorithm and each value is the cached checksum value. Algorithms
+            without a cached value are omitted. This is empty if @self.strict is True.
+        """
+
+        # if @self.strict is True, ignore the cache.
+        if self.strict:
+            self.misses += len(algorithms)
+            return {}
+
+        # query the database.
+        key = self._get_key(path, stat)
+        placeholders = ",".join("?" * len(algorithms))
+        query = ("SELECT algorithm, checksum FROM checksums WHERE device=? AND inode=? AND "
+                "size=? AND mtime_ns=? AND algorithm IN ({})".format(placeholders))
+        with self._lock:
+            rows = self._conn.execute(query, key + tuple(algorithms)).fetchall()
+        checksums = dict(rows)
+
+        # update stats.
+        self.hits += len(checksums)
+        self.misses += len(algorithms) - len(checksums)
+        self.logger.debug("Found {} of {} cached checksum value(s) for: {}".format(
+            len(checksums), len(algorithms), path))
+
+        return checksums
+
+
+    def set(self, path, checksums, stat=None):
+        """ Stores @checksums for @path. Values for previous versions of the same file (i.e.
+        the same device and inode with a different size or modification time) are removed.
+
+        Args:
+            - path (str): The file path.
+            - checksums (dict): Each key is an algorithm and each value is the checksum value.
+            - stat (os.stat_result): The status of @path when @checksums were calculated. If
+            None, @path will be stat'ed.
+
+        Returns:
+            None
+        """
+
+        key = self._get_key(path, stat)
+        rows = [key + (alg, checksum, os.path.abspath(path)) for alg, checksum in
+                checksums.items()]
+
+        with self._lock:
+
+            # remove stale values for @path.
+            self._conn.execute("DELETE FROM checksums WHERE device=? AND inode=? AND "
+                    "(size!=? OR mtime_ns!=?)", key)
+
+            # store @checksums.
+            self._conn.executemany("INSERT OR REPLACE INTO checksums VALUES "
+                    "(?, ?, ?, ?, ?, ?, ?)", rows)
+
+            # commit periodically.
+            self._pending_writes += 1
+            if self._pending_writes >= self._commit_interval:
+                self._conn.commit()
+                self._pending_writes = 0
+
+        return
+
+
+    def evict(self, folder=None):
+        """ Removes cached values for files that no longer exist or have changed since their
+        values were stored.
+
+        Args:
+            - folder (str): The folder within which to check cached files. If None, all
+            cached files will be checked.
+
+        Returns:
+            int: The return value.
+            The number of removed values.
+        """
+
+        self.logger.info("Evicting stale checksum values from: {}".format(self.cache_file))
+
+        # determine which cached files are stale; iterate over rows instead of fetching 
+        # them all so that memory use doesn't grow with the size of the cache.
+        stale = []
+        with self._lock:
+            if folder is None:
+                rows = self._conn.execute("SELECT DISTINCT device, inode, size, mtime_ns, "
+                        "path FROM checksums")
+            else:
+                prefix = os.path.join(os.path.abspath(folder), "")
+                rows = self._conn.execute("SELECT DISTINCT device, inode, size, mtime_ns, "
+                        "path FROM checksums WHERE substr(path, 1, ?)=?",
+                        (len(prefix), prefix))
+            for row in rows:
+                key, path = row[:4], row[4]
+                try:
+                    if self._get_key(path) == key:
+                        continue
+                except OSError:
+                    pass
+                stale.append(key)
+
+        # remove stale values.
+        with self._lock:
+            removed = self._conn.total_changes
+            self._conn.executemany("DELETE FROM checksums WHERE device=? AND inode=? AND "
+                    "size=? AND mtime_ns=?", stale)
+            self._conn.commit()
+            removed = self._conn.total_changes - removed
+
+        self.logger.info("Evicted {} stale checksum value(s).".format(removed))
+        return removed
+
+
+    def close(self):
+        """ Commits pending values and closes the database.
+
+        Returns:
+            None
+        """
+
+        self.logger.info("Closing checksum cache; hits: {}, misses: {}".format(self.hits,
+            self.misses))
+
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+        return
+
+
+if __name__ == "__main__":
+    pass
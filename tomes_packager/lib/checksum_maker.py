@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+
+""" This module contains a class for calculating file checksum values in parallel. """
+
+# import modules.
+import logging
+import logging.config
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from .file_object import FileObject
+
+
+class ChecksumMaker():
+    """ A class for calculating file checksum values in parallel.
+
+    Since hashlib releases the GIL while hashing, threads are used by default. Processes may
+    be used instead if hashing is CPU bound. Either way, results are returned in the same
+    order as the files are passed in.
+
+    Example:
+        >>> from directory_object import DirectoryObject
+        >>> dir_obj = DirectoryObject("../../tests/sample_files")
+        >>> cm = ChecksumMaker(workers=4)
+        >>> dir_obj.digests = cm.make(dir_obj.rfiles()) # returns dict.
+        >>> for file_obj in dir_obj.rfiles():
+        >>>     file_obj.checksum("SHA-256") # uses the precomputed value.
+    """
+
+
+    def __init__(self, workers=None, use_processes=False, algorithms=("SHA-256",),
+            block_size=None, checksum_cache=None, progress=None):
+        """ Sets instance attributes.
+
+        Args:
+            - workers (int): The maximum number of worker threads or processes. If None, the
+            number of CPUs will be used.
+            - use_processes (bool): Use True to hash files in a process pool. Use False to
+            hash files in a thread pool.
+            - algorithms (tuple): The algorithms with which to calculate checksum values. All
+            values for a given file are calculated in one read of the file. See 
+            FileObject._get_hashers() for supported algorithms.
+            - block_size (int): The chunk size with which to iteratively read each file. If
+            None, the chunk size adapts to each file's size. See FileObject._hash_file().
+            - checksum_cache (ChecksumCache): An optional persistent store of checksum values.
+            Files with cached values for all of @algorithms aren't read. Newly calculated 
+            values are added to it.
+            - progress (ProgressTracker): An optional tracker to update as each file is
+            hashed or found in @checksum_cache.
+
+        Raises:
+            - ValueError: If @workers is less than 1.
+        """
+
+        # set logger; suppress logging by default.
+        self.logger = logging.getLogger(__name__)
+        self.logger.addHandler(logging.NullHandler())
+
+        # verify @workers is legal.
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            msg = "Worker count must be at least 1, got: {}".format(workers)
+            self.logger.error(msg)
+            raise ValueError(msg)
+
+        # set attributes.
+        self.workers = workers
+        self.use_processes = use_processes
+        self.algorithms = tuple(algorithms)
+        self.block_size = block_size
+        self.checksum_cache = checksum_cache
+        self.progress = progress
+
+        # add dependency attributes.
+        self._file_object = FileObject
+
+        # set the number of files that may be queued per worker at any one time.
+        self._queue_factor = 4
+
+
+    def get_checksums(self, tasks):
+        """ Yields a tuple for each task in @tasks. The first item is the file path and the
+        second item is a dict of checksum values or None if the file could not be read. Only
+        a bounded number of tasks are queued at any one time.
+
+        Args:
+            - tasks (iterable): Each item is a tuple. The first item is the file path for 
+            which to calculate checksum values. The second item is a list of algorithms 
+            with which to calculate them. If the second item is None, @self.algorithms will
+            be used.
+
+        Returns:
+            generator: The return value.
+        """
+
+        # choose a pool type.
+        pool_cls = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+        max_queued = self.workers * self._queue_factor
+
+        # submit @tasks to the pool and yield results in order.
+        with pool_cls(max_workers=self.workers) as pool:
+
+            pending = deque()
+
+            def pop():
+                path, future = pending.popleft()
+                try:
+                    return (path, future.result())
+                except (OSError, ValueError) as err:
+                    self.logger.warning("Can't calculate checksum(s) for: {}".format(path))
+                    self.logger.error(err)
+                    return (path, None)
+
+            for path, algorithms in tasks:
+                if algorithms is None:
+                    algorithms = self.algorithms
+                future = pool.submit(self._file_object._hash_file, path, algorithms,
+                        self.block_size)
+                pending.append((path, future))
+                if len(pending) >= max_queued:
+                    yield pop()
+
+            while pending:
+                yield pop()
+
+
+    def make(self, file_objects):
+        """ Calculates checksum values for each FileObject in @file_objects.
+
+        Args:
+            - file_objects (iterable): The FileObjects for which to calculate checksum
+            values.
+
+        Returns:
+            dict: The return value.
+            Each key is a FileObject's absolute path and each value is a dict of checksum
+            values keyed by algorithm. This is suitable for use as DirectoryObject.digests.
+            Files that couldn't be read are omitted.
+        """
+
+        self.logger.info("Calculating {} checksum(s) with {} worker {}.".format(
+            list(self.algorithms), self.workers,
+            "process(es)" if self.use_processes else "thread(s)"))
+
+        digests = {}
+        stats = {}
+        sizes = {}
+
+        # yield tasks for files without cached values.
+        def get_uncached():
+            for file_obj in file_objects:
+                path = file_obj.abspath
+                if self.checksum_cache is not None:
+                    stats[path] = file_obj.stat
+                    checksums = self.checksum_cache.get(path, self.algorithms, stats[path])
+                    if len(checksums) == len(self.algorithms):
+                        digests[path] = checksums
+                        del stats[path]
+                        if self.progress is not None:
+                            self.progress.skipped(file_obj.size)
+                        continue
+                sizes[path] = file_obj.size
+                yield (path, None)
+
+        # calculate checksum values.
+        for path, checksums in self.get_checksums(get_uncached()):
+            size = sizes.pop(path)
+            if checksums is None:
+                stats.pop(path, None)
+                continue
+            digests[path] = checksums
+            if self.checksum_cache is not None:
+                self.checksum_cache.set(path, checksums, stats.pop(path))
+            if self.progress is not None:
+                self.progress.hashed(size)
+            self.logger.debug("Calculated checksum(s) for: {}".format(path))
+
+        self.logger.info("Calculated checksum(s) for {} file(s).".format(len(digests)))
+        return digests
+
+
+if __name__ == "__main__":
+    pass
@@ -4,11 +4,18 @@
 """
 
 # import modules.
+import fnmatch
+import json
 import logging
 import logging.config
 import os
-from datetime import datetime
+import re
+import sys
+from collections import OrderedDict
+from stat import S_ISDIR
 from .file_object import FileObject
+from .mime_resolver import MimeResolver
+from .tree_snapshot import TreeSnapshot
 
 
 class DirectoryObject(object):
@@ -23,6 +30,7 @@ class DirectoryObject(object):
         - depth (int): The distance from @self.root_object.
         - created (str): The creation date as ISO 8601.
         - modified (str): The modified date as ISO 8601.
+        - stat (os.stat_result): The status of @self.path when the object was created.
         - dirs (function): Returns a generator for all subfolders (non-recursive) within 
         @self.path. Each item is a DirectoryObject.
         - rdirs (function):  Returns a generator for all subfolders (recursive) within 
@@ -31,10 +39,101 @@ class DirectoryObject(object):
         @self.path. Each item is a FileObject.
         - rfiles (function): Returns a generator for all files (recursive) within @self.path.
         Each item is a FileObject.
+        - digests (dict): Precomputed checksum values keyed by absolute file path. Each value
+        is a dict of checksum values keyed by algorithm, e.g. {"SHA-256": "..."}. FileObjects
+        use the @digests of their root object instead of re-reading files. See 
+        .checksum_maker.ChecksumMaker.
+        - checksum_algorithms (tuple): The algorithms that FileObjects calculate together 
+        whenever they need to read a file for any checksum value.
+        - checksum_cache (ChecksumCache): The optional persistent cache that FileObjects 
+        consult before reading a file and update after reading one.
+        - checksum_block_size (int): The chunk size with which FileObjects read files while
+        calculating checksum values. If None, the chunk size adapts to each file's size.
+        - progress (ProgressTracker): The optional tracker that FileObjects update after
+        calculating checksum values.
+        - scan_workers (int): The maximum number of threads with which recursive traversals
+        list folders. See .tree_snapshot.TreeSnapshot.
+        - retain_listings (bool): True if the tree snapshot keeps folder listings between 
+        traversals.
+        - mime_resolver (MimeResolver): The resolver that FileObjects use to get their MIME
+        types. See .mime_resolver.MimeResolver.
+        - prefetcher (MetadataPrefetcher): An optional prefetcher through which file 
+        traversals are passed so that FileObjects' metadata is resolved ahead of their use.
+        Only the root object's is used; set it there. See 
+        .metadata_prefetcher.MetadataPrefetcher.
+        - file_count (int): The number of files within @self.path, including subfolders.
+        - total_size (int): The total size in bytes of the files counted by @file_count.
+        - oldest_modified (str): The oldest modified date of the files counted by 
+        @file_count as ISO 8601 or None if there are none.
+        - newest_modified (str): The newest modified date of the files counted by 
+        @file_count as ISO 8601 or None if there are none.
+        - skipped (int): The number of files or folders left out of the most recent 
+        traversal from @self.path because of its include or exclude filters. This is 
+        updated as the traversal proceeds.
+
+    All traversals are served from a TreeSnapshot shared by the root object. Each folder is
+    listed only when a traversal first reaches it, with one status call per file and 
+    folder, so non-recursive traversals don't touch subfolders. Use .refresh() if the 
+    contents of a folder change after it's been listed. Use .save_index() and 
+    .load_index() to reuse listings of unchanged folders in a later run. If 
+    @retain_listings is False, listings are instead discarded once traversed so that memory
+    use doesn't grow with the number of files; each traversal then lists folders again.
+
+    The @file_count, @total_size, @oldest_modified, and @newest_modified attributes are 
+    calculated bottom-up for a folder and all of its subfolders in one traversal when any
+    of them is first accessed. The root object keeps them, so they're available for every
+    folder in that subtree without traversing it again. They include all files regardless 
+    of traversal filters, but not files within symbolic links to folders.
+
+    The @parent_object of each traversed file or folder is shared: each folder is 
+    represented by one DirectoryObject per root object. The root object keeps up to 1000 of
+    the most recently used ones for as long as it exists. Older ones stay valid for the 
+    objects that reference them, but requesting the same folder again creates a new one.
+
+    Traversals accept include and exclude filters: glob patterns or functions that are 
+    matched against the path relative to @self.root_object, e.g. "eaxs/attachments". 
+    Excluded folders are pruned during the traversal: they're counted but never listed, so
+    nothing within them is stat'ed. File @index values are the same as they'd be without
+    filters.
+
+    As with FileObject, instances are slotted and the path and date attributes of objects
+    other than the root object are only calculated when first accessed. Objects other than
+    the root object share its @digests, checksum settings, and @mime_resolver.
     """
 
+    # set attributes; avoid per-instance dictionaries.
+    __slots__ = ("path", "parent_object", "root_object", "depth", "stat", "_name", 
+            "_abspath", "_created", "_modified", "digests", "checksum_algorithms", 
+            "checksum_cache", "checksum_block_size", "progress", "scan_workers", 
+            "retain_listings", "mime_resolver", "prefetcher", "skipped", "_snapshot", 
+            "_folders", "_totals")
 
-    def __init__(self, path, parent_object=None, root_object=None, depth=0):
+    # set logger; suppress logging by default.
+    logger = logging.getLogger(__name__)
+    logger.addHandler(logging.NullHandler())
+
+    # set path attributes.
+    isdir = True
+    isfile = False
+
+    # add dependency attributes.
+    _file_object = FileObject
+    _tree_snapshot = TreeSnapshot
+    _mime_resolver = MimeResolver
+
+    # set the number of shared folders kept by the root object.
+    _folder_cache_size = 1000
+
+    # convenience functions to clean up path notation.
+    _normalize_sep = staticmethod(FileObject._normalize_sep)
+    _normalize_path = staticmethod(FileObject._normalize_path)
+    _iso_date = staticmethod(FileObject._iso_date)
+
+
+    def __init__(self, path, parent_object=None, root_object=None, depth=0, 
+            checksum_algorithms=("SHA-256",), checksum_cache=None, 
+            checksum_block_size=None, progress=None, stat=None, scan_workers=1,
+            retain_listings=True, mime_resolver=None):
         """ Sets instance attributes.
         
         Args:
@@ -43,20 +142,28 @@ class DirectoryObject(object):
             - root_object (DirectoryObject): The root or "master" folder under which the @path
             folder and its @parent_object reside.
             - depth (int): The distance from @self.root_object.
+            - checksum_algorithms (tuple): The algorithms that FileObjects calculate in one
+            read of a file. See FileObject._get_hashers() for supported algorithms.
+            - checksum_cache (ChecksumCache): An optional persistent store of checksum values
+            from previous runs. See .checksum_cache.ChecksumCache.
+            - checksum_block_size (int): The chunk size with which FileObjects read files 
+            while calculating checksum values. See FileObject._hash_file().
+            - progress (ProgressTracker): An optional tracker of files and bytes processed.
+            See .progress_tracker.ProgressTracker.
+            - stat (os.stat_result): The status of @path, if already known. If None, @path
+            will be stat'ed.
+            - scan_workers (int): The maximum number of threads with which recursive 
+            traversals list folders. Use more than 1 for storage with high latency per 
+            listing or status call, e.g. NFS. Traversal order is unaffected.
+            - retain_listings (bool): Use False to discard folder listings once they've been 
+            traversed, e.g. when streaming a manifest of a very large folder.
+            - mime_resolver (MimeResolver): The resolver with which FileObjects get their 
+            MIME types. If None, a resolver that doesn't sniff file content will be used.
 
         Raises:
             - NotADirectoryError: If @path is not an actual folder path.
         """
 
-        # set logger; suppress logging by default.
-        self.logger = logging.getLogger(__name__)
-        self.logger.addHandler(logging.NullHandler())
-
-        # convenience functions to clean up path notation.
-        self._normalize_sep = lambda p: p.replace(os.sep, os.altsep) if (
-                os.altsep == "/") else p
-        self._normalize_path = lambda p: self._normalize_sep(os.path.normpath(p))  
-        
         # normalize @path and log status.
         path = self._normalize_path(path)
         if root_object is None:
@@ -65,7 +172,12 @@ class DirectoryObject(object):
             self.logger.debug("Initializing DirectoryObject for: {}".format(path))            
 
         # verify @path is a folder.
-        if not os.path.isdir(path):
+        if stat is None:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                pass
+        if stat is None or not S_ISDIR(stat.st_mode):
             msg = "Can't find: {}".format(path)
             self.logger.error(msg)
             raise NotADirectoryError(msg)
@@ -75,31 +187,51 @@ class DirectoryObject(object):
         self.parent_object = parent_object
         self.root_object = self if root_object is None else root_object
         self.depth = depth
+        self.stat = stat
+
+        # set storage containers for lazily calculated values; locate the root object now
+        # in case the current working directory changes.
+        self._name = None
+        self._abspath = None
+        self._created = None
+        self._modified = None
+        if root_object is None:
+            self._abspath = self._normalize_path(os.path.abspath(self.path))
+            self._name = os.path.basename(self._abspath)
 
-        # set path attributes.
-        self.isdir = True
-        self.isfile = False
-        self.abspath = self._normalize_path(os.path.abspath(self.path))
-        self.basename = os.path.basename(self.abspath)
-        if root_object is not None:
-            self.name = self._normalize_path(os.path.relpath(self.path, 
-            start=self.root_object.path))
-        else:
-            self.name = self.basename
+        # set storage container for the number of filtered files or folders.
+        self.skipped = 0
 
-        # set folder metadata.
-        _iso_date = lambda t: datetime.utcfromtimestamp(t).isoformat() + "Z"
-        self.created = _iso_date(os.path.getctime(path))
-        self.modified = _iso_date(os.path.getmtime(path))
+        # set storage container for the root object's metadata prefetcher.
+        self.prefetcher = None
 
-        # add dependency attributes.
-        self._file_object = FileObject
+        # set storage containers for the root object's tree snapshot and shared folders.
+        self._snapshot = None
+        self._folders = OrderedDict() if root_object is None else None
 
-        # create attributes for directory and file objects.
-        self.dirs = lambda: self._get_dirs()
-        self.rdirs = lambda: self._get_dirs(True)
-        self.files = lambda: self._get_files()
-        self.rfiles = lambda: self._get_files(True)
+        # set storage container for the root object's aggregate statistics by folder.
+        self._totals = {} if root_object is None else None
+
+        # set storage container for precomputed checksum values; share the root object's.
+        if root_object is None:
+            self.digests = {}
+            self.checksum_algorithms = tuple(checksum_algorithms)
+            self.checksum_cache = checksum_cache
+            self.checksum_block_size = checksum_block_size
+            self.progress = progress
+            self.scan_workers = scan_workers
+            self.retain_listings = retain_listings
+            self.mime_resolver = (self._mime_resolver() if mime_resolver is None else
+                    mime_resolver)
+        else:
+            self.digests = root_object.digests
+            self.checksum_algorithms = root_object.checksum_algorithms
+            self.checksum_cache = root_object.checksum_cache
+            self.checksum_block_size = root_object.checksum_block_size
+            self.progress = root_object.progress
+            self.scan_workers = root_object.scan_workers
+            self.retain_listings = root_object.retain_listings
+            self.mime_resolver = root_object.mime_resolver
 
     
     @classmethod
@@ -109,78 +241,490 @@ class DirectoryObject(object):
         return cls(*args, **kwargs)
 
 
-    def _get_files(self, recursive=False):
+    @property
+    def name(self):
+        """ The relative path to @self.root_object. """
+
+        if self._name is None:
+            self._name, self._abspath = self.root_object._locate(self.path)
+
+        return self._name
+
+
+    @property
+    def abspath(self):
+        """ The absolute version of @self.path. """
+
+        if self._abspath is None:
+            self._name, self._abspath = self.root_object._locate(self.path)
+
+        return self._abspath
+
+
+    @property
+    def basename(self):
+        """ The plain version of @self.path. """
+
+        return os.path.basename(self.abspath)
+
+
+    @property
+    def created(self):
+        """ The creation date as ISO 8601. """
+
+        if self._created is None:
+            self._created = self._iso_date(self.stat.st_ctime)
+
+        return self._created
+
+
+    @property
+    def modified(self):
+        """ The modified date as ISO 8601. """
+
+        if self._modified is None:
+            self._modified = self._iso_date(self.stat.st_mtime)
+
+        return self._modified
+
+
+    @property
+    def file_count(self):
+        """ The number of files within @self.path, including subfolders. """
+
+        return self._get_totals()[0]
+
+
+    @property
+    def total_size(self):
+        """ The total size in bytes of the files within @self.path, including subfolders.
+        """
+
+        return self._get_totals()[1]
+
+
+    @property
+    def oldest_modified(self):
+        """ The oldest modified date of the files within @self.path, including subfolders,
+        as ISO 8601. """
+
+        mtime = self._get_totals()[2]
+        return None if mtime is None else self._iso_date(mtime)
+
+
+    @property
+    def newest_modified(self):
+        """ The newest modified date of the files within @self.path, including subfolders,
+        as ISO 8601. """
+
+        mtime = self._get_totals()[3]
+        return None if mtime is None else self._iso_date(mtime)
+
+
+    def dirs(self, include=None, exclude=None):
+        """ Returns a generator for all subfolders (non-recursive). See ._get_dirs(). """
+
+        return self._get_dirs(False, include, exclude)
+
+
+    def rdirs(self, include=None, exclude=None):
+        """ Returns a generator for all subfolders (recursive). See ._get_dirs(). """
+
+        return self._get_dirs(True, include, exclude)
+
+
+    def files(self, include=None, exclude=None):
+        """ Returns a generator for all files (non-recursive). See ._get_files(). """
+
+        return self._get_files(False, include, exclude)
+
+
+    def rfiles(self, include=None, exclude=None):
+        """ Returns a generator for all files (recursive). See ._get_files(). """
+
+        return self._get_files(True, include, exclude)
+
+
+    @staticmethod
+    def _compile_filter(patterns):
+        """ A static method that returns a function that takes a relative path and returns
+        True if it matches any of the @patterns.
+
+        Args:
+            - patterns (object): A glob pattern, a list of glob patterns, or a function that
+            takes a relative path and returns a bool. Glob patterns are matched 
+            case-sensitively per fnmatch.fnmatchcase(), i.e. "*" also matches "/".
+
+        Returns:
+            function: The return value.
+            None if @patterns is None or empty.
+        """
+
+        if patterns is None or callable(patterns):
+            return patterns
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        if len(patterns) == 0:
+            return None
+
+        # combine @patterns into one regular expression.
+        regex = re.compile("|".join(fnmatch.translate(p) for p in patterns))
+        matcher = lambda p: regex.match(p) is not None
+
+        return matcher
+
+
+    def _locate(self, path):
+        """ Returns @path relative to @self.path and the absolute version of @path. If 
+        @path is within @self.path, this is done without looking up the current working 
+        directory.
+
+        Args:
+            - path (str): The normalized path of a file or folder.
+
+        Returns:
+            tuple: The return value.
+            The first item is the relative path and the second is the absolute path.
+        """
+
+        # determine if @path is within @self.path.
+        if path == self.path:
+            relpath = "."
+        elif self.path == ".":
+            is_within = not os.path.isabs(path) and path != ".." and not path.startswith(
+                    self._normalize_sep(os.path.join("..", "")))
+            relpath = path if is_within else None
+        else:
+            prefix = self._normalize_sep(os.path.join(self.path, ""))
+            relpath = path[len(prefix):] if path.startswith(prefix) else None
+
+        # if needed, fall back to using the current working directory.
+        if relpath is None:
+            relpath = self._normalize_path(os.path.relpath(path, start=self.path))
+            abspath = self._normalize_path(os.path.abspath(path))
+        else:
+            abspath = self._normalize_path(os.path.join(self.abspath, relpath))
+
+        return (relpath, abspath)
+
+
+    def _get_snapshot(self):
+        """ Returns the TreeSnapshot of @self.root_object, creating it on first use.
+
+        Returns:
+            TreeSnapshot: The return value.
+        """
+
+        root = self.root_object
+        if root._snapshot is None:
+            root._snapshot = self._tree_snapshot(root.path, root.scan_workers, 
+                    root.retain_listings)
+
+        return root._snapshot
+
+
+    def _get_folder(self, path, stat=None):
+        """ Returns the shared DirectoryObject for @path. Its @parent_object is the shared
+        DirectoryObject for the parent folder or None if @path is @self.root_object.path or 
+        is outside of it.
+
+        Args:
+            - path (str): The normalized folder path.
+            - stat (os.stat_result): The status of @path, if already known.
+
+        Returns:
+            DirectoryObject: The return value.
+        """
+
+        root = self.root_object
+        folders = root._folders
+
+        # if possible, return the existing object.
+        if path in folders:
+            folders.move_to_end(path)
+            return folders[path]
+
+        # get the object for the parent folder.
+        relpath = root._locate(path)[0]
+        if relpath == "." or relpath == ".." or relpath.startswith(self._normalize_sep(
+                os.path.join("..", ""))):
+            parent_obj = None
+        else:
+            parent_obj = self._get_folder(self._normalize_path(os.path.dirname(path)))
+        depth = 0 if parent_obj is None else parent_obj.depth + 1
+
+        # create and store the object; discard the least recently used one if needed.
+        folder_obj = self._this(path=path, parent_object=parent_obj, root_object=root, 
+                depth=depth, stat=stat)
+        folders[path] = folder_obj
+        if len(folders) > root._folder_cache_size:
+            folders.popitem(last=False)
+
+        return folder_obj
+
+
+    def _get_totals(self):
+        """ Returns the aggregate statistics for @self.path. If needed, they're calculated
+        bottom-up for @self.path and each of its subfolders in one traversal and kept by 
+        @self.root_object.
+
+        Returns:
+            tuple: The return value.
+            The file count, the total size in bytes, and the oldest and newest modification
+            times as timestamps. The times are None if there are no files.
+        """
+
+        totals = self.root_object._totals
+
+        # if possible, return the existing statistics.
+        if self.path in totals:
+            return totals[self.path]
+
+        self.logger.info("Calculating folder statistics for: {}".format(self.path))
+
+        # get the statistics for the files directly within each folder.
+        folders = []
+        snapshot = self._get_snapshot()
+        for dirpath, dir_stat, dirs, files in snapshot.walk(self.path, self.stat):
+            stats = [stat for filename, stat in files if stat is not None]
+            mtimes = [stat.st_mtime for stat in stats]
+            folders.append((dirpath, [len(files), sum(stat.st_size for stat in stats), 
+                min(mtimes) if len(mtimes) != 0 else None, 
+                max(mtimes) if len(mtimes) != 0 else None]))
+
+        # add each folder's statistics to its parent's, starting with the deepest folders.
+        pending = dict(folders)
+        for dirpath, stats in reversed(folders):
+            totals[dirpath] = tuple(stats)
+            if dirpath == self.path:
+                continue
+            parent_stats = pending[self._normalize_path(os.path.dirname(dirpath))]
+            parent_stats[0] += stats[0]
+            parent_stats[1] += stats[1]
+            for i, func in [(2, min), (3, max)]:
+                mtimes = [t for t in (parent_stats[i], stats[i]) if t is not None]
+                parent_stats[i] = func(mtimes) if len(mtimes) != 0 else None
+
+        return totals[self.path]
+
+
+    def refresh(self):
+        """ Discards the snapshot listing of @self.path so that files or folders added or
+        removed since will be found by the next traversal. Subfolders aren't affected, but
+        all aggregate statistics, e.g. @file_count, are discarded.
+
+        Returns:
+            None
+        """
+
+        self.logger.info("Refreshing listing of: {}".format(self.path))
+        
+        if self.root_object._snapshot is not None:
+            self.root_object._snapshot.refresh(self.path)
+        self.root_object._folders.pop(self.path, None)
+        self.root_object._totals.clear()
+
+        return
+
+
+    def save_index(self, index_file):
+        """ Saves the folder listings of @self.root_object's tree snapshot to @index_file so
+        that a later run can use .load_index(). See TreeSnapshot.save().
+
+        Args:
+            - index_file (str): The path to the SQLite index.
+
+        Returns:
+            int: The return value.
+            The number of saved folders.
+        """
+
+        return self._get_snapshot().save(index_file)
+
+
+    def load_index(self, index_file):
+        """ Loads folder listings saved by .save_index() into @self.root_object's tree 
+        snapshot so that folders whose modification times haven't changed aren't listed 
+        again. Use this before any traversal. See TreeSnapshot.load(). 
+        
+        Files altered in place don't change their folder's modification time, so the loaded
+        status of a file can be out of date. If @self.root_object.checksum_cache is set, 
+        each traversed file in a loaded folder is therefore stat'ed again so that the cache
+        isn't queried with out of date keys and the file's size and dates are current.
+
+        Args:
+            - index_file (str): The path to the SQLite index.
+
+        Returns:
+            int: The return value.
+            The number of loaded folders.
+        """
+
+        return self._get_snapshot().load(index_file)
+
+
+    def _get_filters(self, include, exclude):
+        """ Returns functions with which to filter a traversal. See ._compile_filter().
+
+        Args:
+            - include (object): Optional glob pattern(s) or function. Only files or folders
+            whose relative paths match are yielded.
+            - exclude (object): Optional glob pattern(s) or function. Files or folders whose
+            relative paths match are skipped. Matching folders aren't listed.
+
+        Returns:
+            tuple: The return value.
+            The first item is a function that takes a relative path and returns True if it
+            should be skipped or None if there are no filters. The second item is a function
+            that takes a folder path and returns True if the folder should be pruned or None
+            if there's no @exclude filter. See TreeSnapshot.walk().
+        """
+
+        is_included = self._compile_filter(include)
+        is_excluded = self._compile_filter(exclude)
+
+        # set the function that identifies skipped files or folders.
+        if is_included is None and is_excluded is None:
+            is_skipped = None
+        else:
+            is_skipped = lambda p: (is_excluded is not None and is_excluded(p)) or (
+                    is_included is not None and not is_included(p))
+
+        # set the function that identifies folders to prune.
+        if is_excluded is None:
+            is_pruned = None
+        else:
+            is_pruned = lambda p: is_excluded(self.root_object._locate(p)[0])
+
+        return (is_skipped, is_pruned)
+
+
+    def _get_files(self, recursive=False, include=None, exclude=None):
         """ Yields a FileObject for every file in @self.path.
 
         Args:
             - recursive (bool): Use True to include FileObjects in subfolders. Use False to 
             omit subfolders.
+            - include (object): Optional glob pattern(s) or function. Only files whose 
+            relative paths match are yielded. See ._compile_filter().
+            - exclude (object): Optional glob pattern(s) or function. Files and folders 
+            whose relative paths match are skipped. Files within skipped folders are counted
+            but not listed.
 
         Returns:
             generator: The return value.
         """
 
         self.logger.info("Creating FileObject(s) in: {}".format(self.path))
+
+        # get filters.
+        is_skipped, is_pruned = self._get_filters(include, exclude)
   
         # iterate through folders and yield FileObject(s).
         def gen_files():
 
-            # track file positions.
+            # track file positions and skipped files.
             file_pos = 0
+            self.skipped = 0
             
-            for dirpath, dirnames, filenames in os.walk(self.path):
-
-                for filename in filenames:
-
-                    # if @recursive is False, don't go into subfolders.
-                    if not recursive and self._normalize_path(dirpath) != self.path:
-                        break
+            # if @recursive is False, only list @self.path.
+            snapshot = self._get_snapshot()
+            for dirpath, dir_stat, dirs, files in snapshot.walk(self.path, self.stat, 
+                    recursive, is_pruned):
+
+                # count files in pruned folders; keep file positions unaffected by filters.
+                if files is None:
+                    skipped = snapshot.count(dirpath)[1]
+                    self.skipped += skipped
+                    file_pos += skipped
+                    continue
+
+                # get the shared DirectoryObject for the parent folder of @files.
+                if len(files) != 0:
+                    parent_obj = self._get_folder(dirpath, dir_stat)
+                    if is_skipped is not None:
+                        reldir = self.root_object._locate(dirpath)[0]
+
+                # if @files came from an index, their status can be out of date; since the
+                # checksum cache is keyed on it, have each FileObject stat its file again.
+                is_restated = (self.root_object.checksum_cache is not None and 
+                        snapshot.is_loaded(dirpath))
+
+                for filename, stat in files:
+
+                    # if needed, skip the file.
+                    if is_skipped is not None and is_skipped(self._normalize_path(
+                            os.path.join(reldir, filename))):
+                        self.skipped += 1
+                        file_pos += 1
+                        continue
                     
                     # get file path.
                     filepath = os.path.join(dirpath, filename)
                     filepath = self._normalize_path(filepath)
-
-                    # build DirectoryObject for parent folder of @filepath.
-                    parent_obj = self._this(path=os.path.dirname(filepath), 
-                            parent_object=dirpath, root_object=self.root_object)
                     
                     # build FileObject for @filepath.
                     file_obj = self._file_object(path=filepath, 
                             parent_object=parent_obj, root_object=self.root_object, 
-                            index=file_pos)
+                            index=file_pos, stat=None if is_restated else stat)
 
                     yield file_obj
                     file_pos += 1
 
-        return gen_files()
+        # if needed, resolve the metadata of FileObjects ahead of their use.
+        file_objects = gen_files()
+        if self.root_object.prefetcher is not None:
+            file_objects = self.root_object.prefetcher.prefetch(file_objects)
+
+        return file_objects
 
     
-    def _get_dirs(self, recursive=False):
+    def _get_dirs(self, recursive=False, include=None, exclude=None):
         """ Yields a DirectoryObject for every folder in @self.path.
 
         Args:
             - recursive (bool): Use True to include DirectoryObjects in subfolders. Use False
             to omit subfolders.
+            - include (object): Optional glob pattern(s) or function. Only folders whose 
+            relative paths match are yielded, though non-matching folders are still 
+            descended into. See ._compile_filter().
+            - exclude (object): Optional glob pattern(s) or function. Folders whose relative
+            paths match are skipped along with the folders within them, which are counted
+            but not listed.
 
         Returns:
             generator: The return value.
         """
 
         self.logger.info("Creating DirectoryObject(s) in: {}".format(self.path))
+
+        # get filters.
+        is_skipped, is_pruned = self._get_filters(include, exclude)
   
         # iterate through folders and yield DirectoryObject(s).
         def gen_dirs():
+
+            # track skipped folders.
+            self.skipped = 0
   
-            for dirpath, dirnames, filenames in os.walk(self.path):
+            # if @recursive is False, only list @self.path.
+            snapshot = self._get_snapshot()
+            for dirpath, dir_stat, dirs, files in snapshot.walk(self.path, self.stat,
+                    recursive, is_pruned):
+
+                # count folders within pruned folders; the pruned ones are counted below.
+                if dirs is None:
+                    self.skipped += snapshot.count(dirpath)[0]
+                    continue
                 
                 # sort folders per: https://stackoverflow.com/a/6670926.
-                dirnames.sort()
-                
-                for dirname in dirnames:
+                dirs.sort(key=lambda d: d[0])
 
-                    # if @recursive is False, don't go into subfolders.
-                    if not recursive and self._normalize_path(dirpath) != self.path:
-                        break
+                # get the shared DirectoryObject for the parent folder of @dirs.
+                if len(dirs) != 0:
+                    parent_obj = self._get_folder(dirpath, dir_stat)
+                
+                for dirname, stat, is_link in dirs:
                     
                     # get folder path.
                     folder = os.path.join(dirpath, dirname)
@@ -189,45 +733,130 @@ class DirectoryObject(object):
                     # if @folder is @self.path, skip it.
                     if folder == self.path:
                         continue
- 
-                    # build DirectoryObject for parent folder of @folder.
-                    parent_obj = self._this(path=os.path.dirname(folder), 
-                            parent_object=dirpath, root_object=self.root_object, 
-                            depth = self.depth - 1)
+
+                    # if needed, skip the folder.
+                    if is_skipped is not None and is_skipped(self.root_object._locate(
+                            folder)[0]):
+                        self.skipped += 1
+                        continue
                     
                     # build DirectoryObject for @folder.
                     dir_obj = self._this(path=folder, parent_object=parent_obj, 
-                            root_object=self.root_object, depth = self.depth + 1)
+                            root_object=self.root_object, depth = self.depth + 1, 
+                            stat=stat)
 
                     yield dir_obj
 
         return gen_dirs()
     
 
-    def graph(self):
-        """ Creates a visual tree representation of @self.path.
+    def graph(self, as_json=False):
+        """ Creates a visual tree representation of @self.path in a single traversal. Each 
+        folder is followed by its files, its symbolic links to folders (which aren't 
+        descended into), and then its subfolders in alphabetical order.
+
+        Args:
+            - as_json (bool): Use True to create a JSON tree instead of text lines. Each 
+            folder is an object with "name", "files", "links", and "dirs" keys; "dirs" is a
+            list of folder objects.
             
         Returns:
             generator: The return value.
-            Each item is a line in the graph.
+            Each item is a line in the graph or, if @as_json is True, a chunk of JSON text
+            for one folder, its contents, and any folders closed before it.
         """
         
         self.logger.info("Creating graph of: {}".format(self.path))
 
-        # iterate through files and folders to create graph lines.
-        def grapher(path=self):
+        # iterate through folders to create graph lines or JSON chunks.
+        def grapher():
+
+            # track the depth of folders to come and the child counts of open JSON folders.
+            depths = {self.path: self.depth}
+            open_dirs = []
+
+            snapshot = self._get_snapshot()
+            for dirpath, dir_stat, dirs, files in snapshot.walk(self.path, self.stat):
+
+                # sort folders so the walk descends into them alphabetically.
+                dirs.sort(key=lambda d: d[0])
+                depth = depths.pop(dirpath)
+                basename = self.basename if dirpath == self.path else os.path.basename(
+                        dirpath)
+                links = [d[0] for d in dirs if d[2]]
+                for dirname, stat, is_link in dirs:
+                    if not is_link:
+                        depths[self._normalize_path(os.path.join(dirpath, dirname))] = (
+                                depth + 1)
+
+                if not as_json:
+                    yield ("|  " * depth) + basename + "/"
+                    for filename, stat in files:
+                        yield ("|  " * depth) + "|  " + filename
+                    for link in links:
+                        yield ("|  " * depth) + "|  " + link + "@"
+                    continue
+
+                # close finished folders; separate this folder from previous siblings.
+                chunk = ""
+                while len(open_dirs) > depth - self.depth:
+                    chunk += "]}"
+                    open_dirs.pop()
+                if len(open_dirs) != 0:
+                    chunk += ", " if open_dirs[-1] != 0 else ""
+                    open_dirs[-1] += 1
+                
+                # open this folder.
+                chunk += '{{"name": {}, "files": {}, "links": {}, "dirs": ['.format(
+                        json.dumps(basename), json.dumps([f[0] for f in files]), 
+                        json.dumps(links))
+                open_dirs.append(0)
+                yield chunk
 
-            line = ("|  " * path.depth) + path.basename + "/"
-            yield line
-            for fil in path.files():
-                line = ("|  " * path.depth) + "|  " + fil.basename
-                yield line
-            for folder in path.dirs():
-                for line in grapher(folder):
-                    yield line
+            # close the remaining folders.
+            if as_json:
+                yield "]}" * len(open_dirs)
 
         return grapher()
 
 
+    def write_graph(self, graph_file=None, as_json=False, charset="utf-8"):
+        """ Writes .graph() to @graph_file or to stdout as it's created, so that the graph of
+        a large folder isn't held in memory.
+
+        Args:
+            - graph_file (str): The file path to write to. If None, the graph is written to
+            stdout.
+            - as_json (bool): Use True to write a JSON tree instead of text lines.
+            - charset (str): The encoding for @graph_file.
+
+        Returns:
+            None
+        """
+
+        self.logger.info("Writing graph of '{}' to: {}".format(self.path, 
+            "stdout" if graph_file is None else graph_file))
+
+        # set the output.
+        if graph_file is None:
+            output = sys.stdout
+        else:
+            output = open(graph_file, "w", encoding=charset)
+
+        # write graph lines or JSON chunks.
+        try:
+            for item in self.graph(as_json):
+                output.write(item if as_json else item + "\n")
+            if as_json:
+                output.write("\n")
+        finally:
+            if graph_file is None:
+                output.flush()
+            else:
+                output.close()
+
+        return
+
+
 if __name__ == "__main__":
     pass
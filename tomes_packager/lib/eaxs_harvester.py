@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+
+""" This module contains a class for harvesting the attachment checksum values recorded in
+EAXS files and for verifying attachments against them. """
+
+# import modules.
+import glob
+import logging
+import logging.config
+import os
+from lxml import etree
+from .checksum_maker import ChecksumMaker
+
+
+class EAXSHarvester():
+    """ A class for harvesting the attachment checksum values recorded in EAXS files and for
+    verifying attachments against them.
+
+    Each EAXS file in the "xml" subfolder of @eaxs_dir is streamed once, so memory use doesn't
+    grow with the size of the EAXS. Each <ExtBodyContent> element's <RelPath> and <Hash> are
+    collected into @digests.
+
+    Attributes:
+        - digests (dict): The harvested checksum values. Each key is an attachment's absolute
+        path and each value is a dict whose key is the algorithm and whose value is the
+        checksum value. This has the same form as DirectoryObject.digests.
+        - results (dict): The number of verified attachments with keys: "passed",
+        "missing", "changed", and "unreadable".
+        - failures (dict): Each key is the absolute path of an attachment that didn't pass
+        verification and each value is its status, e.g. "changed".
+
+    Example:
+        >>> harvester = EAXSHarvester("../../tests/sample_files/foo/eaxs", workers=4)
+        >>> harvester.harvest() # {"/.../foo/eaxs/attachments/1.xml": {"SHA-256": "..."}}
+        >>> harvester.verify() # True if all attachments match their recorded values.
+        >>> harvester.results # {"passed": 2, "missing": 0, "changed": 0, ...}
+    """
+
+
+    def __init__(self, eaxs_dir, workers=1, use_processes=False, block_size=None):
+        """ Sets instance attributes.
+
+        Args:
+            - eaxs_dir (str): The path to the AIP's "eaxs" folder. <RelPath> values are
+            relative to it.
+            - workers (int): The number of worker threads or processes with which to verify
+            attachments.
+            - use_processes (bool): Use True to verify attachments with worker processes
+            instead of worker threads.
+            - block_size (int): The chunk size with which to read attachments. See
+            FileObject._hash_file().
+
+        Raises:
+            - NotADirectoryError: If @eaxs_dir is not an actual folder path.
+        """
+
+        # set logger; suppress logging by default.
+        self.logger = logging.getLogger(__name__)
+        self.logger.addHandler(logging.NullHandler())
+
+        # verify @eaxs_dir is a folder.
+        if not os.path.isdir(eaxs_dir):
+            msg = "Can't find: {}".format(eaxs_dir)
+            self.logger.error(msg)
+            raise NotADirectoryError(msg)
+
+        # set attributes.
+        self.eaxs_dir = os.path.abspath(eaxs_dir)
+        self.xml_dir = os.path.join(self.eaxs_dir, "xml")
+        self.digests = {}
+        self.results = {"passed": 0, "missing": 0, "changed": 0, "unreadable": 0}
+        self.failures = {}
+
+        # map EAXS hash functions to supported checksum algorithms.
+        self._algorithm_map = {"MD5": "MD5", "SHA1": "SHA-1", "SHA256": "SHA-256",
+                "SHA384": "SHA-384", "SHA512": "SHA-512"}
+
+        # add dependency attributes.
+        self._checksum_maker = ChecksumMaker(workers, use_processes, block_size=block_size)
+
+
+    def _get_entries(self, xml_file):
+        """ Yields a tuple for each <ExtBodyContent> element in @xml_file. The items are the
+        relative path, the hash function, and the checksum value. Each <Message> element is
+        discarded as soon as it's read. If @xml_file can't be parsed, iteration stops at the
+        point of failure.
+
+        Args:
+            - xml_file (str): The path to the EAXS file.
+
+        Returns:
+            generator: The return value.
+        """
+
+        self.logger.info("Streaming EAXS file: {}".format(xml_file))
+
+        # iterate through <ExtBodyContent> and <Message> elements in any namespace.
+        elements = etree.iterparse(xml_file, events=("end",), tag=("{*}ExtBodyContent",
+            "{*}Message"))
+        try:
+            for event, element in elements:
+
+                # get attachment metadata.
+                if etree.QName(element).localname == "ExtBodyContent":
+                    yield (element.findtext("{*}RelPath"),
+                            element.findtext("{*}Hash/{*}Function"),
+                            element.findtext("{*}Hash/{*}Value"))
+                    continue
+
+                # free memory used by this and previous messages.
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+        except etree.XMLSyntaxError as err:
+            self.logger.warning("Can't parse EAXS file: {}".format(xml_file))
+            self.logger.error(err)
+
+
+    def harvest(self):
+        """ Collects the checksum values recorded in each EAXS file into @self.digests.
+        Entries with missing values or with unsupported hash functions are skipped, as are
+        any remaining entries in an EAXS file that can't be parsed.
+
+        Returns:
+            dict: The return value.
+            The harvested checksum values, i.e. @self.digests.
+        """
+
+        xml_files = sorted(glob.glob(os.path.join(self.xml_dir, "*.xml")))
+        self.logger.info("Harvesting attachment checksum values from {} EAXS "
+                "file(s).".format(len(xml_files)))
+
+        # collect values from each EAXS file.
+        skipped = 0
+        for xml_file in xml_files:
+            for rel_path, function, checksum in self._get_entries(xml_file):
+
+                # skip entries that can't be used.
+                algorithm = self._algorithm_map.get((function or "").upper().replace("-",
+                    ""))
+                if None in (rel_path, checksum) or algorithm is None:
+                    self.logger.debug("Skipping attachment entry: {}".format(rel_path))
+                    skipped += 1
+                    continue
+
+                # add the value; warn if it conflicts with another EAXS file.
+                path = os.path.abspath(os.path.join(self.eaxs_dir, rel_path.strip()))
+                checksums = self.digests.setdefault(path, {})
+                checksum = checksum.strip().lower()
+                if checksums.get(algorithm, checksum) != checksum:
+                    self.logger.warning("Conflicting {} values for: {}".format(algorithm,
+                        path))
+                    continue
+                checksums[algorithm] = checksum
+
+        self.logger.info("Harvested checksum values for {} attachment(s); skipped {} "
+                "entries.".format(len(self.digests), skipped))
+        return self.digests
+
+
+    def verify(self):
+        """ Verifies each attachment in @self.digests against its harvested checksum values
+        and tallies the outcomes in @self.results. Attachments that don't pass are added to
+        @self.failures.
+
+        Returns:
+            bool: The return value.
+            True if all attachments passed. Otherwise, False.
+        """
+
+        self.logger.info("Verifying {} attachment(s) in: {}".format(len(self.digests),
+            self.eaxs_dir))
+
+        # reset results from any previous verification.
+        self.results = dict.fromkeys(self.results, 0)
+        self.failures = {}
+
+        # calculate checksum values.
+        tasks = ((path, list(checksums)) for path, checksums in self.digests.items())
+        for path, checksums in self._checksum_maker.get_checksums(tasks):
+
+            # determine the outcome.
+            if checksums is None:
+                status = "unreadable" if os.path.isfile(path) else "missing"
+            elif checksums != self.digests[path]:
+                status = "changed"
+            else:
+                status = "passed"
+
+            if status != "passed":
+                self.logger.warning("Attachment is {}: {}".format(status, path))
+                self.failures[path] = status
+            self.results[status] += 1
+
+        is_verified = self.results["passed"] == len(self.digests)
+        self.logger.info("Attachment verification results: {}".format(self.results))
+        return is_verified
+
+
+if __name__ == "__main__":
+    pass
@@ -6,9 +6,11 @@
 import hashlib
 import logging
 import logging.config
-import mimetypes
 import os
+import queue
+import threading
 from datetime import datetime
+from stat import S_ISREG
 
 
 class FileObject(object):
@@ -23,12 +25,31 @@ class FileObject(object):
         - created (str): The creation date as ISO 8601.
         - modified (str): The modified date as ISO 8601.
         - size (int): The size in bytes.
+        - stat (os.stat_result): The status of @self.path when the object was created.
         - mimetype (function): Returns the mimetype.
         - checksum (function): Returns the checksum value (default: SHA-256).
+        - checksums (function): Returns a dict of checksum values for one or more algorithms
+        calculated with a single read of the file.
+
+    Instances are slotted and the path and date attributes are only calculated when first
+    accessed, so that large folder trees can be represented with little memory. Once
+    calculated, the values are kept for the life of the instance.
     """
 
+    # set attributes; avoid per-instance dictionaries.
+    __slots__ = ("path", "parent_object", "root_object", "index", "stat", "_name", 
+            "_abspath", "_created", "_modified", "_mimetype", "_checksums")
+
+    # set logger; suppress logging by default.
+    logger = logging.getLogger(__name__)
+    logger.addHandler(logging.NullHandler())
+
+    # set path attributes.
+    isfile = True
+    isdir = False
+
 
-    def __init__(self, path, parent_object, root_object, index):
+    def __init__(self, path, parent_object, root_object, index, stat=None):
         """ Sets instance attributes.
         
         Args:
@@ -39,27 +60,25 @@ class FileObject(object):
             file resides.
             - index (int): The unique position identifier for the @path file within the 
             context of the @root_object.
+            - stat (os.stat_result): The status of @path, if already known. If None, @path 
+            will be stat'ed.
 
         Raises:
             - FileNotFoundError: If @path is not an actual file path.
             - ValueError: If @checksum_algorithm is not supported.
         """
- 
-        # set logger; suppress logging by default.
-        self.logger = logging.getLogger(__name__)
-        self.logger.addHandler(logging.NullHandler())
-
-        # convenience functions to clean up path notation.
-        self._normalize_sep = lambda p: p.replace(os.sep, os.altsep) if (
-                os.altsep == "/") else p
-        self._normalize_path = lambda p: self._normalize_sep(os.path.normpath(p))  
 
         # normalize @path and log status.
         path = self._normalize_path(path)
         self.logger.info("Initializing FileObject for: {}".format(path))        
         
         # verify @path is a file.
-        if not os.path.isfile(path):
+        if stat is None:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                pass
+        if stat is None or not S_ISREG(stat.st_mode):
             msg = "Can't find: {}".format(path)
             self.logger.error(msg)
             raise FileNotFoundError(msg)
@@ -69,111 +88,396 @@ class FileObject(object):
         self.parent_object = parent_object
         self.root_object = root_object
         self.index = index
-    
-        # set path attributes.
-        self.isfile = True
-        self.isdir = False
-        self.name = self._normalize_path(os.path.relpath(self.path, 
-            start=self.root_object.path))
-        self.basename = os.path.basename(self.path)
-        self.abspath = self._normalize_path(os.path.abspath(self.path))
-
-        # set file metadata.
-        _iso_date = lambda t: datetime.utcfromtimestamp(t).isoformat() + "Z"
-        self.created = _iso_date(os.path.getctime(path))
-        self.modified = _iso_date(os.path.getmtime(path))
-        self.size = os.path.getsize(self.path)
-        self.mimetype = self._get_mimetype
-        self.checksum = self._get_checksum
+        self.stat = stat
+
+        # set storage containers for lazily calculated values.
+        self._name = None
+        self._abspath = None
+        self._created = None
+        self._modified = None
+        self._mimetype = None
+        self._checksums = {}
+
+
+    @staticmethod
+    def _normalize_sep(path):
+        """ A static method that returns @path with forward slashes on Windows. """
+
+        return path.replace(os.sep, os.altsep) if (os.altsep == "/") else path
+
+
+    @staticmethod
+    def _normalize_path(path):
+        """ A static method that returns the normalized version of @path. """
+
+        return FileObject._normalize_sep(os.path.normpath(path))
+
+
+    @staticmethod
+    def _iso_date(timestamp):
+        """ A static method that returns @timestamp as ISO 8601. """
+
+        return datetime.utcfromtimestamp(timestamp).isoformat() + "Z"
+
+
+    @property
+    def name(self):
+        """ The relative path to @self.root_object's path. """
+
+        if self._name is None:
+            self._name, self._abspath = self.root_object._locate(self.path)
+
+        return self._name
+
+
+    @property
+    def abspath(self):
+        """ The absolute version of @self.path. """
+
+        if self._abspath is None:
+            self._name, self._abspath = self.root_object._locate(self.path)
+
+        return self._abspath
+
+
+    @property
+    def basename(self):
+        """ The plain version of @self.path. """
+
+        return os.path.basename(self.path)
+
+
+    @property
+    def created(self):
+        """ The creation date as ISO 8601. """
+
+        if self._created is None:
+            self._created = self._iso_date(self.stat.st_ctime)
+
+        return self._created
+
+
+    @property
+    def modified(self):
+        """ The modified date as ISO 8601. """
+
+        if self._modified is None:
+            self._modified = self._iso_date(self.stat.st_mtime)
+
+        return self._modified
+
+
+    @property
+    def size(self):
+        """ The size in bytes. """
+
+        return self.stat.st_size
     
 
     def _get_mimetype(self):
-        """ Returns the MIME type for @self.path.
+        """ Returns the MIME type for @self.path via the MimeResolver shared by
+        @self.root_object. Types are cached per extension and fall back to 
+        "application/octet-stream". See .mime_resolver.MimeResolver. Once determined, the
+        type is kept for the life of the instance.
         
         Returns:
             str: The return value.
         """
         
-        self.logger.info("Guessing MIME type for: {}".format(self.abspath))
-       
-        # get mimetype.
-        mimetype = mimetypes.guess_type(self.abspath)
+        # if needed, get mimetype.
+        if self._mimetype is None:
+            self._mimetype = self.root_object.mime_resolver.get(self.abspath)
         
-        # if no type was detected, fallback to a default.
-        if mimetype is None:
-            mimetype = "application/octet-stream"
-        else:
-            mimetype = mimetype[0]
+        return self._mimetype
 
-        self.logger.info("MIME type: {}".format(mimetype))
-        return mimetype
 
-
-    def _get_checksum(self, checksum_algorithm="SHA-256", block_size=4096):
-        """ Returns the checksum value for @self.path using @checksum_algorithm.
+    @staticmethod
+    def _get_hashers(checksum_algorithms):
+        """ A static method that returns a new hashlib object for each algorithm in 
+        @checksum_algorithms.
 
         Args:
-            - checksum_algorithm (str): The SHA algorithm with which to calculate the checksum
-            value. Use only SHA-1, SHA-256, SHA-384, or SHA-512.
-            - block_size (int): The chunk size with which to iteratively read @self.abspath
-            while calculating the checksum. If None, twenty times the block size of the chosen
-            SHA algorithm will be used. For example, SHA-256 has a block size of 64, therefore
-            the block size would be 1280 (20 * 64).
-        
+            - checksum_algorithms (tuple): The algorithms for which to create hashlib objects.
+            Use only MD5, SHA-1, SHA-256, SHA-384, SHA-512, BLAKE2b, or BLAKE2s.
+
         Returns:
-            str: The return value.
+            dict: The return value.
+            Each key is an algorithm and each value is the corresponding hashlib object.
+
+        Raises:
+            - ValueError: If @checksum_algorithms is empty or contains an unsupported 
+            algorithm.
         """
-        
-        self.logger.info("Calculating {} checksum value for: {}".format(
-            checksum_algorithm, self.abspath)) 
+
+        # get logger; don't add a handler per call as handlers accumulate on the logger.
+        logger = logging.getLogger(__name__)
 
         # set checksum function map.
-        checksum_map = {"SHA-1": hashlib.sha1(), "SHA-256": hashlib.sha256(), 
-                "SHA-384": hashlib.sha384(), "SHA-512": hashlib.sha512()}
+        checksum_map = {"MD5": hashlib.md5, "SHA-1": hashlib.sha1, 
+                "SHA-256": hashlib.sha256, "SHA-384": hashlib.sha384, 
+                "SHA-512": hashlib.sha512, "BLAKE2b": hashlib.blake2b, 
+                "BLAKE2s": hashlib.blake2s}
         
-        # verify that @checksum_algorithm is legal.
-        if checksum_algorithm not in checksum_map:
-            self.logger.warning("Algorithm '{}' is not supported; must be one of: {}".format(
-                checksum_algorithm, list(checksum_map)))
-            msg = "Unsupported checksum algorithm: {}".format(checksum_algorithm)
-            self.logger.err(msg)
+        # verify that @checksum_algorithms are legal.
+        unsupported = [alg for alg in checksum_algorithms if alg not in checksum_map]
+        if len(unsupported) != 0 or len(checksum_algorithms) == 0:
+            logger.warning("Algorithms {} are not supported; must be one of: {}".format(
+                unsupported, list(checksum_map)))
+            msg = "Unsupported checksum algorithm(s): {}".format(unsupported)
+            logger.error(msg)
             raise ValueError(msg)
 
-        # establish hashlib function and block size to use.
-        sha = checksum_map[checksum_algorithm]
+        # establish hashlib functions.
+        hashers = dict((alg, checksum_map[alg]()) for alg in checksum_algorithms)
+        return hashers
+
+
+    @staticmethod
+    def _read_chunks(data, block_size, read_ahead=False):
+        """ A static method that yields chunks of the open binary file @data. Each chunk is a
+        memoryview that is only valid until the next chunk is requested, so it must be used
+        (not kept) by the caller.
+
+        Args:
+            - data (io.RawIOBase): The open, unbuffered file to read.
+            - block_size (int): The maximum size in bytes of each chunk.
+            - read_ahead (bool): Use True to read the next chunk in a separate thread while
+            the caller uses the current one. Two buffers take turns being filled and used.
+            Use False to read each chunk only when it's requested, using a single buffer.
+
+        Returns:
+            generator: The return value.
+        """
+
+        # if not reading ahead, fill and yield the same buffer each time.
+        if not read_ahead:
+            buffer = bytearray(block_size)
+            view = memoryview(buffer)
+            while True:
+                length = data.readinto(buffer)
+                if not length:
+                    return
+                chunk = view[:length]
+                yield chunk
+                chunk.release()
+
+        # create queues for empty buffers and filled ones.
+        empty_buffers, filled_buffers = queue.Queue(), queue.Queue()
+        for i in range(2):
+            empty_buffers.put(bytearray(block_size))
+        is_stopped = threading.Event()
+
+        # fill empty buffers until the end of the file; pass errors along to the caller.
+        def read_ahead():
+            try:
+                while not is_stopped.is_set():
+                    buffer = empty_buffers.get()
+                    if buffer is None:
+                        return
+                    length = data.readinto(buffer)
+                    filled_buffers.put((buffer, length, None))
+                    if not length:
+                        return
+            except Exception as err:
+                filled_buffers.put((None, 0, err))
+
+        reader = threading.Thread(target=read_ahead, daemon=True)
+        reader.start()
+
+        # yield each filled buffer and then return it to be refilled.
+        try:
+            while True:
+                buffer, length, err = filled_buffers.get()
+                if err is not None:
+                    raise err
+                if not length:
+                    return
+                chunk = memoryview(buffer)[:length]
+                yield chunk
+                chunk.release()
+                empty_buffers.put(buffer)
+
+        # stop the reader even if the caller stopped early; the file may be closed next.
+        finally:
+            is_stopped.set()
+            empty_buffers.put(None)
+            reader.join()
+
+
+    @staticmethod
+    def _hash_file(path, checksum_algorithms=("SHA-256",), block_size=None, 
+            read_ahead_threshold=67108864):
+        """ A static method that returns checksum values for @path using each algorithm in
+        @checksum_algorithms. The file is read only once regardless of the number of 
+        algorithms. Being static, this can be dispatched to worker threads or processes.
+
+        Args:
+            - path (str): The file path for which to calculate checksum values.
+            - checksum_algorithms (tuple): The algorithms with which to calculate checksum 
+            values. See ._get_hashers() for supported algorithms.
+            - block_size (int): The chunk size with which to iteratively read @path while
+            calculating the checksums. If None, the chunk size adapts to the file size: small
+            files are read in a single chunk and larger files are read in 1 megabyte chunks.
+            Either way, the same buffer is reused for every chunk.
+            - read_ahead_threshold (int): The file size in bytes above which the next chunk
+            is read in a separate thread while the current one is hashed. Use None to never
+            read ahead. See ._read_chunks().
+
+        Returns:
+            dict: The return value.
+            Each key is an algorithm and each value is the corresponding checksum value.
+
+        Raises:
+            - ValueError: If @checksum_algorithms is empty or contains an unsupported 
+            algorithm.
+        """
+
+        # get logger; don't add a handler per call as handlers accumulate on the logger.
+        logger = logging.getLogger(__name__)
+
+        # establish hashlib functions.
+        hashers = FileObject._get_hashers(checksum_algorithms)
+
+        # get checksums per "https://stackoverflow.com/a/1131255", but read into a reusable
+        # buffer instead of creating a new bytes object per chunk.
+        with open(path, "rb", buffering=0) as data:
+
+            # establish block size to use; small files need only one read plus one more to
+            # reach the end of the file.
+            size = os.fstat(data.fileno()).st_size
+            if block_size is None:
+                block_size = min(max(size + 1, 4096), 1048576)
+
+            # for large files, overlap reading with hashing.
+            read_ahead = read_ahead_threshold is not None and size > read_ahead_threshold
+            if read_ahead:
+                logger.debug("Reading ahead while hashing: {}".format(path))
+            chunks = FileObject._read_chunks(data, block_size, read_ahead)
+
+            # calculate attempts needed to get checksums. 
+            remaining_chunks = round(size/block_size)
+            logger.debug("File chunks to read: {}".format(remaining_chunks))
+
+            # calculate number of times to log progress.
+            divider = len(str(remaining_chunks))
+            logging_interval = round(remaining_chunks/divider)
+
+            try:
+                for chunk in chunks:
+                    for hasher in hashers.values():
+                        hasher.update(chunk)
+                    remaining_chunks -= 1
+
+                    # log updates.
+                    if remaining_chunks > 0 and (remaining_chunks % logging_interval) == 0:
+                        logger.debug("Remaining file chunks to read: {}".format(
+                            remaining_chunks))
+            finally:
+                chunks.close()
+
+        # convert checksums to digest strings.
+        checksums = dict((alg, h.hexdigest()) for alg, h in hashers.items())
+        return checksums
+
+
+    def _get_checksums(self, checksum_algorithms=None, block_size=None):
+        """ Returns checksum values for @self.path using each algorithm in 
+        @checksum_algorithms. Values that were already calculated in advance (i.e. they exist
+        in @self.root_object.digests), by a previous call, or by a previous run (i.e. they 
+        exist in @self.root_object.checksum_cache) are returned without re-reading the file.
+        Otherwise, the missing values and any other values listed in 
+        @self.root_object.checksum_algorithms are calculated in one read of the file. Reads
+        and cache hits are counted by @self.root_object.progress, if any.
+
+        Args:
+            - checksum_algorithms (list): The algorithms with which to calculate checksum 
+            values. See ._get_hashers() for supported algorithms. If None, 
+            @self.root_object.checksum_algorithms will be used.
+            - block_size (int): The chunk size with which to iteratively read @self.abspath
+            while calculating the checksums. If None, 
+            @self.root_object.checksum_block_size will be used. See ._hash_file() for more 
+            information.
+        
+        Returns:
+            dict: The return value.
+            Each key is an algorithm and each value is the corresponding checksum value.
+
+        Raises:
+            - ValueError: If @checksum_algorithms contains an unsupported algorithm.
+        """
+
+        # set default algorithms; remove duplicates.
+        if checksum_algorithms is None:
+            checksum_algorithms = self.root_object.checksum_algorithms
+        checksum_algorithms = list(dict.fromkeys(checksum_algorithms))
         if block_size is None:
-            block_size = sha.block_size * 20
-
-        # calculate attempts needed to get checksum. 
-        remaining_chunks = round(self.size/block_size)
-        self.logger.debug("File chunks to read: {}".format(remaining_chunks))
-
-        # calculate number of times to log progress.
-        divider = len(str(remaining_chunks))
-        logging_interval = round(remaining_chunks/divider)
-
-        # get checksum per "https://stackoverflow.com/a/1131255". 
-        data = open(self.abspath, "rb")
-        while True:
-            
-            # read next data chunk; break if none are left.
-            chunk = data.read(block_size)
-            if not chunk:
-                break
-            sha.update(chunk)
-            remaining_chunks -= 1
-
-            # log updates.
-            if remaining_chunks > 0 and (remaining_chunks % logging_interval) == 0:
-                self.logger.debug("Remaining file chunks to read: {}".format(
-                    remaining_chunks))
-
-        # convert checksum to digest string.
-        checksum = sha.hexdigest()
+            block_size = self.root_object.checksum_block_size
+
+        # collect checksum values that are already known.
+        known = dict(self.root_object.digests.get(self.abspath, {}))
+        known.update(self._checksums)
+        missing = [alg for alg in checksum_algorithms if alg not in known]
+
+        # if possible, get missing checksums from the persistent cache.
+        cache = self.root_object.checksum_cache
+        progress = self.root_object.progress
+        if len(missing) != 0 and cache is not None:
+            self._checksums.update(cache.get(self.abspath, missing, self.stat))
+            known.update(self._checksums)
+            missing = [alg for alg in missing if alg not in known]
+            if len(missing) == 0 and progress is not None:
+                progress.skipped(self.size)
+
+        # if needed, calculate missing checksums along with the default ones.
+        if len(missing) != 0:
+            missing += [alg for alg in self.root_object.checksum_algorithms 
+                    if alg not in known and alg not in missing]
+            self.logger.info("Calculating {} checksum value(s) for: {}".format(missing, 
+                self.abspath))
+            checksums = self._hash_file(self.abspath, missing, block_size)
+            if cache is not None:
+                cache.set(self.abspath, checksums, self.stat)
+            self._checksums.update(checksums)
+            known.update(self._checksums)
+            if progress is not None:
+                progress.hashed(self.size)
+        else:
+            self.logger.info("Using existing {} checksum value(s) for: {}".format(
+                checksum_algorithms, self.abspath))
+
+        # return requested checksum values.
+        checksums = dict((alg, known[alg]) for alg in checksum_algorithms)
+        return checksums
+
+
+    def _get_checksum(self, checksum_algorithm="SHA-256", block_size=None):
+        """ Returns the checksum value for @self.path using @checksum_algorithm. See 
+        ._get_checksums() for information on how values are reused.
+
+        Args:
+            - checksum_algorithm (str): The algorithm with which to calculate the checksum
+            value. See ._get_hashers() for supported algorithms.
+            - block_size (int): The chunk size with which to iteratively read @self.abspath
+            while calculating the checksum. See ._get_checksums() for more information.
+        
+        Returns:
+            str: The return value.
+
+        Raises:
+            - ValueError: If @checksum_algorithm is not supported.
+        """
+        
+        checksum = self._get_checksums([checksum_algorithm], block_size)[checksum_algorithm]
 
         self.logger.info("{} checksum: {}".format(checksum_algorithm, checksum))
         return checksum
 
+
+    # set public aliases.
+    mimetype = _get_mimetype
+    checksum = _get_checksum
+    checksums = _get_checksums
+
         
 if __name__ == "__main__":
     pass
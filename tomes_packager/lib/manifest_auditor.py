@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+
+""" This module contains a class for auditing the fixity of an existing AIP against its METS
+manifest file. """
+
+# import modules.
+import logging
+import logging.config
+import os
+import sqlite3
+import tempfile
+import time
+from collections import deque
+from lxml import etree
+from .checksum_maker import ChecksumMaker
+from .directory_object import DirectoryObject
+
+
+class ManifestAuditor():
+    """ A class for auditing the fixity of an existing AIP against its METS manifest file.
+
+    The manifest is streamed, so memory use doesn't grow with the number of files. Progress
+    is stored in an SQLite state file so that an audit stopped by @time_limit can be resumed
+    later by running it again with the same state file. Nothing in the AIP is altered.
+
+    Attributes:
+        - results (dict): The number of audited files with keys: "passed", "missing",
+        "changed", "unreadable", "unsupported", and "extra". "Extra" files are in the AIP 
+        but not the manifest. "Unreadable" files exist but couldn't be checksummed. 
+        "Unsupported" files have a missing or unsupported checksum algorithm in the 
+        manifest. Repeated manifest entries are audited once.
+        - is_complete (bool): True if every file in the manifest and the AIP was audited.
+
+    Example:
+        >>> auditor = ManifestAuditor("../../tests/sample_files/foo/foo.mets.manifest",
+                "foo.audit.sqlite", workers=4, time_limit=3600)
+        >>> auditor.audit() # True if the audit finished within an hour.
+        >>> auditor.results # {"passed": 8, "missing": 0, "changed": 0, ...}
+        >>> for row in auditor.report():
+        >>>     print(row) # prints files that didn't pass.
+    """
+
+
+    def __init__(self, manifest_file, state_file="", workers=1, use_processes=False,
+            block_size=None, time_limit=None, exclude=None, tree_index=""):
+        """ Sets instance attributes.
+
+        Args:
+            - manifest_file (str): The path to the METS manifest. Files listed in it are
+            relative to its parent folder, i.e. the AIP's root folder.
+            - state_file (str): The path to the SQLite file in which to store audit progress.
+            Pass in an empty string to use a temporary file that's deleted when .audit() 
+            returns; the audit can't then be resumed and files that didn't pass are kept in
+            memory for .report().
+            - workers (int): The number of worker threads or processes with which to
+            calculate checksum values.
+            - use_processes (bool): Use True to calculate checksum values with worker
+            processes instead of worker threads.
+            - block_size (int): The chunk size with which to read files. See
+            FileObject._hash_file().
+            - time_limit (float): The number of seconds after which to stop queuing files.
+            Use None for no limit.
+            - exclude (function): An optional function that takes a FileObject and returns
+            True if the file is intentionally left out of the manifest and therefore not
+            "extra".
+            - tree_index (str): Optional path to a folder index with which to avoid listing
+            unchanged folders while looking for extra files. It's updated once all files 
+            have been checked. See DirectoryObject.load_index(). Without it, folder 
+            listings are discarded once traversed so memory use doesn't grow with the 
+            number of files.
+
+        Raises:
+            - FileNotFoundError: If @manifest_file is not an actual file path.
+        """
+
+        # set logger; suppress logging by default.
+        self.logger = logging.getLogger(__name__)
+        self.logger.addHandler(logging.NullHandler())
+
+        # verify @manifest_file is a file.
+        if not os.path.isfile(manifest_file):
+            msg = "Can't find: {}".format(manifest_file)
+            self.logger.error(msg)
+            raise FileNotFoundError(msg)
+
+        # set attributes.
+        self.manifest_file = manifest_file
+        self.aip_dir = os.path.dirname(os.path.abspath(manifest_file))
+        self.state_file = state_file
+        self.time_limit = time_limit
+        self.exclude = exclude
+        self.tree_index = tree_index
+        self.results = {"passed": 0, "missing": 0, "changed": 0, "unreadable": 0, 
+                "unsupported": 0, "extra": 0}
+        self.is_complete = False
+
+        # set storage container for files that didn't pass if @state_file is temporary.
+        self._is_temporary = state_file == ""
+        self._failures = None
+
+        # set namespace attributes.
+        self.mets_ns = "{http://www.loc.gov/METS/}"
+        self.xlink_ns = "{http://www.w3.org/1999/xlink}"
+
+        # set the number of results to record before committing.
+        self._commit_interval = 1000
+
+        # add dependency attributes.
+        self._checksum_maker = ChecksumMaker(workers, use_processes, block_size=block_size)
+        self._directory_object_cls = DirectoryObject
+
+
+    def _get_entries(self):
+        """ Yields a tuple for each <file> element in @self.manifest_file. The items are the
+        relative file path, the size, the checksum algorithm, and the checksum value. Parsed
+        elements are discarded as soon as they're read.
+
+        Returns:
+            generator: The return value.
+        """
+
+        self.logger.info("Streaming manifest: {}".format(self.manifest_file))
+
+        # iterate through <file> elements.
+        for event, file_el in etree.iterparse(self.manifest_file, events=("end",),
+                tag=self.mets_ns + "file"):
+
+            # get file metadata.
+            flocat_el = file_el.find(self.mets_ns + "FLocat")
+            href = flocat_el.get(self.xlink_ns + "href") if flocat_el is not None else None
+            entry = (href, file_el.get("SIZE"), file_el.get("CHECKSUMTYPE"),
+                    file_el.get("CHECKSUM"))
+
+            # free memory used by this and previous elements.
+            file_el.clear()
+            while file_el.getprevious() is not None:
+                del file_el.getparent()[0]
+
+            yield entry
+
+
+    def _open_state(self):
+        """ Returns a connection to @self.state_file. If the state file was created for a
+        different version of @self.manifest_file, its previous results are discarded.
+
+        Returns:
+            sqlite3.Connection: The return value.
+        """
+
+        # if needed, create a temporary state file.
+        if self.state_file == "":
+            handle, self.state_file = tempfile.mkstemp(suffix=".sqlite")
+            os.close(handle)
+            self.logger.info("Using temporary audit state file: {}".format(self.state_file))
+
+        # create tables.
+        conn = sqlite3.connect(self.state_file)
+        conn.execute("CREATE TABLE IF NOT EXISTS audit (path TEXT PRIMARY KEY, status TEXT,"
+                " algorithm TEXT, expected TEXT, actual TEXT)")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+        # if @self.manifest_file has changed since the last run, start over.
+        stat = os.stat(self.manifest_file)
+        manifest_id = "{}:{}:{}".format(os.path.abspath(self.manifest_file), stat.st_size,
+                stat.st_mtime_ns)
+        row = conn.execute("SELECT value FROM meta WHERE key='manifest'").fetchone()
+        if row is None or row[0] != manifest_id:
+            if row is not None:
+                self.logger.warning("Manifest has changed since last audit; starting over.")
+            conn.execute("DELETE FROM audit")
+            conn.execute("DELETE FROM meta")
+            conn.execute("INSERT INTO meta VALUES ('manifest', ?)", (manifest_id,))
+        else:
+            self.logger.info("Resuming audit from: {}".format(self.state_file))
+        conn.commit()
+
+        return conn
+
+
+    def _audit_entries(self, conn, is_expired):
+        """ Verifies each file listed in @self.manifest_file that hasn't already been
+        audited.
+
+        Args:
+            - conn (sqlite3.Connection): The connection to @self.state_file.
+            - is_expired (function): Returns True if @self.time_limit has been reached.
+
+        Returns:
+            bool: The return value.
+            True if all files were audited. Otherwise, False.
+        """
+
+        pending = deque()
+        pending_paths = set()
+        is_finished = True
+        recorded = 0
+
+        # convenience function to record a result.
+        def record(path, status, algorithm, checksum, actual):
+            nonlocal recorded
+            if status != "passed":
+                self.logger.warning("File is {}: {}".format(status, path))
+            conn.execute("INSERT OR REPLACE INTO audit VALUES (?, ?, ?, ?, ?)",
+                    (path, status, algorithm, checksum, actual))
+            recorded += 1
+            if recorded % self._commit_interval == 0:
+                conn.commit()
+
+        # convenience function to determine if an algorithm is supported.
+        def is_supported(algorithm):
+            try:
+                self._checksum_maker._file_object._get_hashers([algorithm])
+                return True
+            except ValueError:
+                return False
+
+        # yield hashing tasks for unaudited files; record files that needn't be hashed.
+        def get_tasks():
+            nonlocal is_finished
+            for path, size, algorithm, checksum in self._get_entries():
+                if path is None:
+                    continue
+                if path in pending_paths:
+                    self.logger.warning("Skipping duplicate manifest entry: {}".format(path))
+                    continue
+                if conn.execute("SELECT 1 FROM audit WHERE path=?", (path,)).fetchone():
+                    continue
+                if is_expired():
+                    self.logger.info("Time limit reached; stopping audit.")
+                    is_finished = False
+                    return
+                abspath = os.path.join(self.aip_dir, path)
+                if not os.path.isfile(abspath):
+                    record(path, "missing", algorithm, checksum, None)
+                elif not is_supported(algorithm):
+                    record(path, "unsupported", algorithm, checksum, None)
+                elif size is not None and int(size) != os.path.getsize(abspath):
+                    record(path, "changed", algorithm, checksum, None)
+                else:
+                    pending.append((path, algorithm, checksum))
+                    pending_paths.add(path)
+                    yield (abspath, [algorithm])
+
+        # calculate checksum values and record results; results are in the same order as
+        # the tasks, so each is matched to its manifest entry even if paths repeat.
+        for abspath, checksums in self._checksum_maker.get_checksums(get_tasks()):
+            path, algorithm, checksum = pending.popleft()
+            pending_paths.discard(path)
+            if checksums is None:
+                status = "unreadable" if os.path.isfile(abspath) else "missing"
+                record(path, status, algorithm, checksum, None)
+            elif checksums[algorithm] != checksum:
+                record(path, "changed", algorithm, checksum, checksums[algorithm])
+            else:
+                record(path, "passed", algorithm, checksum, checksums[algorithm])
+
+        conn.commit()
+        return is_finished
+
+
+    def _audit_extras(self, conn, is_expired):
+        """ Records files in @self.aip_dir that aren't listed in @self.manifest_file.
+
+        Args:
+            - conn (sqlite3.Connection): The connection to @self.state_file.
+            - is_expired (function): Returns True if @self.time_limit has been reached.
+
+        Returns:
+            bool: The return value.
+            True if all files were checked. Otherwise, False.
+        """
+
+        self.logger.info("Looking for files not listed in the manifest.")
+
+        # only keep folder listings in memory if they'll be saved to @self.tree_index.
+        manifest_path = os.path.abspath(self.manifest_file)
+        dir_obj = self._directory_object_cls(self.aip_dir, 
+                retain_listings=self.tree_index != "")
+        if self.tree_index != "":
+            dir_obj.load_index(self.tree_index)
+
+        # check each file.
+        for file_obj in dir_obj.rfiles():
+            if is_expired():
+                self.logger.info("Time limit reached; stopping audit.")
+                conn.commit()
+                return False
+            if file_obj.abspath == manifest_path:
+                continue
+            if self.exclude is not None and self.exclude(file_obj):
+                continue
+            if conn.execute("SELECT 1 FROM audit WHERE path=?",
+                    (file_obj.name,)).fetchone():
+                continue
+            self.logger.warning("File is extra: {}".format(file_obj.name))
+            conn.execute("INSERT INTO audit VALUES (?, 'extra', NULL, NULL, NULL)",
+                    (file_obj.name,))
+
+        conn.commit()
+        if self.tree_index != "":
+            dir_obj.save_index(self.tree_index)
+        return True
+
+
+    def audit(self):
+        """ Audits unaudited files in @self.manifest_file and @self.aip_dir until all files
+        are audited or @self.time_limit is reached.
+
+        Returns:
+            bool: The return value.
+            True if the audit is complete. Otherwise, False.
+        """
+
+        self.logger.info("Auditing files in: {}".format(self.aip_dir))
+
+        # set timer.
+        start = time.monotonic()
+        is_expired = lambda: (self.time_limit is not None and
+                time.monotonic() - start > self.time_limit)
+
+        # audit files listed in the manifest, then look for extra files.
+        conn = self._open_state()
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key='phase'").fetchone()
+            phase = "entries" if row is None else row[0]
+            if phase == "entries" and self._audit_entries(conn, is_expired):
+                phase = "extras"
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('phase', ?)", (phase,))
+                conn.commit()
+            if phase == "extras" and self._audit_extras(conn, is_expired):
+                phase = "complete"
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('phase', ?)", (phase,))
+                conn.commit()
+
+            # tally results.
+            self.results = dict.fromkeys(self.results, 0)
+            for status, count in conn.execute("SELECT status, COUNT(*) FROM audit GROUP BY"
+                    " status"):
+                self.results[status] = count
+        finally:
+            conn.close()
+
+        # if the state file is temporary, keep files that didn't pass and delete it.
+        if self._is_temporary:
+            self._failures = None
+            self._failures = list(self.report())
+            self.logger.info("Deleting temporary audit state file: {}".format(
+                self.state_file))
+            os.remove(self.state_file)
+            self.state_file = ""
+
+        # report on the audit.
+        self.is_complete = phase == "complete"
+        self.logger.info("Audit results: {}".format(self.results))
+        if not self.is_complete and self._is_temporary:
+            self.logger.info("Audit is incomplete; temporary audits can't be resumed.")
+        elif not self.is_complete:
+            self.logger.info("Audit is incomplete; resume with state file: {}".format(
+                self.state_file))
+
+        return self.is_complete
+
+
+    def report(self):
+        """ Yields a tuple for each file that didn't pass the audit. The items are the
+        relative file path, the status, the checksum algorithm, the expected checksum value,
+        and the actual checksum value.
+
+        Returns:
+            generator: The return value.
+        """
+
+        # if the state file was temporary, use the files kept from the last audit.
+        if self._failures is not None:
+            for row in self._failures:
+                yield row
+            return
+
+        conn = sqlite3.connect(self.state_file)
+        try:
+            for row in conn.execute("SELECT path, status, algorithm, expected, actual FROM "
+                    "audit WHERE status!='passed' ORDER BY path"):
+                yield row
+        finally:
+            conn.close()
+
+
+if __name__ == "__main__":
+    pass
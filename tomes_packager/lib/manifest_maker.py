@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+
+""" This module contains a class for writing a METS manifest of a folder directly with lxml's
+incremental XML writer. """
+
+# import modules.
+import logging
+import logging.config
+import os
+from collections import OrderedDict
+from datetime import datetime
+from lxml import etree
+
+
+class ManifestMaker():
+    """ A class for writing a METS manifest of a folder directly with lxml's incremental XML
+    writer.
+
+    The manifest has the same structure and content as the one rendered from
+    "mets_templates/MANIFEST.XML", but it's written element by element, already indented,
+    without a template. A <fileGrp> lists the files directly within the folder, excluding
+    the manifest itself. Each subfolder then gets a <fileGrp> that lists the files within
+    it recursively and a <div> in the <structMap>.
+
+    Example:
+        >>> from directory_object import DirectoryObject
+        >>> dir_obj = DirectoryObject("../../tests/sample_files")
+        >>> mm = ManifestMaker(dir_obj, "../../tests/foo.mets.manifest", "foo")
+        >>> mm.make() # writes "foo.mets.manifest".
+    """
+
+
+    def __init__(self, directory_obj, filepath, account_id, agent_name="", agent_notes=(),
+            charset="utf-8", exclude=None, checksum_algorithm="SHA-256"):
+        """ Sets instance attributes.
+
+        Args:
+            - directory_obj (DirectoryObject): The folder to describe.
+            - filepath (str): The file path to which to write the manifest. If it's within
+            @directory_obj, it's left out of the manifest.
+            - account_id (str): The email account's base identifier, i.e. the label of the
+            <structMap>'s outer <div>.
+            - agent_name (str): The name of the software agent in the <metsHdr>.
+            - agent_notes (tuple): The notes about the software agent in the <metsHdr>.
+            - charset (str): The encoding for the manifest file.
+            - exclude (object): Optional glob pattern(s) or function with which to skip files
+            and folders within subfolders. Skipped files are counted in an XML comment. See
+            DirectoryObject._compile_filter().
+            - checksum_algorithm (str): The algorithm with which to calculate each file's
+            checksum value. See FileObject._get_hashers() for supported algorithms.
+        """
+
+        # set logger; suppress logging by default.
+        self.logger = logging.getLogger(__name__)
+        self.logger.addHandler(logging.NullHandler())
+
+        # convenience functions to clean up path notation.
+        self._normalize_sep = lambda p: p.replace(os.sep, os.altsep) if (
+                os.altsep == "/") else p
+        self._normalize_path = lambda p: self._normalize_sep(os.path.normpath(p))
+
+        # set attributes.
+        self.directory_obj = directory_obj
+        self.filepath = self._normalize_path(filepath)
+        self.account_id = account_id
+        self.agent_name = agent_name
+        self.agent_notes = tuple(agent_notes)
+        self.charset = charset
+        self.exclude = exclude
+        self.checksum_algorithm = checksum_algorithm
+
+        # set namespace functions and map.
+        self._mets = lambda tag: "{http://www.loc.gov/METS/}" + tag
+        self._xlink = lambda tag: "{http://www.w3.org/1999/xlink}" + tag
+        self._nsmap = {None: "http://www.loc.gov/METS/",
+                "xlink": "http://www.w3.org/1999/xlink",
+                "xsi": "http://www.w3.org/2001/XMLSchema-instance"}
+
+
+    def _write_files(self, xf, file_objects, prefix):
+        """ Writes a <file> element for each FileObject in @file_objects.
+
+        Args:
+            - xf (lxml.etree.xmlfile): The open manifest writer, within a <fileGrp>.
+            - file_objects (iterable): The FileObjects to write.
+            - prefix (str): The prefix for each file's index in its "ID" attribute.
+
+        Returns:
+            None
+        """
+
+        indent = "\n      "
+
+        for file_obj in file_objects:
+
+            # skip the manifest itself.
+            if file_obj.path == self.filepath:
+                continue
+
+            # set attributes in the same order as the manifest template.
+            attributes = OrderedDict([("SIZE", str(file_obj.size)),
+                ("ID", "_{}{}".format(prefix, file_obj.index)),
+                ("MIMETYPE", file_obj.mimetype()), ("CREATED", file_obj.created),
+                ("CHECKSUM", file_obj.checksum(self.checksum_algorithm)),
+                ("CHECKSUMTYPE", self.checksum_algorithm)])
+            location = OrderedDict([(self._xlink("href"), file_obj.name),
+                ("LOCTYPE", "OTHER"), ("OTHERLOCTYPE", "SYSTEM")])
+
+            # write the <file> and its <FLocat>.
+            xf.write(indent)
+            with xf.element(self._mets("file"), attributes):
+                xf.write(indent + "  ")
+                with xf.element(self._mets("FLocat"), location):
+                    pass
+                xf.write(indent)
+
+        return
+
+
+    def make(self):
+        """ Writes the manifest to @self.filepath provided it's not an existing file.
+
+        Returns:
+            None
+        """
+
+        # verify @filepath doesn't already exist.
+        if os.path.isfile(self.filepath):
+            msg = "Manifest file '{}' already exists; it will not be overwritten.".format(
+                    self.filepath)
+            self.logger.info(msg)
+            return
+
+        self.logger.info("Creating METS manifest file: {}".format(self.filepath))
+
+        skipped = 0
+        folders = []
+
+        with etree.xmlfile(self.filepath, encoding=self.charset) as xf:
+            xf.write_declaration()
+            with xf.element(self._mets("mets"), nsmap=self._nsmap):
+
+                # write the header.
+                xf.write("\n  ")
+                created = datetime.utcnow().isoformat() + "Z"
+                with xf.element(self._mets("metsHdr"), CREATEDATE=created):
+                    xf.write("\n    ")
+                    with xf.element(self._mets("agent"), OrderedDict([("ROLE", "CREATOR"),
+                        ("TYPE", "OTHER"), ("OTHERTYPE", "Software Agent")])):
+                        for tag, text in [("name", self.agent_name)] + [("note", note) for
+                                note in self.agent_notes]:
+                            xf.write("\n      ")
+                            with xf.element(self._mets(tag)):
+                                xf.write(text)
+                        xf.write("\n    ")
+                    xf.write("\n  ")
+
+                # write a <fileGrp> for the root folder's files.
+                xf.write("\n  ")
+                with xf.element(self._mets("fileSec")):
+                    xf.write("\n    ")
+                    xf.write(etree.Comment(" Note: this METS manifest file is excluded "
+                        "from the <fileSec> element. "))
+                    xf.write("\n    ")
+                    with xf.element(self._mets("fileGrp"), ID="ROOT__files"):
+                        self._write_files(xf, self.directory_obj.files(), "")
+                        xf.write("\n    ")
+
+                    # write a <fileGrp> for each subfolder's files.
+                    for folder in self.directory_obj.dirs():
+                        folders.append(folder.name)
+                        xf.write("\n    ")
+                        with xf.element(self._mets("fileGrp"), ID="{}__files".format(
+                                folder.name)):
+                            self._write_files(xf, folder.rfiles(exclude=self.exclude),
+                                    folder.name + "_")
+                            xf.write("\n    ")
+                        skipped += folder.skipped
+
+                    # report skipped files.
+                    if skipped > 0:
+                        xf.write("\n  ")
+                        xf.write(etree.Comment(" Skipped {} EAXS attachment files. Please "
+                            "see the EAXS file(s) for attachment checksums. ".format(
+                                skipped)))
+                    xf.write("\n  ")
+
+                # write a <div> for the root folder and each subfolder.
+                xf.write("\n  ")
+                with xf.element(self._mets("structMap")):
+                    xf.write("\n    ")
+                    with xf.element(self._mets("div"), LABEL=self.account_id):
+                        for div_id in ["ROOT"] + folders:
+                            xf.write("\n      ")
+                            with xf.element(self._mets("div"), ID="{}__folder".format(
+                                    div_id)):
+                                xf.write("\n      ")
+                        xf.write("\n    ")
+                    xf.write("\n  ")
+                xf.write("\n")
+
+        return
+
+
+if __name__ == "__main__":
+    pass
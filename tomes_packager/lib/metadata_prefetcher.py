@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+""" This module contains a class for resolving the metadata of FileObjects in parallel ahead
+of their use. """
+
+# import modules.
+import logging
+import logging.config
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class MetadataPrefetcher():
+    """ A class for resolving the metadata of FileObjects in parallel ahead of their use.
+
+    Each FileObject passed through .prefetch() has its path and date attributes, MIME type,
+    and checksum values resolved by a pool of threads. FileObjects keep these values, so
+    a METS template that then reads them doesn't wait on the disk. FileObjects are yielded
+    in the same order as they're passed in and only a bounded number are resolved ahead of
+    the one being used, so memory use doesn't grow with the number of files.
+
+    Attach an instance to a root DirectoryObject's @prefetcher attribute so that file
+    traversals of it and its folders are passed through .prefetch().
+
+    Example:
+        >>> from directory_object import DirectoryObject
+        >>> dir_obj = DirectoryObject("../../tests/sample_files")
+        >>> dir_obj.prefetcher = MetadataPrefetcher(workers=4)
+        >>> for file_obj in dir_obj.rfiles(): # files are resolved ahead of the loop.
+        >>>     file_obj.checksum("SHA-256") # uses the prefetched value.
+    """
+
+
+    def __init__(self, workers=4, buffer_size=None, exclude=None):
+        """ Sets instance attributes.
+
+        Args:
+            - workers (int): The maximum number of worker threads.
+            - buffer_size (int): The maximum number of FileObjects resolved or being
+            resolved ahead of the one being used. If None, this is 4 per worker.
+            - exclude (function): An optional function that takes a FileObject and returns
+            True if its metadata shouldn't be resolved, e.g. for a file still being written.
+            Excluded FileObjects are still yielded in order.
+
+        Raises:
+            - ValueError: If @workers or @buffer_size is less than 1.
+        """
+
+        # set logger; suppress logging by default.
+        self.logger = logging.getLogger(__name__)
+        self.logger.addHandler(logging.NullHandler())
+
+        # set the number of files that may be queued per worker at any one time.
+        self._queue_factor = 4
+
+        # verify @workers and @buffer_size are legal.
+        if buffer_size is None:
+            buffer_size = workers * self._queue_factor
+        if workers < 1 or buffer_size < 1:
+            msg = "Worker count and buffer size must be at least 1, got: {}, {}".format(
+                    workers, buffer_size)
+            self.logger.error(msg)
+            raise ValueError(msg)
+
+        # set attributes.
+        self.workers = workers
+        self.buffer_size = buffer_size
+        self.exclude = exclude
+
+
+    def _resolve(self, file_obj):
+        """ Resolves the metadata of @file_obj. Errors are logged and otherwise ignored so
+        that they're raised when the caller uses the affected attribute.
+
+        Args:
+            - file_obj (FileObject): The file whose metadata to resolve.
+
+        Returns:
+            FileObject: The return value.
+        """
+
+        try:
+            file_obj.name, file_obj.created, file_obj.modified
+            file_obj.mimetype()
+            file_obj.checksums()
+        except (OSError, ValueError) as err:
+            self.logger.debug("Can't prefetch metadata for: {}".format(file_obj.path))
+            self.logger.debug(err)
+
+        return file_obj
+
+
+    def prefetch(self, file_objects):
+        """ Yields each FileObject in @file_objects once its metadata has been resolved.
+
+        Args:
+            - file_objects (iterable): The FileObjects whose metadata to resolve.
+
+        Returns:
+            generator: The return value.
+        """
+
+        self.logger.info("Prefetching file metadata with {} worker thread(s).".format(
+            self.workers))
+
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        pending = deque()
+
+        # return the next FileObject, waiting for its metadata if needed.
+        def pop():
+            file_obj, future = pending.popleft()
+            if future is not None:
+                future.result()
+            return file_obj
+
+        # submit @file_objects to the pool and yield them in order.
+        try:
+            for file_obj in file_objects:
+                if self.exclude is not None and self.exclude(file_obj):
+                    pending.append((file_obj, None))
+                else:
+                    pending.append((file_obj, pool.submit(self._resolve, file_obj)))
+                if len(pending) > self.buffer_size:
+                    yield pop()
+
+            while pending:
+                yield pop()
+
+        # don't leave queued files behind if the caller stopped early.
+        finally:
+            for file_obj, future in pending:
+                if future is not None:
+                    future.cancel()
+            pool.shutdown()
+
+
+if __name__ == "__main__":
+    pass
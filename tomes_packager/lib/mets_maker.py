@@ -6,6 +6,7 @@ import jinja2
 import logging
 import logging.config
 import os
+import threading
 from datetime import datetime
 from lxml import etree
 
@@ -23,11 +24,34 @@ class METSMaker():
             >>> mm.make() # writes "foo.xml" METS file.
             >>> mm.validate() # True
             >>> isfile(mm.filepath) # True
+
+    Templates are compiled by a Jinja environment shared by all instances with the same
+    charset and bytecode cache, so a template used for many accounts is compiled once per 
+    process as long as the file doesn't change. With a bytecode cache folder, compiled 
+    templates are also reused by later processes; cached bytecode is keyed by template path
+    and only used if the template's content hasn't changed.
+
+    Likewise, the METS XSD and the beautifier XSLT are compiled once per process and shared
+    by all instances; the XSLT is compiled once per charset. Use .warm() to compile them 
+    ahead of time.
     """
 
+    # set storage container for shared Jinja environments.
+    _environments = {}
+    _environments_lock = threading.Lock()
+
+    # set storage containers for shared XML schemas and XSLT transforms.
+    _validators = {}
+    _transforms = {}
+    _xml_lock = threading.Lock()
+
+    # set paths to the default XSD and beautifier XSLT.
+    _default_xsd = os.path.join(os.path.dirname(__file__), "mets_1-11.xsd")
+    _default_beautifier = os.path.join(os.path.dirname(__file__), "beautifier.xsl")
 
-    def __init__(self, mets_template, filepath, evaluate=True, charset="utf-8", *args,  
-            **kwargs):
+
+    def __init__(self, mets_template, filepath, evaluate=True, charset="utf-8", *args,
+            bytecode_cache="", **kwargs):
         """ Sets instance attributes.
         
         Args:
@@ -35,12 +59,18 @@ class METSMaker():
             the Jinja template start AND stopping strings are set to "%%" instead of the 
             defaults. Also, XML comments beginning and ending with "<!--#" and
             "#-->" will not be outputted and may be used as in-line template documentation.
+            Use None to only validate an existing METS file at @filepath, in which case
+            .make() can't be used.
             - filepath (str): The file path to which to write the METS.
-            - charset (str): The encoding for the rendered METS file.
+            - charset (str): The encoding for @mets_template and the rendered METS file.
             - *args/**kwargs: The optional arguments to pass into @mets_template.
+            - bytecode_cache (str): Optional folder in which to store compiled templates for
+            reuse by later processes. It will be created if it doesn't exist. Pass in an 
+            empty string to only reuse compiled templates within the current process. This 
+            can only be passed as a keyword argument.
 
         Raises:
-            - FileNotFoundError: If @mets_template is not an actual file path.
+            - FileNotFoundError: If @mets_template is not None or an actual file path.
         """
 
         # set logger; suppress logging by default.
@@ -48,7 +78,7 @@ class METSMaker():
         self.logger.addHandler(logging.NullHandler())
 
         # verify @mets_template is a file.
-        if not os.path.isfile(mets_template):
+        if mets_template is not None and not os.path.isfile(mets_template):
             msg = "Can't find: {}".format(mets_template)
             self.logger.error(msg)
             raise FileNotFoundError(msg)
@@ -60,17 +90,157 @@ class METSMaker():
         self._join_paths = lambda *p: self._normalize_path(os.path.join(*p))
 
         # set attributes.            
-        self.mets_template = self._normalize_path(mets_template)
+        self.mets_template = None if mets_template is None else self._normalize_path(
+                mets_template)
         self.filepath = self._normalize_path(filepath)
         self.charset = charset
         self.evaluate = evaluate
+        self.bytecode_cache = self._normalize_path(bytecode_cache) if (
+                bytecode_cache != "") else ""
         self.args = args
         self.kwargs = kwargs
 
         # set attributes for imported data.
-        self.xsd = self._join_paths(os.path.dirname(__file__),  "mets_1-11.xsd")
-        self._beautifier = self._join_paths(os.path.dirname(__file__),  
-                "beautifier.xsl")
+        self.xsd = self._normalize_path(self._default_xsd)
+        
+        # set the buffer size with which to write rendered METS files.
+        self._write_buffer_size = 1048576
+
+        # set the largest METS file size in bytes to load into memory and beautify during
+        # validation; larger files are validated as they're parsed instead.
+        self._max_load_size = 10485760
+        self._beautifier = self._normalize_path(self._default_beautifier)
+
+
+    @classmethod
+    def _get_environment(cls, charset, bytecode_cache=""):
+        """ Returns the Jinja environment shared by all instances with the same @charset and
+        @bytecode_cache, creating it if needed. Templates are loaded by file path and 
+        recompiled only if their modification time changes.
+
+        Args:
+            - charset (str): The encoding with which to read templates.
+            - bytecode_cache (str): Optional folder in which to store compiled templates. 
+            Pass in an empty string to keep them in memory only.
+
+        Returns:
+            jinja2.Environment: The return value.
+        """
+
+        key = (charset, bytecode_cache)
+
+        with cls._environments_lock:
+
+            # if possible, return the existing environment.
+            if key in cls._environments:
+                return cls._environments[key]
+
+            # load templates by path; check for changes before reusing a compiled one.
+            def load(template_path):
+                mtime = os.stat(template_path).st_mtime_ns
+                with open(template_path, encoding=charset) as tf:
+                    source = tf.read()
+                is_uptodate = lambda: (os.path.isfile(template_path) and 
+                        os.stat(template_path).st_mtime_ns == mtime)
+                return (source, template_path, is_uptodate)
+
+            # if needed, create the bytecode cache.
+            if bytecode_cache != "":
+                os.makedirs(bytecode_cache, exist_ok=True)
+                bytecode_cache_obj = jinja2.FileSystemBytecodeCache(bytecode_cache)
+            else:
+                bytecode_cache_obj = None
+
+            # create the environment.
+            environment = jinja2.Environment(loader=jinja2.FunctionLoader(load), 
+                    bytecode_cache=bytecode_cache_obj, trim_blocks=True, 
+                    lstrip_blocks=True, comment_start_string="<!--#", 
+                    comment_end_string="#-->")
+            cls._environments[key] = environment
+
+        return environment
+
+
+    @classmethod
+    def _get_validator(cls, xsd):
+        """ Returns the XML schema for @xsd shared by all instances, compiling it if needed.
+
+        Args:
+            - xsd (str): The path to the XSD file.
+
+        Returns:
+            lxml.etree.XMLSchema: The return value.
+
+        Raises:
+            - lxml.etree.XMLSchemaParseError: If @xsd can't be compiled, e.g. if a schema it
+            imports can't be retrieved. Failures aren't stored, so the next call retries.
+        """
+
+        key = os.path.abspath(xsd)
+
+        with cls._xml_lock:
+            if key not in cls._validators:
+                cls._validators[key] = etree.XMLSchema(etree.parse(key))
+            validator = cls._validators[key]
+
+        return validator
+
+
+    @classmethod
+    def _get_transform(cls, xslt, charset):
+        """ Returns the XSLT transform for @xslt and @charset shared by all instances, 
+        compiling it if needed.
+
+        Args:
+            - xslt (str): The path to the XSLT file.
+            - charset (str): The output encoding to set in @xslt's <xsl:output> element.
+
+        Returns:
+            lxml.etree.XSLT: The return value.
+        """
+
+        key = (os.path.abspath(xslt), charset)
+
+        with cls._xml_lock:
+            if key not in cls._transforms:
+
+                # load XSLT; update its "encoding" attribute.
+                xslt_el = etree.parse(key[0])
+                xslt_el.find("{http://www.w3.org/1999/XSL/Transform}output").set(
+                        "encoding", charset)
+                cls._transforms[key] = etree.XSLT(xslt_el)
+            transform = cls._transforms[key]
+
+        return transform
+
+
+    @classmethod
+    def warm(cls, charsets=("utf-8",)):
+        """ Compiles the default METS XSD and the beautifier XSLT for each of @charsets so
+        that later validations don't need to, e.g. before a batch of accounts.
+
+        Args:
+            - charsets (tuple): The METS file encodings for which to compile the beautifier.
+
+        Returns:
+            bool: The return value. True if the METS XSD could be compiled. Otherwise, 
+            False.
+        """
+
+        logger = logging.getLogger(__name__)
+
+        for charset in charsets:
+            cls._get_transform(cls._default_beautifier, charset)
+
+        try:
+            cls._get_validator(cls._default_xsd)
+        except etree.XMLSchemaParseError as err:
+            logger.warning("Can't parse '{}'; check Internet connection.".format(
+                cls._default_xsd))
+            logger.error(err)
+            return False
+
+        return True
 
 
     def _beautify_mets(self, mets_el):
@@ -85,33 +255,23 @@ class METSMaker():
       
         self.logger.info("Beautifying METS XML.")
       
-        # load XSLT.
-        beautifier = etree.parse(self._beautifier)
-        
-        # update XSLT's "encoding" attribute.
-        beautifier.find("{http://www.w3.org/1999/XSL/Transform}output").set("encoding", 
-                self.charset)
-        
-        # beautify @mets_el.
-        transform = etree.XSLT(beautifier)
+        # beautify @mets_el with the shared XSLT for @self.charset.
+        transform = self._get_transform(self._beautifier, self.charset)
         mets_el = transform(mets_el)
         
         return mets_el
 
 
-    def _evaluate_mets(self, mets_el, is_valid):
-        """ Appends a validation statement to @mets_el.
+    def _get_evaluation(self, is_valid):
+        """ Returns a validation statement.
 
         Args:
-            - mets_el (lxml.etree._Element): The METS XML to which to append a validation
-            statement.
-            - is_valid (bool): True if the METS file is valid. Otherwise, False.
-            
+            - is_valid (bool): True if the METS file is valid. False if it's invalid. None if
+            it couldn't be validated.
+
         Returns:
-            lxml.etree._Element: The return value.
+            lxml.etree._Comment: The return value.
         """
- 
-        self.logger.info("Evaluating METS XML.")
 
         # make timestamp function.
         now = lambda: datetime.now().isoformat() + "Z"
@@ -124,18 +284,85 @@ class METSMaker():
         else:
             msg = "NOTE: this METS file is valid as of {}.".format(now())
  
-        # update @mets_el with validation status.
         self.logger.debug("Appending XML comment: {}".format(msg))
-        mets_el.append(etree.Comment(msg))
+        return etree.Comment(msg)
+
+
+    def _evaluate_mets(self, mets_el, is_valid):
+        """ Appends a validation statement to @mets_el.
+
+        Args:
+            - mets_el (lxml.etree._Element): The METS XML to which to append a validation
+            statement.
+            - is_valid (bool): True if the METS file is valid. Otherwise, False.
+            
+        Returns:
+            lxml.etree._Element: The return value.
+        """
+ 
+        self.logger.info("Evaluating METS XML.")
+
+        # update @mets_el with validation status.
+        mets_el.append(self._get_evaluation(is_valid))
 
         return mets_el
+
+
+    def _validate_stream(self, validator):
+        """ Validates @self.filepath against @validator as it's parsed so that only the 
+        element being parsed is held in memory. A validation comment is then appended to the
+        end of the METS file, after the root element, without rewriting the rest of it. The
+        METS file isn't beautified.
+
+        Args:
+            - validator (lxml.etree.XMLSchema): The schema against which to validate. If 
+            None, @self.filepath is only checked for XML syntax errors.
+
+        Returns:
+            bool: The return value. True if and only if the METS file could be validated and 
+            is valid. Otherwise, False.
+        """
+
+        self.logger.info("Validating METS file incrementally.")
+
+        # parse @self.filepath; discard each element and its preceding siblings once parsed.
+        is_valid = False
+        try:
+            for event, element in etree.iterparse(self.filepath, events=("end",), 
+                    encoding=self.charset, schema=validator, huge_tree=True):
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+            if validator is not None:
+                self.logger.info("METS is valid.")
+                is_valid = True
+            else:
+                self.logger.warning("Unable to perform validation.")
+        except etree.XMLSyntaxError as err:
+
+            # if the error isn't a schema error, the XML syntax is bad.
+            domains = [error.domain for error in err.error_log]
+            if etree.ErrorDomains.SCHEMASV not in domains:
+                self.logger.warning("Bad XML syntax in '{}'; check template.".format(
+                    self.filepath))
+                self.logger.error(err)
+                return False
+            self.logger.warning("METS is invalid.")
+            self.logger.error(err)
+
+        # append validation statement to @self.filepath.
+        evaluation = self._get_evaluation(is_valid if validator is not None else None)
+        with open(self.filepath, "a", encoding=self.charset) as xf:
+            xf.write("\n" + etree.tostring(evaluation, encoding=str) + "\n")
+
+        return is_valid
     
 
     def validate(self):
         """ Validates @self.filepath against @self.xsd. In addition, a validation comment is
         appended to the METS file. The METS file is also beautified. Note: this reads the METS
-        file into memory and rewrites it. Files over 10 megabytes are disallowed and will
-        automatically result in a return of False.
+        file into memory and rewrites it. Files over 10 megabytes are instead validated as 
+        they're parsed and aren't beautified; see ._validate_stream().
 
         Returns:
             bool: The return value. True if and only if the METS file could be validated and 
@@ -149,25 +376,25 @@ class METSMaker():
             self.logger.warning("Nothing to validate; trying using .make() first.")
             return False
 
-        # if the METS file is greater than 10 megabytes, return False.
-        if os.stat(self.filepath).st_size > 10485760:
-            self.logger.warning("METS file is too large to validate; returning False.")
-            return False
-
-        # create validator.
+        # get the shared validator.
         try:
-            xsd = etree.parse(self.xsd)        
-            validator = etree.XMLSchema(xsd)
+            validator = self._get_validator(self.xsd)
         except etree.XMLSchemaParseError as err:
             self.logger.warning("Can't parse '{}'; check Internet connection.".format(
                 self.xsd))
             self.logger.error(err)
             validator = None        
+
+        # if the METS file is greater than 10 megabytes, validate it without loading it.
+        if os.stat(self.filepath).st_size > self._max_load_size:
+            return self._validate_stream(validator)
         
-        # load @self.filepath.
+        # load @self.filepath as bytes decoded with @self.charset; lxml won't parse a string
+        # with an XML declaration, such as the one written by ManifestMaker.
         try:
-            with open(self.filepath, encoding=self.charset) as fp:
-                mets_el = etree.fromstring(fp.read())
+            with open(self.filepath, "rb") as fp:
+                mets_el = etree.fromstring(fp.read(), etree.XMLParser(
+                    encoding=self.charset))
         except etree.XMLSyntaxError as err:
             self.logger.warning("Bad XML syntax in '{}'; check template.".format(
                 self.filepath))
@@ -211,9 +438,17 @@ class METSMaker():
             None: The return value.
 
         Raises:
-            - ValueError: If the Jinja template syntax is incorrect.
+            - ValueError: If @self.mets_template is None or if the Jinja template syntax is 
+            incorrect.
         """
 
+        # verify there's a template to render.
+        if self.mets_template is None:
+            msg = "No METS template passed; METS file '{}' can only be validated.".format(
+                    self.filepath)
+            self.logger.error(msg)
+            raise ValueError(msg)
+
         # verify @filepath doesn't already exist.
         if os.path.isfile(self.filepath):
             msg = "METS file '{}' already exists; it will not be overwritten.".format(
@@ -223,25 +458,23 @@ class METSMaker():
         else:
             self.logger.info("Rendering METS template: {}".format(self.mets_template))
 
-        # open @self.mets_template.
-        with open(self.mets_template, encoding=self.charset) as tf:
-                mets_template = tf.read()
-               
-        # create the Jinja renderer.
+        # get the compiled @self.mets_template from the shared Jinja environment.
         try:
-            template = jinja2.Template(mets_template, trim_blocks=True, lstrip_blocks=True, 
-                    comment_start_string="<!--#", comment_end_string="#-->")
+            environment = self._get_environment(self.charset, self.bytecode_cache)
+            template = environment.get_template(self._normalize_path(os.path.abspath(
+                self.mets_template)))
         except jinja2.exceptions.TemplateSyntaxError as err:
             self.logger.warning("METS template syntax is invalid.")
             self.logger.error(err)
             raise ValueError(err)
         
-        # render @self.mets_template as a stream; write results to @self.filepath.
+        # render @self.mets_template as a stream; write results to @self.filepath through a
+        # large buffer so that nothing else accumulates.
         self.logger.info("Creating METS file: {}".format(self.filepath))        
         try:
             mets = template.stream(encoding=self.charset, *self.args, **self.kwargs)
             with open(self.filepath, "w", encoding=self.charset, 
-                    errors="xmlcharrefreplace") as f:
+                    errors="xmlcharrefreplace", buffering=self._write_buffer_size) as f:
                 i = 0
                 for line in mets:
                     f.write(line)
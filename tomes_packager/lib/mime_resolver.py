@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+
+""" This module contains a class for resolving the MIME types of files by extension with
+optional content sniffing. """
+
+# import modules.
+import logging
+import logging.config
+import mimetypes
+import os
+import re
+
+
+class MimeResolver():
+    """ A class for resolving the MIME types of files by extension with optional content
+    sniffing.
+
+    Types are guessed with mimetypes.guess_type() once per extension and then cached, so
+    a single instance can be shared by all FileObjects in a run. If an extension has no
+    known type and @sniff is True, the first @sniff_size bytes of the file are checked
+    against a few common signatures, e.g. extensionless EML exports. Otherwise, or if
+    nothing matches, "application/octet-stream" is returned.
+
+    Attributes:
+        - sniff (bool): True if files without a known type by extension are sniffed.
+        - sniff_size (int): The maximum number of bytes to read from a sniffed file.
+        - default (str): The MIME type for files whose type can't be determined.
+
+    Example:
+        >>> resolver = MimeResolver(sniff=True)
+        >>> resolver.get("foo.eml") # "message/rfc822"
+        >>> resolver.get("foo.EML") # same; only the first call uses mimetypes.
+        >>> resolver.get("foo") # "message/rfc822" if it starts with email headers.
+    """
+
+
+    def __init__(self, sniff=False, sniff_size=2048):
+        """ Sets instance attributes.
+
+        Args:
+            - sniff (bool): Use True to check the content of files whose extensions don't
+            have a known type. Use False to return @self.default for them.
+            - sniff_size (int): The maximum number of bytes to read from a sniffed file.
+        """
+
+        # set logger; suppress logging by default.
+        self.logger = logging.getLogger(__name__)
+        self.logger.addHandler(logging.NullHandler())
+
+        # set attributes.
+        self.sniff = sniff
+        self.sniff_size = sniff_size
+        self.default = "application/octet-stream"
+
+        # set storage container for MIME types (or None) keyed by extension.
+        self._types = {}
+
+        # set file signatures; the order matters.
+        self._signatures = [(b"%PDF-", "application/pdf"),
+                (b"PK\x03\x04", "application/zip"),
+                (b"\x89PNG\r\n\x1a\n", "image/png"),
+                (b"\xff\xd8\xff", "image/jpeg"),
+                (b"GIF87a", "image/gif"),
+                (b"GIF89a", "image/gif"),
+                (b"!BDN", "application/vnd.ms-outlook"),
+                (b"<?xml", "application/xml"),
+                (b"From ", "application/mbox")]
+
+        # set pattern for a leading email header, e.g. "Received: ...".
+        self._header_pattern = re.compile(br"(Return-Path|Received|Delivered-To|From|To|"
+                br"Date|Subject|Message-ID|MIME-Version|X-[\w-]+):[ \t]", re.IGNORECASE)
+
+
+    def _get_extension(self, path):
+        """ Returns the extension of @path that mimetypes.guess_type() relies on. This
+        includes the preceding extension if the last one is an encoding, e.g. ".tar.gz".
+
+        Args:
+            - path (str): The file path.
+
+        Returns:
+            str: The return value.
+        """
+
+        base, ext = os.path.splitext(os.path.basename(path))
+        if (ext in mimetypes.suffix_map or ext in mimetypes.encodings_map or
+                ext.lower() in mimetypes.encodings_map):
+            ext = os.path.splitext(base)[1] + ext
+
+        return ext
+
+
+    def _sniff(self, path):
+        """ Returns the MIME type of @path based on its first @self.sniff_size bytes.
+
+        Args:
+            - path (str): The file path.
+
+        Returns:
+            str: The return value.
+            None if the type couldn't be determined.
+        """
+
+        # read the start of @path.
+        try:
+            with open(path, "rb") as f:
+                header = f.read(self.sniff_size)
+        except OSError as err:
+            self.logger.warning("Can't sniff MIME type for: {}".format(path))
+            self.logger.error(err)
+            return None
+
+        # check for known signatures, ignoring any byte order mark.
+        header = header[3:] if header.startswith(b"\xef\xbb\xbf") else header
+        for signature, mimetype in self._signatures:
+            if header.startswith(signature):
+                return mimetype
+
+        # check for email headers.
+        if self._header_pattern.match(header):
+            return "message/rfc822"
+
+        # check for text, allowing for a character cut off by @self.sniff_size.
+        if len(header) != 0 and b"\x00" not in header:
+            try:
+                header.decode("utf-8")
+                return "text/plain"
+            except UnicodeDecodeError as err:
+                if err.start >= len(header) - 3 and err.reason == "unexpected end of data":
+                    return "text/plain"
+
+        return None
+
+
+    def get(self, path):
+        """ Returns the MIME type for @path.
+
+        Args:
+            - path (str): The file path.
+
+        Returns:
+            str: The return value.
+        """
+
+        # get the type for the extension, guessing it if it isn't cached.
+        ext = self._get_extension(path)
+        if ext not in self._types:
+            self._types[ext] = mimetypes.guess_type("file" + ext)[0]
+            self.logger.debug("MIME type for extension '{}': {}".format(ext,
+                self._types[ext]))
+        mimetype = self._types[ext]
+
+        # if needed, sniff @path or fall back to a default.
+        if mimetype is None and self.sniff:
+            mimetype = self._sniff(path)
+        if mimetype is None:
+            mimetype = self.default
+
+        return mimetype
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+
+""" This module contains a class for tracking file and byte progress while checksum values
+are calculated. """
+
+# import modules.
+import logging
+import logging.config
+import threading
+import time
+from datetime import timedelta
+
+
+class ProgressTracker():
+    """ A class for tracking file and byte progress while checksum values are calculated.
+
+    Files are first "found" by .scan(). As each one is processed, it's either "hashed" (read
+    from disk) or "skipped" (its values were cached). Throughput is based on hashed bytes
+    only and the ETA assumes the remaining bytes will all need to be hashed. Counts may be
+    updated from multiple threads.
+
+    Attributes:
+        - files_found (int): The number of files to process.
+        - bytes_found (int): The total size of the files to process.
+        - files_hashed (int): The number of files read in order to calculate values.
+        - bytes_hashed (int): The total size of hashed files.
+        - files_skipped (int): The number of files whose values didn't need to be calculated.
+        - bytes_skipped (int): The total size of skipped files.
+
+    Example:
+        >>> from directory_object import DirectoryObject
+        >>> tracker = ProgressTracker(callback=print, interval=10)
+        >>> dir_obj = DirectoryObject("../../tests/sample_files", progress=tracker)
+        >>> tracker.scan(dir_obj.rfiles())
+        >>> for file_obj in dir_obj.rfiles():
+        >>>     file_obj.checksum() # prints stats at most every 10 seconds.
+        >>> tracker.report() # {"files_found": 4, ..., "eta": 0.0}
+    """
+
+
+    def __init__(self, callback=None, interval=60):
+        """ Sets instance attributes.
+
+        Args:
+            - callback (function): An optional function to call with the dict returned by
+            .get_stats() each time progress is reported.
+            - interval (float): The minimum number of seconds between reports. Use 0 to
+            report after every update.
+        """
+
+        # set logger; suppress logging by default.
+        self.logger = logging.getLogger(__name__)
+        self.logger.addHandler(logging.NullHandler())
+
+        # set attributes.
+        self.callback = callback
+        self.interval = interval
+        self.files_found = 0
+        self.bytes_found = 0
+        self.files_hashed = 0
+        self.bytes_hashed = 0
+        self.files_skipped = 0
+        self.bytes_skipped = 0
+
+        # set timers.
+        self._lock = threading.Lock()
+        self._hash_start = None
+        self._last_report = time.monotonic()
+
+
+    def _update(self, kind, size):
+        """ Adds a file of @size bytes to the @kind counts and reports progress if
+        @self.interval has elapsed since the last report.
+
+        Args:
+            - kind (str): The count to update: "found", "hashed", or "skipped".
+            - size (int): The file size in bytes.
+
+        Returns:
+            None
+        """
+
+        with self._lock:
+            if kind != "found" and self._hash_start is None:
+                self._hash_start = time.monotonic()
+            setattr(self, "files_" + kind, getattr(self, "files_" + kind) + 1)
+            setattr(self, "bytes_" + kind, getattr(self, "bytes_" + kind) + size)
+            is_due = time.monotonic() - self._last_report >= self.interval
+
+        if is_due:
+            self.report()
+
+        return
+
+
+    def found(self, size):
+        """ Adds a file of @size bytes to the files to process. """
+
+        self._update("found", size)
+        return
+
+
+    def hashed(self, size):
+        """ Adds a file of @size bytes to the files that were read. """
+
+        self._update("hashed", size)
+        return
+
+
+    def skipped(self, size):
+        """ Adds a file of @size bytes to the files that didn't need to be read. """
+
+        self._update("skipped", size)
+        return
+
+
+    def scan(self, file_objects):
+        """ Adds each FileObject in @file_objects to the files to process.
+
+        Args:
+            - file_objects (iterable): The FileObjects whose checksum values will be
+            calculated.
+
+        Returns:
+            None
+        """
+
+        self.logger.info("Scanning files to process.")
+
+        for file_obj in file_objects:
+            self.found(file_obj.size)
+
+        self.logger.info("Found {:,} file(s) totaling {:,} byte(s).".format(self.files_found,
+            self.bytes_found))
+        return
+
+
+    def get_stats(self):
+        """ Returns the current progress.
+
+        Returns:
+            dict: The return value.
+            The keys are the file and byte counts (see the class attributes) plus "elapsed"
+            (seconds spent processing), "throughput" (hashed bytes per second), and "eta"
+            (estimated seconds remaining or None if it can't be estimated yet).
+        """
+
+        with self._lock:
+            stats = dict((k, getattr(self, k)) for k in ["files_found", "bytes_found",
+                "files_hashed", "bytes_hashed", "files_skipped", "bytes_skipped"])
+            hash_start = self._hash_start
+
+        # calculate throughput and ETA.
+        elapsed = 0 if hash_start is None else time.monotonic() - hash_start
+        throughput = stats["bytes_hashed"]/elapsed if elapsed > 0 else 0
+        remaining = max(stats["bytes_found"] - stats["bytes_hashed"] -
+                stats["bytes_skipped"], 0)
+        if remaining == 0:
+            eta = 0.0
+        elif throughput > 0:
+            eta = remaining/throughput
+        else:
+            eta = None
+        stats.update({"elapsed": elapsed, "throughput": throughput, "eta": eta})
+
+        return stats
+
+
+    def report(self):
+        """ Logs the current progress and passes it to @self.callback.
+
+        Returns:
+            dict: The return value.
+            The current progress. See .get_stats().
+        """
+
+        stats = self.get_stats()
+        with self._lock:
+            self._last_report = time.monotonic()
+
+        # log progress.
+        done = stats["files_hashed"] + stats["files_skipped"]
+        done_bytes = stats["bytes_hashed"] + stats["bytes_skipped"]
+        eta = "unknown" if stats["eta"] is None else str(timedelta(seconds=round(
+            stats["eta"])))
+        self.logger.info("Processed {:,} of {:,} file(s); {:.1f} of {:.1f} MB; {:.1f} MB/s;"
+                " ETA: {}".format(done, stats["files_found"], done_bytes/1048576,
+                stats["bytes_found"]/1048576, stats["throughput"]/1048576, eta))
+
+        # pass progress to @self.callback.
+        if self.callback is not None:
+            self.callback(stats)
+
+        return stats
+
+
+if __name__ == "__main__":
+    pass
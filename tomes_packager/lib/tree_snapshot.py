@@ -0,0 +1,518 @@
+#!/usr/bin/env python3
+
+""" This module contains a class for capturing a folder tree with one status call per file or
+folder. """
+
+# import modules.
+import json
+import logging
+import logging.config
+import os
+import sqlite3
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TreeSnapshot():
+    """ A class for capturing a folder tree with one status call per file or folder.
+
+    Each folder is listed with os.scandir() the first time it's needed and each entry's 
+    status is captured once. Later traversals are served from memory in the same order as
+    os.walk(), including not descending into symbolic links to folders. Only the folders 
+    that are actually traversed are listed unless .build() is used to list all of them.
+
+    With more than one worker, recursive walks list folders ahead of time in a pool of
+    threads, which helps on storage where each listing or status call has high latency, 
+    e.g. NFS. Each thread queues the subfolders of the folder it lists, so the pool works
+    ahead of the walk at every depth. Folders are still yielded in the same order.
+
+    Listings can be saved to an index file and loaded by a later snapshot of the same 
+    folder. A saved listing is only loaded if the folder's modification time hasn't changed,
+    i.e. no entries were added, removed, or renamed since it was listed. This costs one
+    status call per folder instead of one per file. Files altered in place don't change 
+    their folder's modification time, so their loaded status can be out of date; use 
+    .is_loaded() to tell which listings came from an index.
+
+    If listings aren't retained, each walk lists folders again and only the listings of the
+    folders being walked through are held in memory, so memory use doesn't grow with the 
+    size of the tree. Folders listed ahead by the pool are then limited to a few per worker.
+
+    Attributes:
+        - path (str): The root folder of the snapshot.
+        - workers (int): The maximum number of threads with which to list folders.
+        - retain (bool): True if folder listings are kept for later walks.
+
+    Example:
+        >>> snapshot = TreeSnapshot("../../tests/sample_files")
+        >>> snapshot.walk(snapshot.path, recursive=False) # lists only the root folder.
+        >>> snapshot.build() # lists all folders.
+        >>> for dirpath, dir_stat, dirs, files in snapshot.walk(snapshot.path):
+        >>>     print(dirpath, [name for name, stat in files])
+        >>> snapshot.refresh(snapshot.path) # the root folder will be listed again.
+        >>> snapshot.save("foo.index.sqlite")
+        >>> TreeSnapshot(snapshot.path).load("foo.index.sqlite") # unchanged folder count.
+    """
+
+
+    def __init__(self, path, workers=1, retain=True):
+        """ Sets instance attributes.
+
+        Args:
+            - path (str): The root folder of the snapshot. Paths passed to other methods 
+            should be normalized the same way, as is done by DirectoryObject.
+            - workers (int): The maximum number of threads with which to list folders during
+            recursive walks. Use 1 to list each folder only when the walk reaches it.
+            - retain (bool): Use False to discard each folder listing once it's been walked
+            through instead of keeping it for later walks, .count(), and .save().
+        """
+
+        # set logger; suppress logging by default.
+        self.logger = logging.getLogger(__name__)
+        self.logger.addHandler(logging.NullHandler())
+
+        # convenience functions to clean up path notation.
+        self._normalize_sep = lambda p: p.replace(os.sep, os.altsep) if (
+                os.altsep == "/") else p
+        self._normalize_path = lambda p: self._normalize_sep(os.path.normpath(p))
+        self._join_paths = lambda *p: self._normalize_path(os.path.join(*p))
+
+        # set attributes.
+        self.path = self._normalize_path(path)
+        self.workers = workers
+        self.retain = retain
+
+        # set the maximum number of listings to work ahead by if listings aren't retained.
+        self._pending_limit = 4 * workers
+
+        # set storage containers for folder listings, folder modification times, and the
+        # folders whose listings were loaded from an index.
+        self._listings = {}
+        self._mtimes = {}
+        self._loaded = set()
+
+
+    def _scan(self, path):
+        """ Lists @path and captures the status of each entry.
+
+        Args:
+            - path (str): The folder to list.
+
+        Returns:
+            tuple: The return value.
+            The first item is a list of subfolders and the second item is a list of files,
+            both in os.scandir() order. Each subfolder is a tuple: the name, the status, and
+            True if it's a symbolic link. Each file is a tuple: the name and the status. The
+            status is None if it couldn't be captured, e.g. for a broken symbolic link.
+        """
+
+        self.logger.debug("Scanning folder: {}".format(path))
+
+        dirs, files = [], []
+
+        # if needed, capture the modification time of @path before listing it; see .save().
+        if self.retain:
+            try:
+                self._mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                self._mtimes.pop(path, None)
+
+        # list @path; as with os.walk(), skip folders that can't be listed.
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        stat = None
+                    if is_dir:
+                        dirs.append((entry.name, stat, entry.is_symlink()))
+                    else:
+                        files.append((entry.name, stat))
+        except OSError as err:
+            self.logger.warning("Can't scan folder: {}".format(path))
+            self.logger.error(err)
+
+        self._loaded.discard(path)
+        if self.retain:
+            self._listings[path] = (dirs, files)
+        return (dirs, files)
+
+
+    def listing(self, path):
+        """ Returns the subfolders and files in @path, listing it only if needed. See
+        ._scan().
+
+        Args:
+            - path (str): The folder to list.
+
+        Returns:
+            tuple: The return value.
+        """
+
+        if path not in self._listings:
+            return self._scan(path)
+
+        return self._listings[path]
+
+
+    def build(self):
+        """ Lists every folder in @self.path that hasn't already been listed. As with
+        os.walk(), symbolic links to folders aren't followed.
+
+        Returns:
+            None
+        """
+
+        self.logger.info("Building tree snapshot of: {}".format(self.path))
+
+        # walk all folders; this lists them in parallel if there's more than one worker.
+        for item in self.walk(self.path):
+            pass
+
+        self.logger.info("Tree snapshot contains {} folder(s).".format(len(self._listings)))
+        return
+
+
+    def count(self, path):
+        """ Returns the number of folders and files within @path, including those within its
+        subfolders. Folders that haven't been listed are counted with os.scandir() without
+        capturing the status of any entry and aren't added to the snapshot. As with .walk(),
+        symbolic links to folders are counted but not descended into.
+
+        Args:
+            - path (str): The folder in which to count.
+
+        Returns:
+            tuple: The return value.
+            The first item is the folder count and the second item is the file count.
+        """
+
+        dir_count, file_count = 0, 0
+
+        folders = [path]
+        while folders:
+            path = folders.pop()
+
+            # if possible, use the existing listing.
+            if path in self._listings:
+                dirs, files = self._listings[path]
+                dir_count += len(dirs)
+                file_count += len(files)
+                folders += [self._join_paths(path, name) for name, stat, is_link in dirs if
+                        not is_link]
+                continue
+
+            # otherwise, count entries the same way ._scan() would list them.
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        try:
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+                        if not is_dir:
+                            file_count += 1
+                            continue
+                        dir_count += 1
+                        if not entry.is_symlink():
+                            folders.append(self._join_paths(path, entry.name))
+            except OSError as err:
+                self.logger.warning("Can't count folder: {}".format(path))
+                self.logger.error(err)
+
+        return (dir_count, file_count)
+
+
+    def walk(self, top, top_stat=None, recursive=True, exclude=None):
+        """ Yields a tuple for @top and each folder within it in the same top-down order as
+        os.walk(). Symbolic links to folders are listed but not descended into. If 
+        @self.workers is more than 1 and @recursive is True, subfolders are listed ahead of
+        the walk by a pool of threads, in which case subfolders that the caller prunes may
+        already have been listed; use @exclude to avoid listing them.
+
+        Args:
+            - top (str): The folder at which to start.
+            - top_stat (os.stat_result): The status of @top to pass through.
+            - recursive (bool): Use True to descend into subfolders. Use False to yield
+            only @top, in which case no other folder is listed.
+            - exclude (function): An optional function that takes a subfolder path and 
+            returns True if the subfolder shouldn't be listed or descended into.
+
+        Returns:
+            generator: The return value.
+            Each item is a tuple: the folder path, its status, a list of its subfolders, and
+            a list of its files. See ._scan(). As with os.walk(), the list of subfolders may
+            be reordered or pruned in place to control the rest of the walk. Subfolders 
+            excluded by @exclude are yielded in the same position with None in place of both
+            lists; use .count() if their contents need to be accounted for.
+        """
+
+        # if needed, walk without worker threads.
+        if not recursive or self.workers < 2:
+            for item in self._walk(top, top_stat, recursive, exclude, self.listing):
+                yield item
+            return
+
+        # otherwise, list folders in a pool of threads; track listings in progress.
+        pool, pending = ThreadPoolExecutor(max_workers=self.workers), {}
+        lock, is_stopped = threading.Lock(), threading.Event()
+
+        # list a folder and queue its subfolders so that the pool works ahead of the walk.
+        def scan(path):
+            dirs, files = self._scan(path)
+            for name, stat, is_link in dirs:
+                if not is_link:
+                    prefetch(self._join_paths(path, name))
+            return (dirs, files)
+
+        # queue @path unless it's listed, in progress, or excluded; if listings aren't
+        # retained, limit how far ahead of the walk the pool works.
+        def prefetch(path):
+            if path in self._listings or (exclude is not None and exclude(path)):
+                return
+            with lock:
+                if not self.retain and len(pending) >= self._pending_limit:
+                    return
+                if not is_stopped.is_set() and path not in pending:
+                    pending[path] = pool.submit(scan, path)
+
+        # get the listing of @path, waiting for it if it's in progress.
+        def get_listing(path):
+            with lock:
+                future = pending.pop(path, None)
+            if future is not None:
+                return future.result()
+            return self.listing(path)
+
+        # walk; don't leave queued listings behind if the walk is stopped early.
+        try:
+            for item in self._walk(top, top_stat, recursive, exclude, get_listing, 
+                    prefetch):
+                yield item
+        finally:
+            with lock:
+                is_stopped.set()
+                for future in pending.values():
+                    future.cancel()
+                pending.clear()
+            pool.shutdown()
+
+
+    def _walk(self, top, top_stat, recursive, exclude, get_listing, prefetch=None):
+        """ Yields the items for .walk().
+
+        Args:
+            - top (str): The folder at which to start.
+            - top_stat (os.stat_result): The status of @top to pass through.
+            - recursive (bool): Use True to descend into subfolders.
+            - exclude (function): See .walk().
+            - get_listing (function): Takes a folder path and returns its listing. See 
+            .listing().
+            - prefetch (function): An optional function that takes the path of a subfolder
+            that the walk will descend into so it can be listed in advance.
+
+        Returns:
+            generator: The return value.
+        """
+
+        dirs, files = get_listing(top)
+        dirs = list(dirs)
+        yield (top, top_stat, dirs, files)
+
+        # release the files while descending.
+        files = None
+        if not recursive:
+            return
+
+        # get the subfolders to descend into.
+        subfolders = []
+        for name, stat, is_link in dirs:
+            if is_link:
+                continue
+            path = self._join_paths(top, name)
+            subfolders.append((path, stat, exclude is not None and exclude(path)))
+
+        # if possible, list the subfolders in advance.
+        if prefetch is not None:
+            for path, stat, is_excluded in subfolders:
+                if not is_excluded:
+                    prefetch(path)
+
+        for path, stat, is_excluded in subfolders:
+            if is_excluded:
+                yield (path, stat, None, None)
+                continue
+            for item in self._walk(path, stat, True, exclude, get_listing, prefetch):
+                yield item
+
+
+    def refresh(self, path):
+        """ Discards the listing of @path so that it will be listed again when next needed.
+        Listings of its subfolders are kept.
+
+        Args:
+            - path (str): The folder to refresh.
+
+        Returns:
+            None
+        """
+
+        self.logger.debug("Refreshing folder listing: {}".format(path))
+        self._listings.pop(path, None)
+        self._mtimes.pop(path, None)
+        self._loaded.discard(path)
+        return
+
+
+    def is_loaded(self, path):
+        """ Returns True if the current listing of @path was loaded from an index, in which
+        case the status of its files can be out of date. See .load().
+
+        Args:
+            - path (str): The folder to check.
+
+        Returns:
+            bool: The return value.
+        """
+
+        return path in self._loaded
+
+
+    @staticmethod
+    def _pack_stat(stat):
+        """ A static method that returns the fields of @stat needed by .walk() callers as a
+        JSON-serializable list or None if @stat is None. See ._unpack_stat(). """
+
+        if stat is None:
+            return None
+
+        return list(stat)[:7] + [stat.st_atime, stat.st_mtime, stat.st_ctime, 
+                stat.st_atime_ns, stat.st_mtime_ns, stat.st_ctime_ns]
+
+
+    @staticmethod
+    def _unpack_stat(fields):
+        """ A static method that returns an os.stat_result for @fields returned by 
+        ._pack_stat() or None if @fields is None. Platform-specific fields such as 
+        st_blocks aren't restored. """
+
+        if fields is None:
+            return None
+
+        times = dict(zip(["st_atime", "st_mtime", "st_ctime", "st_atime_ns", "st_mtime_ns",
+            "st_ctime_ns"], fields[7:]))
+        stat = os.stat_result(fields[:7] + [int(t) for t in fields[7:10]], times)
+        return stat
+
+
+    def save(self, index_file):
+        """ Writes the listing of each listed folder to an SQLite index at @index_file along
+        with the folder's modification time when it was listed. Folders are stored relative
+        to @self.path. Any existing index in @index_file is replaced.
+
+        Args:
+            - index_file (str): The path to the SQLite index. It will be created if it 
+            doesn't exist.
+
+        Returns:
+            int: The return value.
+            The number of saved folders.
+        """
+
+        self.logger.info("Saving tree snapshot index: {}".format(index_file))
+
+        # get each listing as compressed JSON.
+        rows = []
+        for path, (dirs, files) in list(self._listings.items()):
+            if path not in self._mtimes:
+                continue
+            relpath = self._normalize_path(os.path.relpath(path, self.path))
+            if relpath == ".." or relpath.startswith(self._normalize_sep(os.path.join("..", 
+                    ""))):
+                continue
+            listing = {"dirs": [[name, is_link, self._pack_stat(stat)] for name, stat, 
+                    is_link in dirs], "files": [[name, self._pack_stat(stat)] for name, stat
+                    in files]}
+            listing = zlib.compress(json.dumps(listing, separators=(",", ":")).encode())
+            rows.append((relpath, self._mtimes[path], listing))
+
+        # replace the contents of @index_file.
+        conn = sqlite3.connect(index_file)
+        try:
+            with conn:
+                conn.execute("""CREATE TABLE IF NOT EXISTS folders (path TEXT PRIMARY KEY,
+                        mtime_ns INTEGER, listing BLOB)""")
+                conn.execute("DELETE FROM folders")
+                conn.executemany("INSERT INTO folders VALUES (?, ?, ?)", rows)
+        finally:
+            conn.close()
+
+        self.logger.info("Saved {} folder listing(s).".format(len(rows)))
+        return len(rows)
+
+
+    def load(self, index_file):
+        """ Loads folder listings saved by .save() from @index_file. A listing is skipped if
+        the folder has been listed already, no longer exists, or its modification time has
+        changed since it was saved.
+
+        Args:
+            - index_file (str): The path to the SQLite index.
+
+        Returns:
+            int: The return value.
+            The number of loaded folders.
+        """
+
+        self.logger.info("Loading tree snapshot index: {}".format(index_file))
+
+        # if @index_file doesn't exist, there's nothing to load.
+        if not os.path.isfile(index_file):
+            self.logger.warning("Can't find index: {}".format(index_file))
+            return 0
+
+        # get saved listings.
+        conn = sqlite3.connect(index_file)
+        try:
+            rows = conn.execute("SELECT path, mtime_ns, listing FROM folders").fetchall()
+        except sqlite3.DatabaseError as err:
+            self.logger.warning("Can't read index: {}".format(index_file))
+            self.logger.error(err)
+            rows = []
+        finally:
+            conn.close()
+
+        # load listings for unchanged folders.
+        loaded, stale = 0, 0
+        for relpath, mtime_ns, listing in rows:
+            path = self._join_paths(self.path, relpath)
+            if path in self._listings:
+                continue
+            try:
+                is_unchanged = os.stat(path).st_mtime_ns == mtime_ns
+            except OSError:
+                is_unchanged = False
+            if not is_unchanged:
+                stale += 1
+                continue
+            listing = json.loads(zlib.decompress(listing).decode())
+            dirs = [(name, self._unpack_stat(stat), is_link) for name, is_link, stat in 
+                    listing["dirs"]]
+            files = [(name, self._unpack_stat(stat)) for name, stat in listing["files"]]
+            self._listings[path] = (dirs, files)
+            self._mtimes[path] = mtime_ns
+            self._loaded.add(path)
+            loaded += 1
+
+        self.logger.info("Loaded {} folder listing(s); {} changed or missing folder(s) will "
+                "be listed again.".format(loaded, stale))
+        return loaded
+
+
+if __name__ == "__main__":
+    pass
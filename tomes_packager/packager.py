@@ -23,8 +23,16 @@ import time
 import yaml
 from datetime import datetime
 from tomes_packager.lib.aip_maker import AIPMaker
+from tomes_packager.lib.checksum_cache import ChecksumCache
+from tomes_packager.lib.checksum_maker import ChecksumMaker
 from tomes_packager.lib.directory_object import DirectoryObject
+from tomes_packager.lib.eaxs_harvester import EAXSHarvester
+from tomes_packager.lib.manifest_auditor import ManifestAuditor
+from tomes_packager.lib.manifest_maker import ManifestMaker
+from tomes_packager.lib.metadata_prefetcher import MetadataPrefetcher
+from tomes_packager.lib.mime_resolver import MimeResolver
 from tomes_packager.lib.premis_object import PREMISObject
+from tomes_packager.lib.progress_tracker import ProgressTracker
 from tomes_packager.lib.mets_maker import METSMaker
 from tomes_packager.lib.rdf_maker import RDFMaker
 
@@ -56,13 +64,25 @@ class Packager():
                 rdf_xlsx="../tests/sample_files/sample_rdf.xlsx")
         >>> repkg.mets_path = "../tests/sample_files/foo/new_mets.xml"
         >>> repkg.package() # True
+        >>>
+        >>> # to audit an existing AIP against its METS manifest without altering it, use 
+        >>> # .audit(). Pass a state file to be able to resume an audit that times out.
+        >>> auditor = Packager("foo", "../tests/sample_files", "../tests/sample_files", 
+                checksum_workers=4)
+        >>> auditor.audit("foo.audit.sqlite", time_limit=3600) # True
     """
 
 
     def __init__(self, account_id, source_dir, destination_dir, 
             mets_template="mets_templates/default.xml", 
             manifest_template="mets_templates/MANIFEST.XML", premis_log="", rdf_xlsx="", 
-            charset="utf-8"):
+            charset="utf-8", checksum_workers=1, checksum_processes=False, 
+            checksum_algorithms=("SHA-256",), checksum_cache="", strict_checksums=False, 
+            checksum_block_size=None, hash_transfers=False, verify_transfers=False,
+            harvest_eaxs=False, verify_eaxs=False, progress_interval=None, 
+            progress_callback=None, scan_workers=1, tree_index="",
+            sniff_mimetypes=False, stream_manifest=False, template_cache="", 
+            prefetch_workers=1, manifest_engine="jinja", validate_manifest=False):
         """ Sets instance attributes.
 
         Attributes:
@@ -70,8 +90,16 @@ class Packager():
             - aip_obj (AIPMaker): The object version of the AIP located at @destination_dir.
             - directory_obj (DirectoryObject): The object version of @destination_dir.
             - premis_obj (PREMISObject): The preservation metadata created from @premis_log.
+            - cache_obj (ChecksumCache): The persistent checksum cache at @checksum_cache.
+            - progress_obj (ProgressTracker): The tracker of files and bytes processed while
+            the METS manifest is created. This is None unless @progress_interval or 
+            @progress_callback is set.
+            - eaxs_obj (EAXSHarvester): The attachment checksum values recorded in the AIP's
+            EAXS files. This is None unless @harvest_eaxs or @verify_eaxs is True.
             - mets_obj (METSMaker): The METS object created from @mets_template.
-            - manifest_obj (METSMaker): The METS object created from @manifest_template.
+            - manifest_obj (METSMaker): The METS object created from @manifest_template or
+            the ManifestMaker if @manifest_engine is "lxml".
+            - auditor_obj (ManifestAuditor): The fixity auditor created by .audit().
             - rdf_obj (RDFMaker): The RDF object created from @rdf_xlsx.
             - time_utc (function): Returns UTC time as ISO 8601.
             - time_local (function): Returns local time as ISO 8601 with UTC offset.
@@ -102,6 +130,84 @@ class Packager():
             METS templates.
             - charset (str): The encoding for the rendered METS file/s and the RDF XML in
             @rdf_obj.
+            - checksum_workers (int): The number of workers with which to calculate file 
+            checksum values before rendering the METS manifest. Use 1 to calculate checksum 
+            values serially while the manifest is rendered.
+            - checksum_processes (bool): Use True to calculate checksum values with worker 
+            processes instead of worker threads. This only applies if @checksum_workers is 
+            greater than 1.
+            - checksum_algorithms (tuple): The checksum algorithms to calculate for each file
+            with a single read of the file. Manifest templates can then access any of these
+            values without re-reading files. See FileObject._get_hashers() for supported 
+            algorithms.
+            - checksum_cache (str): Optional path to an SQLite file in which to store checksum
+            values between runs. Unchanged files in an existing AIP then don't need to be 
+            re-read when the METS manifest is rebuilt. It's best to keep this file outside of
+            @destination_dir so that it isn't included in the manifest.
+            - strict_checksums (bool): Use True to ignore values in @checksum_cache and read 
+            every file. Newly calculated values will still be stored.
+            - checksum_block_size (int): The chunk size in bytes with which to read files 
+            while calculating checksum values. If None, the chunk size adapts to each file's
+            size.
+            - hash_transfers (bool): Use True to calculate @checksum_algorithms values while
+            copying files from @source_dir to a @destination_dir on a different device. The
+            METS manifest then uses these values instead of re-reading each file. Files moved
+            within the same device aren't affected.
+            - verify_transfers (bool): Use True to re-read each file copied with 
+            @hash_transfers and verify its checksum values against those of the source file.
+            - harvest_eaxs (bool): Use True to collect the attachment checksum values recorded
+            in the AIP's EAXS files with a single streaming read of each EAXS file. Templates
+            can access them via @eaxs_obj and attachment FileObjects use them instead of 
+            re-reading attachments. If the AIP has no EAXS folder, this is skipped.
+            - verify_eaxs (bool): Use True to harvest the EAXS attachment checksum values and
+            verify each attachment against them with @checksum_workers. Only values that pass
+            are used by attachment FileObjects. Any failure, including a missing EAXS 
+            folder, makes the AIP invalid.
+            - progress_interval (float): Optional number of seconds between progress reports
+            (files and bytes processed, throughput, and ETA) while the METS manifest is 
+            created. Files to process are counted beforehand. If None and 
+            @progress_callback is set, reports are made every 60 seconds.
+            - progress_callback (function): Optional function to call with each progress 
+            report. See ProgressTracker.get_stats().
+            - scan_workers (int): The number of threads with which to list the AIP's folders
+            while traversing it. Use more than 1 for high-latency storage such as NFS. The 
+            order of files in the METS manifest is unaffected.
+            - tree_index (str): Optional path to an SQLite index of the AIP's folder 
+            listings. If it exists, listings of folders whose modification times haven't 
+            changed are loaded from it instead of listing them again; it's then updated. 
+            Files altered in place don't change their folder's modification time, so only 
+            use this for AIPs whose files aren't modified in place. Pass in an empty string
+            to always list every folder.
+            - sniff_mimetypes (bool): Use True to determine the MIME types of files whose
+            extensions have no known type, e.g. extensionless EML exports, by reading the
+            first few KB of each. Otherwise, such files are "application/octet-stream".
+            - stream_manifest (bool): Use True to keep memory use flat regardless of the 
+            number of files in the AIP while the METS manifest is created. Folder listings
+            are then discarded once traversed, @tree_index is ignored, and checksum values
+            aren't precomputed with @checksum_workers, i.e. they're calculated while the 
+            manifest is rendered. Checksum values from @hash_transfers or @harvest_eaxs are
+            still held in memory.
+            - template_cache (str): Optional folder in which to store compiled METS 
+            templates so that later runs don't need to compile them again. Compiled
+            templates are always reused by later Packagers within the same process. 
+            - prefetch_workers (int): The number of threads with which to resolve each 
+            file's metadata, including checksum values, shortly ahead of its use by the METS
+            manifest template so that rendering doesn't wait on the disk. Only a bounded 
+            number of files are resolved ahead and the manifest is unchanged. Use 1 to 
+            resolve metadata as the template uses it. If more than 1, checksum values aren't
+            precomputed with @checksum_workers.
+            - manifest_engine (str): Use "jinja" to render the METS manifest from 
+            @manifest_template. Use "lxml" to write the same manifest structure directly 
+            with a ManifestMaker, which is faster for very large AIPs; @manifest_template 
+            is then only used to determine whether to create a manifest and doesn't need to
+            exist, even if @validate_manifest is True. See 
+            .lib.manifest_maker.ManifestMaker.
+            - validate_manifest (bool): Use True to validate the METS manifest against the
+            METS XSD. Large manifests are validated as they're parsed, so memory use doesn't
+            grow with the number of files. Otherwise, the manifest is only checked to exist.
+
+        Raises:
+            - ValueError: If @manifest_engine is not "jinja" or "lxml".
         """
 
         # set logger; suppress logging by default.
@@ -131,14 +237,49 @@ class Packager():
         self.manifest_template = self._normalize_path(manifest_template)
         self.rdf_xlsx = self._normalize_path(rdf_xlsx)
         self.charset = charset
+        self.checksum_workers = checksum_workers
+        self.checksum_processes = checksum_processes
+        self.checksum_algorithms = tuple(checksum_algorithms)
+        self.checksum_cache = self._normalize_path(checksum_cache)
+        self.strict_checksums = strict_checksums
+        self.checksum_block_size = checksum_block_size
+        self.hash_transfers = hash_transfers
+        self.verify_transfers = verify_transfers
+        self.harvest_eaxs = harvest_eaxs
+        self.verify_eaxs = verify_eaxs
+        self.progress_interval = progress_interval
+        self.progress_callback = progress_callback
+        self.scan_workers = scan_workers
+        self.tree_index = self._normalize_path(tree_index)
+        self.sniff_mimetypes = sniff_mimetypes
+        self.stream_manifest = stream_manifest
+        self.template_cache = self._normalize_path(template_cache)
+        self.prefetch_workers = prefetch_workers
+        self.manifest_engine = manifest_engine
+        self.validate_manifest = validate_manifest
+
+        # verify @manifest_engine is legal.
+        if self.manifest_engine not in ("jinja", "lxml"):
+            msg = "Manifest engine must be 'jinja' or 'lxml', got: {}".format(
+                    self.manifest_engine)
+            self.logger.error(msg)
+            raise ValueError(msg)
 
         # set module attribute.
         self.packager_mod = sys.modules[__name__]
 
         # set attributes for imported classes.
         self._aip_maker_cls = AIPMaker
+        self._checksum_cache_cls = ChecksumCache
+        self._checksum_maker_cls = ChecksumMaker
         self._directory_object_cls = DirectoryObject
+        self._eaxs_harvester_cls = EAXSHarvester
+        self._manifest_auditor_cls = ManifestAuditor
+        self._manifest_maker_cls = ManifestMaker
+        self._metadata_prefetcher_cls = MetadataPrefetcher
+        self._mime_resolver_cls = MimeResolver
         self._premis_object_cls = PREMISObject
+        self._progress_tracker_cls = ProgressTracker
         self._mets_maker_cls = METSMaker
         self._rdf_maker_cls = RDFMaker
 
@@ -147,8 +288,12 @@ class Packager():
         self.aip_obj = None
         self.directory_obj = None
         self.premis_obj = None
+        self.cache_obj = None
+        self.progress_obj = None
+        self.eaxs_obj = None
         self.mets_obj = None
         self.manifest_obj = None
+        self.auditor_obj = None
         self.rdf_obj = None           
 
         # set METS paths.
@@ -172,6 +317,14 @@ class Packager():
         self.string_hash = lambda s: "h" + hashlib.sha256(s.encode(self.charset)).hexdigest(
                 )[:7]
 
+        # set folder patterns and a function to identify files skipped by the included 
+        # manifest template, i.e. files within a folder whose relative path matches.
+        self._attachment_folders = ["eaxs/attachments", "*/eaxs/attachments"]
+        is_attachment_path = self._directory_object_cls._compile_filter(
+                self._attachment_folders)
+        self._is_attachment = lambda f: any(is_attachment_path(f.name.rsplit("/", i)[0]) 
+                for i in range(f.name.count("/") + 1))
+
 
     def write_mets(self, filename, template, xsd_validation=False, **kwargs):
         """ Writes a METS file to the given @filename path using the given METS @template.
@@ -181,8 +334,7 @@ class Packager():
             will be placed inside the AIP directory.
             - template (str): The path to the METS Jinja template file.
             - xsd_validation (bool): Use True to validate the METS via the METS XSD. Use False
-            to simply determine if the METS file was written or not (i.e. for files too large
-            to validate).
+            to simply determine if the METS file was written or not.
             - **kwargs: Any optional keyword arguments to pass into the METS @template. Note
             that the key "SELF" is reserved as @self is automatically passed into the template
             as "SELF".
@@ -206,7 +358,7 @@ class Packager():
         # pass @self and @kwargs into @template and render it; determine validity.
         try:
             mets_obj = self._mets_maker_cls(template, filename, charset=self.charset, 
-                    SELF=self, **kwargs)
+                    bytecode_cache=self.template_cache, SELF=self, **kwargs)
             mets_obj.make()
             if xsd_validation:
                 is_valid = mets_obj.validate()
@@ -222,37 +374,143 @@ class Packager():
         return (mets_obj, is_valid)
 
 
-    def package(self):
-        """ Creates the AIP structure and METS file. Note: if @self.source_dir and
-        @self.destination_dir are the same then no files will be moved, but the AIP will still
-        be validated and METS files will be created.
+    def write_manifest(self, filename, xsd_validation=False):
+        """ Writes a METS manifest file to the given @filename path with a ManifestMaker
+        instead of a template. The manifest has the same structure as one rendered from
+        "mets_templates/MANIFEST.XML".
+
+        Args:
+            - filename (str): The file path for the outputted manifest file. If it's inside
+            the AIP directory, it's left out of the manifest.
+            - xsd_validation (bool): Use True to validate the manifest via the METS XSD with
+            a METSMaker that has no template, so @self.manifest_template doesn't need to 
+            exist. Use False to simply determine if the manifest file was written or not.
 
         Returns:
-            bool: The return value.
-            True if the overall AIP structure appears to be valid AND any optional METS files
-            appear to be valid. Otherwise, False.
+            tuple: The return value.
+            The first item is a ManifestMaker object. None if the manifest couldn't be 
+            created. The second item is a boolean. This is True if the manifest file is 
+            valid and @xsd_validation is True OR if @xsd_validation is False and the
+            manifest file is a real file. Otherwise, this is False.
         """
 
-        self.logger.info("Packaging: {}".format(self.aip_dir))
+        self.logger.info("Writing METS manifest '{}' with lxml.".format(filename))
 
-        # create AIP structure.
-        self.aip_obj = self._aip_maker_cls(self.account_id, self.source_dir, 
-                self.destination_dir)
-        self.aip_obj.make()
-        is_aip_valid = self.aip_obj.validate()
+        # write the manifest; determine validity.
+        try:
+            manifest_obj = self._manifest_maker_cls(self.directory_obj, filename,
+                    self.account_id, "{} (version: {})".format(__FULLNAME__, __VERSION__),
+                    (__DESCRIPTION__, __URL__), self.charset, self._attachment_folders)
+            manifest_obj.make()
+            if xsd_validation:
+                is_valid = self._mets_maker_cls(None, manifest_obj.filepath, 
+                        charset=self.charset).validate()
+            else:
+                is_valid = os.path.isfile(manifest_obj.filepath)
+        except Exception as err:
+            self.logger.warning("Can't complete METS manifest: {}".format(filename))
+            self.logger.error(err)
+            manifest_obj = None
+            is_valid = False
 
-        # if the AIP structure isn't valid, return False.
-        if not is_aip_valid:
-            self.logger.warning("AIP structure appears to be invalid; aborting.")
-            return is_aip_valid
+        return (manifest_obj, is_valid)
 
-        # if no METS templates were passed; return AIP validity.
-        if self.mets_template == "" and self.manifest_template == "":
-            self.logger.info("No METS or manifest templates passed; skipping METS creation.")
-            return is_aip_valid
+
+    def _get_unhashed_files(self):
+        """ Yields a FileObject for each file in @self.aip_dir that the METS manifest will 
+        need checksum values for, i.e. files without known values in 
+        @self.directory_obj.digests. Files inside an "eaxs/attachments" folder and the METS
+        manifest itself are omitted because the included manifest template skips them. The
+        attachment folders are pruned from the traversal, so they aren't listed.
+
+        Returns:
+            generator: The return value.
+        """
+
+        is_known = lambda f: set(self.checksum_algorithms).issubset(
+                self.directory_obj.digests.get(f.abspath, {}))
+
+        for file_obj in self.directory_obj.rfiles(exclude=self._attachment_folders):
+            if file_obj.path == self.manifest_path:
+                continue
+            if not is_known(file_obj):
+                yield file_obj
+
+
+    def _precompute_checksums(self):
+        """ Calculates @self.checksum_algorithms values in parallel for the files in 
+        @self.aip_dir and stores them in @self.directory_obj.digests so that the METS 
+        manifest doesn't need to calculate them while rendering. See 
+        ._get_unhashed_files().
+
+        Returns:
+            None
+        """
+
+        self.logger.info("Precomputing checksum values for: {}".format(self.aip_dir))
+
+        # calculate checksum values.
+        checksum_obj = self._checksum_maker_cls(self.checksum_workers,
+                self.checksum_processes, self.checksum_algorithms, 
+                self.checksum_block_size, self.cache_obj, self.progress_obj)
+        self.directory_obj.digests.update(checksum_obj.make(self._get_unhashed_files()))
+        
+        return
+
+
+    def _make_metadata(self):
+        """ Harvests EAXS checksum values and creates the METS file and METS manifest for 
+        @self.aip_dir, along with the objects they need. See .package().
+
+        Returns:
+            tuple: The return value.
+            The items are booleans for whether the EAXS attachments, the METS file, and the
+            METS manifest appear to be valid. Each is True if it wasn't requested.
+        """
+
+        # if needed, create a progress tracker.
+        if self.progress_interval is not None or self.progress_callback is not None:
+            interval = 60 if self.progress_interval is None else self.progress_interval
+            self.progress_obj = self._progress_tracker_cls(self.progress_callback, 
+                    interval)
 
         # create a DirectoryObject.
-        self.directory_obj = self._directory_object_cls(self.aip_dir)
+        self.directory_obj = self._directory_object_cls(self.aip_dir, 
+                checksum_algorithms=self.checksum_algorithms, checksum_cache=self.cache_obj,
+                checksum_block_size=self.checksum_block_size, progress=self.progress_obj,
+                scan_workers=self.scan_workers, retain_listings=not self.stream_manifest,
+                mime_resolver=self._mime_resolver_cls(self.sniff_mimetypes))
+        if self.tree_index != "" and self.stream_manifest:
+            self.logger.warning("Ignoring tree index while streaming manifest: {}".format(
+                self.tree_index))
+        elif self.tree_index != "":
+            self.directory_obj.load_index(self.tree_index)
+
+        # pass checksum values calculated during transfers to the DirectoryObject and cache.
+        self.directory_obj.digests.update(self.aip_obj.digests)
+        if self.cache_obj is not None:
+            for path, checksums in self.aip_obj.digests.items():
+                self.cache_obj.set(path, checksums)
+
+        # if needed, harvest (and verify) attachment checksum values from the EAXS files.
+        # if the AIP has no EAXS folder, skip harvesting; attachments can't be verified.
+        is_eaxs_valid = True
+        eaxs_dir = self.aip_obj.eaxs_dir
+        if (self.harvest_eaxs or self.verify_eaxs) and (eaxs_dir is None or 
+                not os.path.isdir(eaxs_dir)):
+            self.logger.warning("Can't find EAXS folder '{}'; skipping harvest.".format(
+                eaxs_dir))
+            is_eaxs_valid = not self.verify_eaxs
+        elif self.harvest_eaxs or self.verify_eaxs:
+            self.eaxs_obj = self._eaxs_harvester_cls(eaxs_dir, self.checksum_workers, 
+                    self.checksum_processes, self.checksum_block_size)
+            self.eaxs_obj.harvest()
+            if self.verify_eaxs:
+                is_eaxs_valid = self.eaxs_obj.verify()
+            for path, checksums in self.eaxs_obj.digests.items():
+                if path not in self.eaxs_obj.failures:
+                    checksums = dict(checksums, **self.directory_obj.digests.get(path, {}))
+                    self.directory_obj.digests[path] = checksums
 
         # if needed, create a PREMISObject.
         if self.premis_log != "":
@@ -275,15 +533,94 @@ class Packager():
 
         # if needed, write the METS manifest.
         if self.manifest_template != "":
+            if self.progress_obj is not None:
+                self.progress_obj.scan(self._get_unhashed_files())
+            if self.checksum_workers > 1 and self.prefetch_workers > 1:
+                self.logger.info("Prefetching metadata; checksum values won't be "
+                        "precomputed.")
+            elif self.checksum_workers > 1 and self.stream_manifest:
+                self.logger.info("Streaming manifest; checksum values won't be "
+                        "precomputed.")
+            elif self.checksum_workers > 1:
+                self._precompute_checksums()
             self.logger.info("Creating METS manifest file for AIP.")            
-            self.manifest_obj, is_manifest_valid = self.write_mets(self.manifest_path, 
-                    self.manifest_template)
+            
+            # since the manifest file is created as rendering starts, list the AIP's root 
+            # folder again so the manifest sees it as it would with a fresh traversal.
+            self.directory_obj.refresh()
+
+            # if needed, resolve file metadata ahead of the template; skip the manifest.
+            if self.prefetch_workers > 1:
+                self.directory_obj.prefetcher = self._metadata_prefetcher_cls(
+                        self.prefetch_workers, exclude=lambda f: f.path == 
+                        self.manifest_path)
+            if self.manifest_engine == "lxml":
+                self.manifest_obj, is_manifest_valid = self.write_manifest(
+                        self.manifest_path, self.validate_manifest)
+            else:
+                self.manifest_obj, is_manifest_valid = self.write_mets(self.manifest_path, 
+                        self.manifest_template, self.validate_manifest)
+            self.directory_obj.prefetcher = None
+            if self.progress_obj is not None:
+                self.progress_obj.report()
         else:
             self.logger.info("No manifest template passed.")            
             is_manifest_valid = True
+
+        # if needed, save the AIP's folder listings for later runs.
+        if self.tree_index != "" and not self.stream_manifest:
+            self.directory_obj.save_index(self.tree_index)
+
+        return (is_eaxs_valid, is_mets_valid, is_manifest_valid)
+
+
+    def package(self):
+        """ Creates the AIP structure and METS file. Note: if @self.source_dir and
+        @self.destination_dir are the same then no files will be moved, but the AIP will still
+        be validated and METS files will be created.
+
+        Returns:
+            bool: The return value.
+            True if the overall AIP structure appears to be valid AND any optional METS files
+            appear to be valid. Otherwise, False.
+        """
+
+        self.logger.info("Packaging: {}".format(self.aip_dir))
+
+        # create AIP structure.
+        transfer_algorithms = self.checksum_algorithms if self.hash_transfers else None
+        self.aip_obj = self._aip_maker_cls(self.account_id, self.source_dir, 
+                self.destination_dir, transfer_algorithms, self.verify_transfers)
+        self.aip_obj.make()
+        is_aip_valid = self.aip_obj.validate()
+
+        # if the AIP structure isn't valid, return False.
+        if not is_aip_valid:
+            self.logger.warning("AIP structure appears to be invalid; aborting.")
+            return is_aip_valid
+
+        # if no METS templates were passed; return AIP validity.
+        if self.mets_template == "" and self.manifest_template == "":
+            self.logger.info("No METS or manifest templates passed; skipping METS creation.")
+            return is_aip_valid
+
+        # if needed, open the checksum cache.
+        if self.checksum_cache != "":
+            self.cache_obj = self._checksum_cache_cls(self.checksum_cache, 
+                    self.strict_checksums)
+
+        # create the METS files; make sure pending checksum values are committed and the 
+        # cache is closed even if this fails.
+        try:
+            is_eaxs_valid, is_mets_valid, is_manifest_valid = self._make_metadata()
+            if self.cache_obj is not None:
+                self.cache_obj.evict(self.aip_dir)
+        finally:
+            if self.cache_obj is not None:
+                self.cache_obj.close()
         
         # determine overall AIP validity.
-        is_valid = bool(is_aip_valid * is_mets_valid * is_manifest_valid)
+        is_valid = bool(is_aip_valid * is_eaxs_valid * is_mets_valid * is_manifest_valid)
         
         # report overall AIP validity.
         if is_valid:
@@ -291,6 +628,11 @@ class Packager():
         else:
             if not is_aip_valid:
                 self.logger.warning("Couldn't create valid AIP structure.")
+            if not is_eaxs_valid and self.eaxs_obj is None:
+                self.logger.warning("Couldn't find EAXS files to verify attachments.")
+            elif not is_eaxs_valid:
+                self.logger.warning("EAXS attachments failed verification: {}".format(
+                    self.eaxs_obj.results))
             if not is_mets_valid:
                 self.logger.warning("Couldn't create valid METS: {}".format(self.mets_path))
             if not is_manifest_valid:
@@ -302,6 +644,46 @@ class Packager():
         return is_valid
 
 
+    def audit(self, state_file="", time_limit=None):
+        """ Verifies the files in @self.aip_dir against the existing METS manifest at 
+        @self.manifest_path. Checksum values are recalculated with @self.checksum_workers
+        and the checksum cache is ignored, but folder listings are reused from 
+        @self.tree_index, if any. Nothing in the AIP is altered. Files anywhere within an
+        "eaxs/attachments" folder aren't reported as extra because the included manifest 
+        template skips them.
+
+        Args:
+            - state_file (str): Optional path to an SQLite file in which to store audit 
+            progress. Running .audit() again with the same file resumes the audit. If empty,
+            a temporary file is used and deleted afterwards, so an incomplete audit can't be
+            resumed; files that didn't pass remain available via @auditor_obj.report().
+            - time_limit (float): The number of seconds after which to stop the audit. Use
+            None for no limit.
+
+        Returns:
+            bool: The return value.
+            True if the audit is complete and all files passed. Otherwise, False.
+        """
+
+        self.logger.info("Auditing: {}".format(self.aip_dir))
+
+        # audit the AIP.
+        self.auditor_obj = self._manifest_auditor_cls(self.manifest_path, state_file,
+                self.checksum_workers, self.checksum_processes, self.checksum_block_size,
+                time_limit, self._is_attachment, self.tree_index)
+        is_complete = self.auditor_obj.audit()
+
+        # report results.
+        failures = sum(v for k, v in self.auditor_obj.results.items() if k != "passed")
+        is_valid = is_complete and failures == 0
+        if is_valid:
+            self.logger.info("All files passed audit.")
+        elif is_complete:
+            self.logger.warning("{} file(s) failed audit.".format(failures))
+
+        return is_valid
+
+
 # CLI.
 def main(account_id: ("email account identifier"), 
         source_dir: ("path to email \"hot folder\""),
@@ -311,7 +693,43 @@ def main(account_id: ("email account identifier"),
         manifest_template: ("path to METS manifest template", "option")=\
                 "mets_templates/MANIFEST.XML",
         premis_log: ("path to preservation metadata log", "option")="",
-        rdf_xlsx: ("path to RDF/Dublin Core .xlsx file", "option")=""):
+        rdf_xlsx: ("path to RDF/Dublin Core .xlsx file", "option")="",
+        checksum_workers: ("number of parallel checksum workers", "option", None, int)=1,
+        checksum_processes: ("use processes instead of threads for checksums", "flag", 
+            "p")=False,
+        checksum_algorithms: ("comma-separated checksum algorithms to calculate per file",
+            "option")="SHA-256",
+        checksum_cache: ("path to SQLite checksum cache file", "option")="",
+        strict_checksums: ("ignore cached checksum values", "flag", None)=False,
+        checksum_block_size: ("checksum read size in bytes (default: adaptive)", "option",
+            None, int)=None,
+        hash_transfers: ("calculate checksums while copying across devices", "flag", 
+            None)=False,
+        verify_transfers: ("re-read copied files to verify checksums", "flag", None)=False,
+        harvest_eaxs: ("use attachment checksums recorded in EAXS files", "flag", 
+            None)=False,
+        verify_eaxs: ("verify attachments against checksums recorded in EAXS files", 
+            "flag", None)=False,
+        progress_interval: ("seconds between progress and ETA log lines", "option", None,
+            float)=None,
+        scan_workers: ("number of threads listing folders (for network storage)", "option",
+            None, int)=1,
+        tree_index: ("path to SQLite index of folder listings to reuse", "option")="",
+        sniff_mimetypes: ("detect MIME types of files without known extensions by content",
+            "flag", None)=False,
+        stream_manifest: ("keep memory use flat while creating the METS manifest", "flag", 
+            None)=False,
+        template_cache: ("folder in which to store compiled METS templates", "option")="",
+        prefetch_workers: ("number of threads resolving file metadata ahead of the manifest",
+            "option", None, int)=1,
+        manifest_engine: ("write the METS manifest with 'jinja' or 'lxml'", "option")=\
+                "jinja",
+        validate_manifest: ("validate the METS manifest against the METS XSD", "flag", 
+            None)=False,
+        audit: ("audit an existing AIP against its METS manifest", "flag", None)=False,
+        audit_state: ("path to audit state file for resuming audits", "option")="",
+        audit_time_limit: ("seconds after which to stop an audit", "option", None, 
+            float)=None):
 
     "Creates a TOMES Archival Information Package.\
     \nexample: `python3 packager.py foo ../tests/sample_files/hot_folder ../tests/sample_files`\
@@ -336,12 +754,25 @@ def main(account_id: ("email account identifier"),
     
     # create class instance.
     packager = Packager(account_id, source_dir, destination_dir, mets_template, 
-            manifest_template, premis_log, rdf_xlsx)
+            manifest_template, premis_log, rdf_xlsx, checksum_workers=checksum_workers, 
+            checksum_processes=checksum_processes, 
+            checksum_algorithms=checksum_algorithms.split(","), 
+            checksum_cache=checksum_cache, strict_checksums=strict_checksums, 
+            checksum_block_size=checksum_block_size, hash_transfers=hash_transfers,
+            verify_transfers=verify_transfers, harvest_eaxs=harvest_eaxs, 
+            verify_eaxs=verify_eaxs, progress_interval=progress_interval, 
+            scan_workers=scan_workers, tree_index=tree_index, 
+            sniff_mimetypes=sniff_mimetypes, stream_manifest=stream_manifest, 
+            template_cache=template_cache, prefetch_workers=prefetch_workers, 
+            manifest_engine=manifest_engine, validate_manifest=validate_manifest)
     
     # package the email account.
     logging.info("Running CLI: " + " ".join(sys.argv))
     try:
-        packager.package()
+        if audit:
+            packager.audit(audit_state, audit_time_limit)
+        else:
+            packager.package()
         logging.info("Done.")
         sys.exit()
     except Exception as err: